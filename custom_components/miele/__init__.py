@@ -4,14 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import asyncio.timeouts
-from datetime import timedelta
 from http import HTTPStatus
 from json.decoder import JSONDecodeError
 import logging
+import time
 from typing import Any
 
-from aiohttp import ClientResponseError
-import flatdict
+from aiohttp import ClientError, ClientResponseError
 import voluptuous as vol
 
 from homeassistant.components import persistent_notification
@@ -20,10 +19,14 @@ from homeassistant.components.application_credentials import (
     async_import_client_credential,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    EVENT_HOMEASSISTANT_CLOSE,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import (
-    aiohttp_client,
     config_validation as cv,
     issue_registry as ir,
 )
@@ -33,30 +36,36 @@ from homeassistant.helpers.config_entry_oauth2_flow import (
     async_get_config_entry_implementation,
 )
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity_registry import RegistryEntry, async_migrate_entries
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import (
     ConfigEntryAuthFailed,
     ConfigEntryNotReady,
-    DataUpdateCoordinator,
     UpdateFailed,
 )
 
 from .api import AsyncConfigEntryAuth
+from .appliance import MieleApplianceData
+from .connection import MieleConnectionStats, async_create_api_session
 from .const import (
     ACTIONS,
+    ACTIONS_FETCH_PARALLEL,
     API,
-    API_READ_TIMEOUT,
     CONF_ID,
     CONF_PROGRAM_IDS,
     CONF_SENSORS,
     CONF_VALUE,
     CONF_VALUE_RAW,
+    DEVICE_INDEX,
     DOMAIN,
     MANUFACTURER,
+    POLL_UPDATE_INTERVAL,
+    SIGNAL_NEW_APPLIANCES,
     VERSION,
     MieleAppliance,
 )
+from .coordinator import MieleDataUpdateCoordinator
 from .devcap import (  # noqa: F401
     TEST_ACTION_19,
     TEST_ACTION_21,
@@ -79,7 +88,12 @@ from .devcap import (  # noqa: F401
     TEST_DATA_73,
     TEST_DATA_74,
 )
+from .device_index import MieleDeviceIndex
+from .ingest import MieleIngest
+from .retry import RetryCancelled
 from .services import async_setup_services
+from .store import MieleSnapshotStore
+from .stream import MieleEventStream
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -129,6 +143,8 @@ PLATFORMS = [
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Miele component."""
     hass.data[DOMAIN] = {}
+    hass.data[DOMAIN][DEVICE_INDEX] = MieleDeviceIndex(hass)
+    hass.data[DOMAIN][DEVICE_INDEX].async_setup()
     if DOMAIN not in config:
         config[DOMAIN] = {}
 
@@ -175,62 +191,58 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data[DOMAIN][entry.entry_id] = {}
     hass.data[DOMAIN]["id_log"] = []
-    hass.data[DOMAIN][entry.entry_id]["retries_401"] = 0
-    hass.data[DOMAIN][entry.entry_id]["timeouts"] = 0
     hass.data[DOMAIN][entry.entry_id]["listener"] = None
+    hass.data[DOMAIN][entry.entry_id]["ingest"] = MieleIngest()
+    connection_stats = MieleConnectionStats()
+    websession = async_create_api_session(connection_stats)
+    entry.async_on_unload(websession.close)
     hass.data[DOMAIN][entry.entry_id][API] = AsyncConfigEntryAuth(
-        aiohttp_client.async_get_clientsession(hass), session
+        websession, session, connection_stats
     )
 
+    hass.data[DOMAIN][entry.entry_id]["store"] = store = MieleSnapshotStore(hass, entry)
+
     if ACTIONS not in hass.data[DOMAIN][entry.entry_id]:
         hass.data[DOMAIN][entry.entry_id][ACTIONS] = {}
     coordinator = await get_coordinator(hass, entry)
-    if not coordinator.last_update_success:
-        await coordinator.async_config_entry_first_refresh()
-    serialnumbers = list(coordinator.data.keys())
-    if len(serialnumbers) == 0:
-        _LOGGER.warning("No devices found in API for this account")
-    else:
-        _LOGGER.debug("Miele devices in API account: %s", serialnumbers)
-    for appliance in coordinator.data.values():
-        if appliance["ident|type|value_raw"] in [
-            MieleAppliance.DISHWASHER_SEMI_PROFESSIONAL,
-            MieleAppliance.DISHWASHER_PROFESSIONAL,
-            MieleAppliance.WASHING_MACHINE_PROFESSIONAL,
-            MieleAppliance.WASHING_MACHINE_SEMI_PROFESSIONAL,
-            MieleAppliance.DRYER_PROFESSIONAL,
-            MieleAppliance.TUMBLE_DRYER_SEMI_PROFESSIONAL,
-        ]:
-            _LOGGER.warning(
-                "Appliances in (semi-)professional series are not supported by Miele 3rd party API (Type: %s)",
-                appliance["ident|type|value_raw"],
-            )
-        if appliance["ident|type|value_raw"] not in MieleAppliance:
-            _LOGGER.warning(
-                "Appliance type %s is not supported by integration",
-                appliance["ident|type|value_raw"],
-            )
     miele_api = hass.data[DOMAIN][entry.entry_id][API]
-    for serial in serialnumbers:
-        try:
-            async with asyncio.timeout(API_READ_TIMEOUT):
-                res = await miele_api.request(
-                    "GET",
-                    f"/devices/{serial}/actions",
-                    agent_suffix=f"Miele for Home Assistant/{VERSION}",
-                )
-                if res.status == 401:
-                    raise ConfigEntryAuthFailed(
-                        "Authentication failure when fetching actions"
-                    )
-            result = await res.json()
-            hass.data[DOMAIN][entry.entry_id][ACTIONS][serial] = result
-        except TimeoutError as error:
-            raise ConfigEntryNotReady from error
-        except JSONDecodeError:
-            _LOGGER.warning(
-                "Could not decode json from fetch of actions for %s", serial
+    # Unload callbacks do not run when setup fails, close the session here
+    try:
+        # Entities are created from the stored snapshot, if there is one, and
+        # stay unavailable until live data has been fetched in the background
+        if snapshot := await store.async_load_snapshot():
+            devices, actions = snapshot
+            _LOGGER.debug("Setting up from stored snapshot of %s devices", len(devices))
+            coordinator.stale = True
+            coordinator.async_set_updated_data(
+                hass.data[DOMAIN][entry.entry_id]["ingest"].rebuild(devices)
             )
+            hass.data[DOMAIN][entry.entry_id][ACTIONS].update(actions)
+        else:
+            await coordinator.async_config_entry_first_refresh()
+        serialnumbers = list(coordinator.data.keys())
+        if len(serialnumbers) == 0:
+            _LOGGER.warning("No devices found in API for this account")
+        else:
+            _LOGGER.debug("Miele devices in API account: %s", serialnumbers)
+        _log_unsupported_appliances(coordinator.data)
+        if not coordinator.stale:
+            actions, failed = await _async_fetch_all_actions(miele_api, serialnumbers)
+            if serialnumbers and len(failed) == len(serialnumbers):
+                raise ConfigEntryNotReady("Could not fetch actions for any appliance")
+            hass.data[DOMAIN][entry.entry_id][ACTIONS].update(actions)
+        hass.data[DOMAIN][entry.entry_id]["appliances"] = set(serialnumbers)
+    except BaseException:
+        await websession.close()
+        raise
+
+    async def _async_close_websession(_event: Event) -> None:
+        """Close the session when Home Assistant stops without unloading."""
+        await websession.close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_websession)
+    )
 
     # hass.data[DOMAIN][entry.entry_id][ACTIONS]["1223019"] = TEST_ACTION_19
 
@@ -255,13 +267,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # data["1223045"] = TEST_DATA_45
         # data["1223073"] = TEST_DATA_73
         # data["1223074"] = TEST_DATA_74
-        flat_result: dict = {}
+        ingest: MieleIngest = hass.data[DOMAIN][entry.entry_id]["ingest"]
         try:
-            for ent in data:
-                flat_result[ent] = dict(flatdict.FlatterDict(data[ent], delimiter="|"))
-            coordinator.async_set_updated_data(flat_result)
+            if coordinator.stale:
+                # Pushed data is complete, replace the snapshot at once
+                coordinator.stale = False
+                coordinator.async_set_updated_data(ingest.rebuild(data))
+            else:
+                changes = ingest.ingest(data)
+                coordinator.async_set_changed_data(ingest.data, changes)
         except Exception:  # pylint: disable=broad-except  # noqa: E722
             _LOGGER.warning("Failed to process pushed data from API")
+            return
+        coordinator.async_push_received()
 
     async def _callback_update_actions(data) -> None:
         hass.data[DOMAIN][entry.entry_id][ACTIONS] = data
@@ -269,14 +287,76 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # data["1223021"] = TEST_ACTION_21
         coordinator.async_set_updated_data(coordinator.data)
 
-    hass.data[DOMAIN][entry.entry_id]["listener"] = asyncio.create_task(
-        hass.data[DOMAIN][entry.entry_id][API].listen_events(
-            data_callback=_callback_update_data,
-            actions_callback=_callback_update_actions,
-        )
+    hass.data[DOMAIN][entry.entry_id]["listener"] = MieleEventStream(
+        hass,
+        entry,
+        hass.data[DOMAIN][entry.entry_id][API],
+        coordinator,
+        _callback_update_data,
+        _callback_update_actions,
     )
+    hass.data[DOMAIN][entry.entry_id]["listener"].start()
+
+    async def _async_add_appliances(serials: list[str]) -> None:
+        """Fetch actions for new appliances and create their entities.
+
+        Actions are optional, the event stream fills them in later, so the
+        entities are created even when fetching them fails.
+        """
+        _LOGGER.info("New Miele devices in API account: %s", serials)
+        try:
+            actions, _ = await _async_fetch_all_actions(miele_api, serials)
+        except (ConfigEntryAuthFailed, ClientError, TimeoutError) as ex:
+            _LOGGER.warning("Could not fetch actions for %s: %s", serials, ex)
+        else:
+            hass.data[DOMAIN][entry.entry_id][ACTIONS].update(actions)
+        finally:
+            async_dispatcher_send(
+                hass, SIGNAL_NEW_APPLIANCES.format(entry.entry_id), serials
+            )
+
+    @callback
+    def _async_check_new_appliances() -> None:
+        """Add entities for appliances that appear in pushed or polled data."""
+        known = hass.data[DOMAIN][entry.entry_id]["appliances"]
+        if new := [serial for serial in coordinator.data or {} if serial not in known]:
+            known.update(new)
+            entry.async_create_background_task(
+                hass, _async_add_appliances(new), "miele_add_appliances"
+            )
+
+    async def _async_reconcile() -> None:
+        """Replace the stored snapshot with live data."""
+        await coordinator.async_refresh_with_triggers("snapshot reconcile")
+        try:
+            actions, _ = await _async_fetch_all_actions(
+                miele_api, list(coordinator.data)
+            )
+        except (ConfigEntryAuthFailed, ClientError, TimeoutError) as ex:
+            _LOGGER.warning("Could not fetch actions: %s", ex)
+            return
+        hass.data[DOMAIN][entry.entry_id][ACTIONS].update(actions)
+        coordinator.async_update_listeners()
+
+    @callback
+    def _async_save_snapshot() -> None:
+        """Store live data for the next startup."""
+        if coordinator.stale or not coordinator.last_update_success:
+            return
+        store.async_schedule_save(
+            lambda: (
+                {serial: data.raw for serial, data in coordinator.data.items()},
+                hass.data[DOMAIN][entry.entry_id][ACTIONS],
+            )
+        )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_new_appliances))
+    entry.async_on_unload(coordinator.async_add_listener(_async_save_snapshot))
+    if coordinator.stale:
+        entry.async_create_background_task(
+            hass, _async_reconcile(), "miele_reconcile_snapshot"
+        )
     await async_setup_services(hass)
 
     ir.async_create_issue(
@@ -304,61 +384,154 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     hass.data[DOMAIN][entry.entry_id]["listener"].cancel()
+    hass.data[DOMAIN][entry.entry_id][API].actions.cancel()
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
 
 
+def _log_unsupported_appliances(data: dict[str, MieleApplianceData]) -> None:
+    """Warn about appliances that cannot be used with the integration."""
+    for appliance in data.values():
+        if appliance.record.type_raw in [
+            MieleAppliance.DISHWASHER_SEMI_PROFESSIONAL,
+            MieleAppliance.DISHWASHER_PROFESSIONAL,
+            MieleAppliance.WASHING_MACHINE_PROFESSIONAL,
+            MieleAppliance.WASHING_MACHINE_SEMI_PROFESSIONAL,
+            MieleAppliance.DRYER_PROFESSIONAL,
+            MieleAppliance.TUMBLE_DRYER_SEMI_PROFESSIONAL,
+        ]:
+            _LOGGER.warning(
+                "Appliances in (semi-)professional series are not supported by Miele 3rd party API (Type: %s)",
+                appliance.record.type_raw,
+            )
+        if appliance.record.type_raw not in MieleAppliance:
+            _LOGGER.warning(
+                "Appliance type %s is not supported by integration",
+                appliance.record.type_raw,
+            )
+
+
+async def _async_fetch_actions(
+    miele_api: AsyncConfigEntryAuth, serial: str
+) -> dict[str, Any]:
+    """Fetch the actions currently accepted by an appliance."""
+    res = await miele_api.request(
+        "GET",
+        f"/devices/{serial}/actions",
+        agent_suffix=f"Miele for Home Assistant/{VERSION}",
+    )
+    if res.status == 401:
+        raise ConfigEntryAuthFailed("Authentication failure when fetching actions")
+    if res.status != 200:
+        raise UpdateFailed(f"HTTP Status {res.status}: fetching actions of {serial}")
+    return await res.json()
+
+
+async def _async_fetch_all_actions(
+    miele_api: AsyncConfigEntryAuth, serials: list[str]
+) -> tuple[dict[str, dict[str, Any]], list[str]]:
+    """Fetch the actions of several appliances concurrently.
+
+    At most ACTIONS_FETCH_PARALLEL requests are in flight at a time. A
+    connection error, timeout, error status or undecodable response only
+    affects the appliance concerned, which is returned in the list of failed
+    serial numbers. Its actions are filled in by the event stream later on.
+    Only authentication failures are raised.
+    """
+    semaphore = asyncio.Semaphore(ACTIONS_FETCH_PARALLEL)
+    elapsed: dict[str, float] = {}
+
+    async def fetch(serial: str) -> dict[str, Any]:
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                return await _async_fetch_actions(miele_api, serial)
+            finally:
+                elapsed[serial] = time.monotonic() - start
+
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(fetch(serial) for serial in serials), return_exceptions=True
+    )
+    total = time.monotonic() - start
+
+    actions: dict[str, dict[str, Any]] = {}
+    failed: list[str] = []
+    for serial, result in zip(serials, results, strict=True):
+        if isinstance(result, ConfigEntryAuthFailed):
+            raise result
+        if isinstance(result, TimeoutError):
+            _LOGGER.warning("Timeout fetching actions for %s", serial)
+            failed.append(serial)
+        elif isinstance(result, (ClientError, UpdateFailed)):
+            _LOGGER.warning("Error fetching actions for %s: %s", serial, result)
+            failed.append(serial)
+        elif isinstance(result, JSONDecodeError):
+            _LOGGER.warning(
+                "Could not decode json from fetch of actions for %s", serial
+            )
+            failed.append(serial)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            actions[serial] = result
+
+    sequential = sum(elapsed.values())
+    _LOGGER.debug(
+        "Fetched actions for %s appliances in %.2f s (%.2f s sequentially, "
+        "%.2f s saved), failed: %s",
+        len(serials),
+        total,
+        sequential,
+        max(sequential - total, 0),
+        failed,
+    )
+    return actions, failed
+
+
 async def get_coordinator(
     hass: HomeAssistant,
     entry: ConfigEntry,
-) -> DataUpdateCoordinator:
+) -> MieleDataUpdateCoordinator:
     """Get the data update coordinator."""
     if "coordinator" in hass.data[DOMAIN][entry.entry_id]:
         return hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
     async def async_fetch():
-        miele_api = hass.data[DOMAIN][entry.entry_id][API]
-        while True:
-            try:
-                async with asyncio.timeout(API_READ_TIMEOUT):
-                    res = await miele_api.request(
-                        "GET",
-                        f"/devices?language={hass.config.language}",
-                        agent_suffix=f"Miele for Home Assistant/{VERSION}",
-                    )
-                if res.status == 401:
-                    hass.data[DOMAIN][entry.entry_id]["retries_401"] += 1
-                    if hass.data[DOMAIN][entry.entry_id]["retries_401"] == 5:
-                        raise ConfigEntryAuthFailed(
-                            "Authentication failure when fetching data"
-                        )
-                    raise UpdateFailed(
-                        f"HTTP status 401: Retry {hass.data[DOMAIN][entry.entry_id]['retries_401']}"
-                    )
-                if res.status != 200:
-                    raise UpdateFailed(
-                        f"HTTP Status {res.status}: fetching {DOMAIN} data"
+        miele_api: AsyncConfigEntryAuth = hass.data[DOMAIN][entry.entry_id][API]
+        coordinator: MieleDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+            "coordinator"
+        ]
+        ingest: MieleIngest = hass.data[DOMAIN][entry.entry_id]["ingest"]
+        coordinator.push_received.clear()
+        try:
+            res = await miele_api.request(
+                "GET",
+                f"/devices?language={hass.config.language}",
+                agent_suffix=f"Miele for Home Assistant/{VERSION}",
+                cancel_event=coordinator.push_received,
+            )
+            if res.status == 401:
+                retries_401 = miele_api.retry.stats.consecutive_auth_failures
+                if retries_401 >= 5:
+                    raise ConfigEntryAuthFailed(
+                        "Authentication failure when fetching data"
                     )
-                result = await res.json()
-                break
-            except JSONDecodeError as error:
-                _LOGGER.error("Could not decode json from coordinator fetch")
-                raise UpdateFailed(error) from error
-            except TimeoutError as error:
-                hass.data[DOMAIN][entry.entry_id]["timeouts"] += 1
-                _LOGGER.debug(
-                    "Timeout #%s fetching data from API",
-                    hass.data[DOMAIN][entry.entry_id]["timeouts"],
-                )
-                if hass.data[DOMAIN][entry.entry_id]["timeouts"] >= 3:
-                    raise TimeoutError(error) from error
-                await asyncio.sleep(10)
-
-        hass.data[DOMAIN][entry.entry_id]["retries_401"] = 0
-        hass.data[DOMAIN][entry.entry_id]["timeouts"] = 0
-        flat_result: dict = {}
+                raise UpdateFailed(f"HTTP status 401: Retry {retries_401}")
+            if res.status != 200:
+                raise UpdateFailed(f"HTTP Status {res.status}: fetching {DOMAIN} data")
+            result = await res.json()
+        except RetryCancelled:
+            # Pushed data arrived while waiting to retry, it is complete
+            _LOGGER.debug("Fetch cancelled by pushed data")
+            return ingest.data
+        except JSONDecodeError as error:
+            _LOGGER.error("Could not decode json from coordinator fetch")
+            raise UpdateFailed(error) from error
+
+        coordinator.stale = False
         # result["1223001"] = TEST_DATA_1
         # result["1223003"] = TEST_DATA_3
         # result["1223004"] = TEST_DATA_4
@@ -376,29 +549,53 @@ async def get_coordinator(
         # result["1223073"] = TEST_DATA_73
         # result["1223074"] = TEST_DATA_74
 
+        # Polled data resynchronises the complete snapshot, pushed data
+        # is merged incrementally in _callback_update_data
         try:
-            for ent in result:
-                flat_result[ent] = dict(
-                    flatdict.FlatterDict(result[ent], delimiter="|")
-                )
-        except TypeError as ex:
-            _LOGGER.error("Error flattening data")
+            flat_result = ingest.rebuild(result)
+        except AttributeError as ex:
+            _LOGGER.error("Error processing data")
             raise UpdateFailed(ex) from ex
 
         # _LOGGER.debug("Data: %s", flat_result)
         return flat_result
 
-    hass.data[DOMAIN][entry.entry_id]["coordinator"] = DataUpdateCoordinator(
+    async def async_fetch_state(serial: str) -> None:
+        miele_api: AsyncConfigEntryAuth = hass.data[DOMAIN][entry.entry_id][API]
+        coordinator: MieleDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+            "coordinator"
+        ]
+        ingest: MieleIngest = hass.data[DOMAIN][entry.entry_id]["ingest"]
+        res = await miele_api.request(
+            "GET",
+            f"/devices/{serial}/state?language={hass.config.language}",
+            agent_suffix=f"Miele for Home Assistant/{VERSION}",
+        )
+        if res.status != 200:
+            raise UpdateFailed(f"HTTP Status {res.status}: fetching state of {serial}")
+        try:
+            state = await res.json()
+        except JSONDecodeError as error:
+            raise UpdateFailed(error) from error
+        if changed := ingest.ingest_state(serial, state):
+            coordinator.async_set_changed_data(ingest.data, {serial: changed})
+
+    hass.data[DOMAIN][entry.entry_id]["coordinator"] = MieleDataUpdateCoordinator(
         hass,
         logging.getLogger(__name__),
         name=DOMAIN,
         update_method=async_fetch,
-        update_interval=timedelta(seconds=60),
+        device_update_method=async_fetch_state,
+        update_interval=POLL_UPDATE_INTERVAL,
     )
-    await hass.data[DOMAIN][entry.entry_id]["coordinator"].async_refresh()
     return hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot of a removed config entry."""
+    await MieleSnapshotStore(hass, entry).async_remove()
+
+
 async def _setup_sensor_config(hass: HomeAssistant, config: ConfigType):
     """Set up sensors configuration."""
 
@@ -0,0 +1,189 @@
+"""Queue for actions sent to Miele appliances."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import logging
+import time
+from typing import Any
+
+from .const import (
+    ACTION_LOG_SIZE,
+    ACTION_MIN_INTERVAL,
+    POWER_OFF,
+    POWER_ON,
+    PROCESS_ACTION,
+    PROGRAM_ID,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SendAction = Callable[[str, dict[str, Any]], Awaitable[Any]]
+
+# Keys of commands, which take effect every time they are sent
+COMMAND_KEYS = frozenset({PROCESS_ACTION, POWER_ON, POWER_OFF, PROGRAM_ID})
+
+
+def _supersedes(
+    send: SendAction,
+    payload: dict[str, Any],
+    previous: _PendingAction,
+) -> bool:
+    """Return True if payload makes sending the previous payload pointless.
+
+    Only payloads for the same endpoint setting the same plain values
+    qualify, like a light or ventilation step, where the last value wins.
+    Commands like starting or stopping a program, powering on or off and
+    setting a program are always sent, in order. Nested values, like the
+    zones of target temperatures, may address different parts of the
+    appliance.
+    """
+    return (
+        send == previous.send
+        and payload.keys() == previous.payload.keys()
+        and COMMAND_KEYS.isdisjoint(payload)
+        and not any(isinstance(value, (dict, list)) for value in payload.values())
+    )
+
+
+class _PendingAction:
+    """An action waiting to be sent, and the callers waiting for it."""
+
+    __slots__ = ("futures", "payload", "queued", "send")
+
+    def __init__(
+        self, send: SendAction, payload: dict[str, Any], future: asyncio.Future
+    ) -> None:
+        """Initialize the pending action."""
+        self.send = send
+        self.payload = payload
+        self.futures = [future]
+        self.queued = time.monotonic()
+
+
+class MieleActionQueue:
+    """Send the actions of each appliance one at a time.
+
+    The API accepts a single action per request, so actions for the same
+    appliance are sent in order. An action setting a value queued directly
+    behind a pending action with the same keys replaces its payload, e.g. a
+    burst of ventilation steps only sends the last one, and all callers get
+    the result of that request. Commands are never merged. Requests of the
+    config entry are spaced at least ACTION_MIN_INTERVAL apart to avoid
+    being rate limited. Other requests changing the appliance, like setting
+    a program, can be queued with their own send function to share the
+    spacing. Callers of actions that are not sent when the queue is
+    cancelled get a CancelledError.
+    """
+
+    def __init__(
+        self, send: SendAction, min_interval: float = ACTION_MIN_INTERVAL
+    ) -> None:
+        """Initialize the queue."""
+        self._send = send
+        self._min_interval = min_interval
+        self._pending: dict[str, list[_PendingAction]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._next_slot = 0.0
+        self.merged = 0
+        self.log: deque[dict[str, Any]] = deque(maxlen=ACTION_LOG_SIZE)
+
+    async def async_send(
+        self,
+        serial: str,
+        payload: dict[str, Any],
+        send: SendAction | None = None,
+    ) -> Any:
+        """Queue an action and return the response once it has been sent."""
+        send = send or self._send
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(serial, [])
+        if pending and _supersedes(send, payload, pending[-1]):
+            pending[-1].payload = payload
+            pending[-1].futures.append(future)
+            self.merged += 1
+        else:
+            pending.append(_PendingAction(send, payload, future))
+        if serial not in self._workers:
+            self._workers[serial] = asyncio.create_task(self._async_work(serial))
+        return await future
+
+    def cancel(self) -> None:
+        """Stop sending, the pending actions are cancelled."""
+        for worker in self._workers.values():
+            worker.cancel()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue statistics."""
+        return {
+            "pending": sum(len(pending) for pending in self._pending.values()),
+            "merged": self.merged,
+            "log": list(self.log),
+        }
+
+    async def _async_wait_for_slot(self) -> None:
+        """Wait until the next request may be made."""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _async_work(self, serial: str) -> None:
+        """Send the pending actions of an appliance."""
+        pending = self._pending[serial]
+        action: _PendingAction | None = None
+        try:
+            while pending:
+                action = pending.pop(0)
+                await self._async_wait_for_slot()
+                start = time.monotonic()
+                try:
+                    result = await action.send(serial, action.payload)
+                except Exception as err:  # pylint: disable=broad-except  # noqa: BLE001
+                    status = getattr(err, "status", type(err).__name__)
+                    for future in action.futures:
+                        if not future.done():
+                            future.set_exception(err)
+                else:
+                    status = getattr(result, "status", None)
+                    for future in action.futures:
+                        if not future.done():
+                            future.set_result(result)
+                self._log_action(serial, action, start, status)
+        except asyncio.CancelledError:
+            # Nothing sends the remaining actions, their callers would hang
+            for cancelled in [action, *pending] if action else pending:
+                for future in cancelled.futures:
+                    future.cancel()
+            pending.clear()
+            raise
+        finally:
+            del self._workers[serial]
+            if not pending:
+                self._pending.pop(serial, None)
+
+    def _log_action(
+        self, serial: str, action: _PendingAction, start: float, status: Any
+    ) -> None:
+        """Record the latency of a sent action."""
+        now = time.monotonic()
+        entry = {
+            "serial": serial,
+            "action": list(action.payload),
+            "callers": len(action.futures),
+            "queued": round(start - action.queued, 3),
+            "latency": round(now - start, 3),
+            "status": status,
+        }
+        self.log.append(entry)
+        _LOGGER.debug(
+            "Action %s for %s: %.3f s queued, %.3f s request, status %s",
+            entry["action"],
+            serial,
+            entry["queued"],
+            entry["latency"],
+            status,
+        )
@@ -1,27 +1,106 @@
 """API for Miele bound to Home Assistant OAuth."""
 
-from typing import cast
+import asyncio
+import logging
+from typing import Any, cast
 
-from aiohttp import ClientSession
+from aiohttp import ClientResponse, ClientSession
 from pymiele import MIELE_API, AbstractAuth
 
 from homeassistant.helpers import config_entry_oauth2_flow
 
+from .actions import MieleActionQueue
+from .connection import MieleConnectionStats
+from .retry import MieleRetryPolicy
+
+_LOGGER = logging.getLogger(__name__)
+
 
 class AsyncConfigEntryAuth(AbstractAuth):
-    """Provide Miele authentication tied to an OAuth2 based config entry."""
+    """Provide Miele authentication tied to an OAuth2 based config entry.
+
+    The access token is taken from the OAuth2 session without further
+    checks while it is valid. Once it expires, the first request starts
+    the refresh of the session as a background task of the config entry,
+    and concurrent requests wait for that same refresh.
+    """
 
     def __init__(
         self,
         websession: ClientSession,
         oauth_session: config_entry_oauth2_flow.OAuth2Session,
+        connection_stats: MieleConnectionStats | None = None,
     ) -> None:
         """Initialize Miele auth."""
         super().__init__(websession, MIELE_API)
         self._oauth_session = oauth_session
+        self.connection_stats = connection_stats
+        self._token_refresh: asyncio.Task[None] | None = None
+        self.retry = MieleRetryPolicy()
+        self.actions = MieleActionQueue(super().send_action)
 
     async def async_get_access_token(self) -> str:
         """Return a valid access token."""
-        await self._oauth_session.async_ensure_token_valid()
+        if not self._oauth_session.valid_token:
+            await asyncio.shield(self._async_token_refresh())
 
         return cast(str, self._oauth_session.token["access_token"])
+
+    def _async_token_refresh(self) -> asyncio.Task[None]:
+        """Return the running token refresh, start one if there is none."""
+        if self._token_refresh is None or self._token_refresh.done():
+            session = self._oauth_session
+            _LOGGER.debug("Refreshing access token")
+            self._token_refresh = session.config_entry.async_create_background_task(
+                session.hass,
+                session.async_ensure_token_valid(),
+                "miele_token_refresh",
+            )
+            self._token_refresh.add_done_callback(self._token_refresh_done)
+        return self._token_refresh
+
+    @staticmethod
+    def _token_refresh_done(task: asyncio.Task[None]) -> None:
+        """Mark the error of a failed refresh as seen, the requests raise it."""
+        if not task.cancelled():
+            task.exception()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        cancel_event: asyncio.Event | None = None,
+        **kwargs: Any,
+    ) -> ClientResponse:
+        """Make a request, retried according to the retry policy."""
+        return await self.retry.async_call(
+            lambda: super(AsyncConfigEntryAuth, self).request(method, url, **kwargs),
+            idempotent=method == "GET",
+            cancel_event=cancel_event,
+        )
+
+    async def send_action(self, serial: str, data: dict[str, Any]) -> ClientResponse:
+        """Send an action through the action queue of the appliance."""
+        return await self.actions.async_send(serial, data)
+
+    async def set_program(self, serial: str, data: dict[str, Any]) -> ClientResponse:
+        """Set a program through the action queue of the appliance."""
+        return await self.actions.async_send(serial, data, super().set_program)
+
+    async def set_target_temperature(
+        self, serial: str, temperature: float, zone: int = 1
+    ) -> ClientResponse:
+        """Set a target temperature through the action queue of the appliance."""
+        data = {"targetTemperature": [{"zone": zone, "value": round(temperature)}]}
+        return await self.actions.async_send(
+            serial, data, self._send_target_temperature
+        )
+
+    async def _send_target_temperature(
+        self, serial: str, data: dict[str, Any]
+    ) -> ClientResponse:
+        """Send a queued target temperature."""
+        (target,) = data["targetTemperature"]
+        return await super().set_target_temperature(
+            serial, target["value"], target["zone"]
+        )
@@ -0,0 +1,176 @@
+"""Access to appliance data for the Miele integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .flatten import DELIMITER, flatten
+from .keys import KEY_CATALOGUE, MISSING, compile_key
+
+# Temperature channels of the state, in hundredths of a degree per zone
+TEMPERATURE_CHANNELS = (
+    "temperature",
+    "targetTemperature",
+    "coreTemperature",
+    "coreTargetTemperature",
+)
+# Raw temperature values meaning there is no temperature
+TEMPERATURE_SENTINELS = frozenset({-32768, -32766})
+
+TemperatureChannel = tuple[str, int]
+
+
+def temperature_channel(key: str) -> TemperatureChannel | None:
+    """Return the channel and zone of a temperature key.
+
+    The key "state|targetTemperature|1|value_raw" is zone 1 of the
+    targetTemperature channel. Other keys return None.
+    """
+    match key.split(DELIMITER):
+        case ["state", channel, zone, "value_raw"] if (
+            channel in TEMPERATURE_CHANNELS and zone.isdigit()
+        ):
+            return channel, int(zone)
+    return None
+
+
+def decode_temperatures(raw: dict[str, Any]) -> dict[str, tuple[float | None, ...]]:
+    """Return all temperature channels of a payload in degrees.
+
+    Sentinel and missing values are None.
+    """
+    state = raw.get("state")
+    if not isinstance(state, dict):
+        return {}
+    decoded: dict[str, tuple[float | None, ...]] = {}
+    for channel in TEMPERATURE_CHANNELS:
+        if not isinstance(zones := state.get(channel), list):
+            continue
+        decoded[channel] = tuple(
+            None
+            if not isinstance(zone, dict)
+            or not isinstance(value := zone.get("value_raw"), (int, float))
+            or value in TEMPERATURE_SENTINELS
+            else value / 100
+            for zone in zones
+        )
+    return decoded
+
+
+@dataclass(slots=True, frozen=True)
+class MieleApplianceRecord:
+    """Values of an appliance that the platforms read on every update."""
+
+    type_raw: int | None
+    status: int | None
+    program_id: int | None
+    program_phase: int | None
+
+
+# Flat data key of every record field
+RECORD_KEYS: dict[str, str] = {
+    "type_raw": "ident|type|value_raw",
+    "status": "state|status|value_raw",
+    "program_id": "state|ProgramID|value_raw",
+    "program_phase": "state|programPhase|value_raw",
+}
+
+# Flat data keys of values read at setup or by few entities, these are read
+# from the payload when needed instead of being kept in the record
+TECH_TYPE_KEY = "ident|deviceIdentLabel|techType"
+XKM_TECH_TYPE_KEY = "ident|xkmIdentLabel|techType"
+XKM_RELEASE_VERSION_KEY = "ident|xkmIdentLabel|releaseVersion"
+BATTERY_LEVEL_KEY = "state|batteryLevel"
+
+
+def _read_record(raw: dict[str, Any]) -> MieleApplianceRecord:
+    """Read the record fields from a payload, missing values are None."""
+    values: dict[str, Any] = {}
+    for name, key in RECORD_KEYS.items():
+        try:
+            values[name] = compile_key(key)(raw)
+        except KeyError:
+            values[name] = None
+    return MieleApplianceRecord(**values)
+
+
+class MieleApplianceData(Mapping[str, Any]):
+    """Flat view of the raw API payload of one appliance.
+
+    Values are read straight from the nested payload through compiled key
+    accessors, so the payload does not have to be flattened when it is
+    received. The flat keys are only built when the view is iterated, e.g.
+    for diagnostics, and are not kept.
+
+    The payload is the only copy of the appliance data that is kept in
+    full. On top of it, the values the platforms read on every update are
+    available as attributes of a small slotted record, and the temperature
+    channels decoded into degrees with sentinels masked. The keys that
+    entities read are extracted into a tuple in the order of the key
+    catalogue, see value_at. All are built once per payload when first
+    read. Other values, like the model and firmware labels, are read from
+    the payload by flat key when needed.
+    """
+
+    __slots__ = ("_record", "_temperatures", "_values", "raw")
+
+    def __init__(self, raw: dict[str, Any]) -> None:
+        """Initialize the view."""
+        self.raw = raw
+        self._record: MieleApplianceRecord | None = None
+        self._temperatures: dict[str, tuple[float | None, ...]] | None = None
+        self._values: tuple[Any, ...] = ()
+
+    def set_raw(self, raw: dict[str, Any]) -> None:
+        """Replace the payload of the appliance."""
+        self.raw = raw
+        self._record = None
+        self._temperatures = None
+        self._values = ()
+
+    @property
+    def record(self) -> MieleApplianceRecord:
+        """Return the values read by the platforms on every update."""
+        if self._record is None:
+            self._record = _read_record(self.raw)
+        return self._record
+
+    def value_at(self, position: int, default: Any = None) -> Any:
+        """Return the value of a catalogued key by its position.
+
+        The values of all keys in the layout of the appliance type are
+        extracted together, again if the layout has grown since.
+        """
+        if position >= len(self._values):
+            self._values = KEY_CATALOGUE.layout(self.record.type_raw).extract(self.raw)
+        value = self._values[position]
+        return default if value is MISSING else value
+
+    def as_flat_dict(self) -> dict[str, Any]:
+        """Return the appliance data as a flat dict."""
+        return flatten(self.raw)
+
+    def temperature(self, channel: str, zone: int) -> float | None:
+        """Return a temperature in degrees, None if there is none."""
+        if self._temperatures is None:
+            self._temperatures = decode_temperatures(self.raw)
+        zones = self._temperatures.get(channel, ())
+        return zones[zone] if zone < len(zones) else None
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of a flat data key."""
+        return compile_key(key)(self.raw)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the flat data keys."""
+        return iter(flatten(self.raw))
+
+    def __len__(self) -> int:
+        """Return the number of flat data keys."""
+        return len(flatten(self.raw))
+
+    def __repr__(self) -> str:
+        """Return the representation of the view."""
+        return f"{self.__class__.__name__}({self.raw!r})"
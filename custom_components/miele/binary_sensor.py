@@ -22,7 +22,11 @@ from homeassistant.helpers.update_coordinator import (
 
 from . import get_coordinator
 from .const import MieleAppliance
-from .entity import MieleEntity
+from .entity import (
+    MieleEntity,
+    async_setup_appliance_entities,
+    descriptions_by_type,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -266,6 +270,8 @@ BINARY_SENSOR_TYPES: Final[tuple[MieleBinarySensorDefinition, ...]] = (
     ),
 )
 
+BINARY_SENSOR_DESCRIPTIONS = descriptions_by_type(BINARY_SENSOR_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -275,14 +281,17 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     coordinator = await get_coordinator(hass, config_entry)
 
-    entities = [
-        MieleBinarySensor(coordinator, idx, ent, definition.description)
-        for idx, ent in enumerate(coordinator.data)
-        for definition in BINARY_SENSOR_TYPES
-        if coordinator.data[ent]["ident|type|value_raw"] in definition.types
-    ]
+    def appliance_entities(idx: int, ent: str) -> list[MieleBinarySensor]:
+        return [
+            MieleBinarySensor(coordinator, idx, ent, description)
+            for description in BINARY_SENSOR_DESCRIPTIONS.get(
+                coordinator.data[ent].record.type_raw, ()
+            )
+        ]
 
-    async_add_entities(entities)
+    async_setup_appliance_entities(
+        hass, config_entry, coordinator, async_add_entities, appliance_entities
+    )
 
 
 class MieleBinarySensor(MieleEntity, BinarySensorEntity):
@@ -300,17 +309,18 @@ class MieleBinarySensor(MieleEntity, BinarySensorEntity):
         """Initialize the sensor."""
         super().__init__(coordinator, idx, ent, description)
         _LOGGER.debug("init sensor %s", ent)
+        self._data_tag_pos = self._data_position(description.data_tag)
 
     @property
     def is_on(self):
         """Return the state of the sensor."""
-        return self.coordinator.data[self._ent][self.entity_description.data_tag]
+        return self.coordinator.data[self._ent].value_at(self._data_tag_pos)
 
     @property
     def available(self):
         """Return the availability of the entity."""
 
-        if not self.coordinator.last_update_success:
+        if not super().available:
             return False
 
-        return self.coordinator.data[self._ent]["state|status|value_raw"] != 255
+        return self.coordinator.data[self._ent].record.status != 255
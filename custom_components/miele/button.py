@@ -26,7 +26,11 @@ from .const import (
     PROCESS_ACTION,
     MieleAppliance,
 )
-from .entity import MieleEntity
+from .entity import (
+    MieleEntity,
+    async_setup_appliance_entities,
+    descriptions_by_type,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -97,6 +101,8 @@ BUTTON_TYPES: Final[tuple[MieleButtonDefinition, ...]] = (
     ),
 )
 
+BUTTON_DESCRIPTIONS = descriptions_by_type(BUTTON_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -106,14 +112,17 @@ async def async_setup_entry(
     """Set up the button platform."""
     coordinator = await get_coordinator(hass, config_entry)
 
-    entities = [
-        MieleButton(coordinator, idx, ent, definition.description, hass, config_entry)
-        for idx, ent in enumerate(coordinator.data)
-        for definition in BUTTON_TYPES
-        if coordinator.data[ent]["ident|type|value_raw"] in definition.types
-    ]
+    def appliance_entities(idx: int, ent: str) -> list[MieleButton]:
+        return [
+            MieleButton(coordinator, idx, ent, description, hass, config_entry)
+            for description in BUTTON_DESCRIPTIONS.get(
+                coordinator.data[ent].record.type_raw, ()
+            )
+        ]
 
-    async_add_entities(entities)
+    async_setup_appliance_entities(
+        hass, config_entry, coordinator, async_add_entities, appliance_entities
+    )
 
 
 class MieleButton(MieleEntity, ButtonEntity):
@@ -166,12 +175,13 @@ class MieleButton(MieleEntity, ButtonEntity):
     def available(self):
         """Return the availability of the entity."""
 
-        if not self.coordinator.last_update_success:
+        if not super().available:
+            return False
+
+        if self.coordinator.data[self._ent].record.status == 255:
             return False
 
-        return self.coordinator.data[self._ent][
-            "state|status|value_raw"
-        ] != 255 and self._action_available(self.entity_description.press_data)
+        return self._action_available(self.entity_description.press_data)
 
     async def async_press(self):
         """Press the button."""
@@ -183,6 +193,7 @@ class MieleButton(MieleEntity, ButtonEntity):
                 )
             except aiohttp.ClientResponseError as ex:
                 _LOGGER.error("Press: %s - %s", ex.status, ex.message)
+            self.coordinator.async_schedule_refresh("press", self._ent)
             # TODO Consider removing accepted action from [ACTIONS] to block
             #      further calls of async_press util API update arrives
         else:
@@ -20,6 +20,7 @@ from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from . import get_coordinator
+from .appliance import TemperatureChannel, temperature_channel
 from .const import (
     ACTIONS,
     API,
@@ -27,7 +28,11 @@ from .const import (
     TARGET_TEMPERATURE,
     MieleAppliance,
 )
-from .entity import MieleEntity
+from .entity import (
+    MieleEntity,
+    async_setup_appliance_entities,
+    descriptions_by_type,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -130,6 +135,8 @@ CLIMATE_TYPES: Final[tuple[MieleClimateDefinition, ...]] = (
     ),
 )
 
+CLIMATE_DESCRIPTIONS = descriptions_by_type(CLIMATE_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -139,18 +146,19 @@ async def async_setup_entry(
     """Set up the climate platform."""
     coordinator = await get_coordinator(hass, config_entry)
 
-    entities = [
-        MieleClimate(coordinator, idx, ent, definition.description, hass, config_entry)
-        for idx, ent in enumerate(coordinator.data)
-        for definition in CLIMATE_TYPES
-        if coordinator.data[ent]["ident|type|value_raw"] in definition.types
-        and coordinator.data[ent].get(
-            definition.description.target_temperature_tag, -32768
-        )
-        != -32768
-    ]
+    def appliance_entities(idx: int, ent: str) -> list[MieleClimate]:
+        return [
+            MieleClimate(coordinator, idx, ent, description, hass, config_entry)
+            for description in CLIMATE_DESCRIPTIONS.get(
+                coordinator.data[ent].record.type_raw, ()
+            )
+            if (channel := temperature_channel(description.target_temperature_tag))
+            and coordinator.data[ent].temperature(*channel) is not None
+        ]
 
-    async_add_entities(entities)
+    async_setup_appliance_entities(
+        hass, config_entry, coordinator, async_add_entities, appliance_entities
+    )
 
 
 class MieleClimate(MieleEntity, ClimateEntity):
@@ -176,26 +184,26 @@ class MieleClimate(MieleEntity, ClimateEntity):
         _LOGGER.debug("init climate %s", ent)
         # _LOGGER.debug(
         #   "Type: %s, Zone: %s",
-        #   self.coordinator.data[self._ent]["ident|type|value_raw"], self._ed.zone,
+        #   self.coordinator.data[self._ent].record.type_raw, self._ed.zone,
         # )
 
         if (
-            self.coordinator.data[self._ent]["ident|type|value_raw"] == 21
+            self.coordinator.data[self._ent].record.type_raw == 21
             and self._ed.zone == 0
         ):
             name = "fridge"
         elif (
-            self.coordinator.data[self._ent]["ident|type|value_raw"] == 21
+            self.coordinator.data[self._ent].record.type_raw == 21
             and self._ed.zone == 1
         ):
             name = "freezer"
         elif (
-            self.coordinator.data[self._ent]["ident|type|value_raw"] == 19
+            self.coordinator.data[self._ent].record.type_raw == 19
             and self._ed.zone == 0
         ):
             name = "fridge"
         elif (
-            self.coordinator.data[self._ent]["ident|type|value_raw"] == 20
+            self.coordinator.data[self._ent].record.type_raw == 20
             and self._ed.zone == 0
         ):
             name = "freezer"
@@ -224,31 +232,31 @@ class MieleClimate(MieleEntity, ClimateEntity):
             self._attr_min_temp = None
 
         self._attr_target_temperature_step = self._ed.target_temperature_step
+        self._current_channel = temperature_channel(self._ed.current_temperature_tag)
+        self._target_channel = temperature_channel(self._ed.target_temperature_tag)
         self._attr_hvac_modes = self._ed.hvac_modes
         self._attr_hvac_mode = HVACMode.COOL
         self._attr_supported_features = self._ed.supported_features
 
+    def _temperature(self, channel: TemperatureChannel | None) -> float | None:
+        """Return a decoded temperature rounded to tenths."""
+        if (
+            channel is None
+            or (value := self.coordinator.data[self._ent].temperature(*channel)) is None
+        ):
+            return None
+        return round(value, 1)
+
     @property
     def current_temperature(self):
         """Return the current temperature."""
-        return round(
-            self.coordinator.data[self._ent][self._ed.current_temperature_tag] / 100,
-            1,
-        )
+        return self._temperature(self._current_channel)
 
     @property
     def target_temperature(self):
         """Return the target temperature."""
-        if self.coordinator.data[self._ent].get(
-            self._ed.target_temperature_tag, -32768
-        ) in (
-            -32766,
-            -32768,
-        ):
-            return None
-        return round(
-            self.coordinator.data[self._ent][self._ed.target_temperature_tag] / 100,
-            1,
+        return self.optimistic_value(
+            "target_temperature", self._temperature(self._target_channel)
         )
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
@@ -256,16 +264,23 @@ class MieleClimate(MieleEntity, ClimateEntity):
         _LOGGER.debug("kwargs: %s", kwargs)
         if (temperature := kwargs.get(ATTR_TEMPERATURE)) is None:
             return
-        await self._api.set_target_temperature(
-            self._ent, temperature, self._ed.zone + 1
+        # The API takes whole degrees, expect the value that is actually sent
+        expected = round(temperature)
+        async with self.async_optimistic(target_temperature=float(expected)):
+            await self._api.set_target_temperature(
+                self._ent, temperature, self._ed.zone + 1
+            )
+        self.coordinator.async_schedule_refresh(
+            "set_temperature",
+            self._ent,
+            {self._ed.target_temperature_tag: expected * 100},
         )
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self):
         """Return the availability of the entity."""
 
-        if not self.coordinator.last_update_success:
+        if not super().available:
             return False
 
-        return self.coordinator.data[self._ent]["state|status|value_raw"] != 255
+        return self.coordinator.data[self._ent].record.status != 255
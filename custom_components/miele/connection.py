@@ -0,0 +1,216 @@
+"""HTTP session and connection metrics for the Miele API."""
+
+from __future__ import annotations
+
+from collections import deque
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import (
+    ClientSession,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionCreateStartParams,
+    TraceConnectionReuseconnParams,
+    TraceDnsCacheHitParams,
+    TraceDnsResolveHostEndParams,
+    TraceDnsResolveHostStartParams,
+    TraceRequestEndParams,
+    TraceRequestExceptionParams,
+    TraceRequestStartParams,
+)
+
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util import ssl as ssl_util
+
+from .const import (
+    API_DNS_CACHE_TTL,
+    API_KEEPALIVE_TIMEOUT,
+    API_LATENCY_SAMPLES,
+    API_POOL_SIZE,
+)
+
+if TYPE_CHECKING:
+    from .stream import MieleEventStream
+
+# Path of the event stream below the API URL
+STREAM_PATH = "/devices/all/events"
+
+
+def _percentile(samples: list[float], percent: int) -> float | None:
+    """Return a percentile of sorted samples, in milliseconds."""
+    if not samples:
+        return None
+    index = min(len(samples) - 1, round(percent / 100 * (len(samples) - 1)))
+    return round(samples[index] * 1000, 1)
+
+
+class MieleConnectionStats:
+    """Count how requests to the API get their connections.
+
+    New connections include the DNS lookup, the TCP connect and the TLS
+    handshake. The time spent connecting, excluding DNS, is mostly the TLS
+    handshake, and shows whether cold connections dominate the latency.
+
+    The client library opens the event stream again by itself after errors
+    and missed pings, without reporting it. The requests for the stream
+    are therefore passed on to the stream supervisor, if one is set.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.requests = 0
+        self.failed = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_lookups = 0
+        self.dns_cache_hits = 0
+        self.dns_time = 0.0
+        self.connect_time = 0.0
+        self._latencies: deque[float] = deque(maxlen=API_LATENCY_SAMPLES)
+        self.stream: MieleEventStream | None = None
+
+    def trace_config(self) -> TraceConfig:
+        """Return a trace config feeding the statistics."""
+        trace = TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_connection_create_start.append(self._on_connection_create_start)
+        trace.on_connection_create_end.append(self._on_connection_create_end)
+        trace.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace.on_dns_resolvehost_start.append(self._on_dns_resolvehost_start)
+        trace.on_dns_resolvehost_end.append(self._on_dns_resolvehost_end)
+        trace.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        return trace
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics."""
+        latencies = sorted(self._latencies)
+        created = self.connections_created
+        return {
+            "requests": self.requests,
+            "failed": self.failed,
+            "connections_created": created,
+            "connections_reused": self.connections_reused,
+            "dns_lookups": self.dns_lookups,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_time_avg_ms": (
+                round(self.dns_time / self.dns_lookups * 1000, 1)
+                if self.dns_lookups
+                else None
+            ),
+            "connect_time_avg_ms": (
+                round(self.connect_time / created * 1000, 1) if created else None
+            ),
+            "latency_p50_ms": _percentile(latencies, 50),
+            "latency_p90_ms": _percentile(latencies, 90),
+            "latency_p99_ms": _percentile(latencies, 99),
+        }
+
+    async def _on_request_start(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceRequestStartParams,
+    ) -> None:
+        ctx.request_start = time.monotonic()
+        ctx.dns_time = 0.0
+        if self.stream is not None and params.url.path.endswith(STREAM_PATH):
+            self.stream.async_connecting()
+
+    async def _on_request_end(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceRequestEndParams,
+    ) -> None:
+        self.requests += 1
+        self._latencies.append(time.monotonic() - ctx.request_start)
+        if self.stream is not None and params.url.path.endswith(STREAM_PATH):
+            self.stream.async_connected(params.response.status)
+
+    async def _on_request_exception(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceRequestExceptionParams,
+    ) -> None:
+        self.requests += 1
+        self.failed += 1
+        if self.stream is not None and params.url.path.endswith(STREAM_PATH):
+            self.stream.async_connect_failed(params.exception)
+
+    async def _on_connection_create_start(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceConnectionCreateStartParams,
+    ) -> None:
+        ctx.connect_start = time.monotonic()
+
+    async def _on_connection_create_end(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceConnectionCreateEndParams,
+    ) -> None:
+        self.connections_created += 1
+        self.connect_time += time.monotonic() - ctx.connect_start - ctx.dns_time
+
+    async def _on_connection_reuseconn(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceConnectionReuseconnParams,
+    ) -> None:
+        self.connections_reused += 1
+
+    async def _on_dns_resolvehost_start(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceDnsResolveHostStartParams,
+    ) -> None:
+        ctx.dns_start = time.monotonic()
+
+    async def _on_dns_resolvehost_end(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceDnsResolveHostEndParams,
+    ) -> None:
+        ctx.dns_time = time.monotonic() - ctx.dns_start
+        self.dns_lookups += 1
+        self.dns_time += ctx.dns_time
+
+    async def _on_dns_cache_hit(
+        self,
+        session: ClientSession,
+        ctx: SimpleNamespace,
+        params: TraceDnsCacheHitParams,
+    ) -> None:
+        self.dns_cache_hits += 1
+
+
+def async_create_api_session(stats: MieleConnectionStats) -> ClientSession:
+    """Create a session with a connection pool of its own for the API.
+
+    Idle connections are kept open for API_KEEPALIVE_TIMEOUT seconds, so
+    polls and actions following each other reuse the TLS connection. The
+    event stream holds one connection of the pool permanently.
+    """
+    connector = TCPConnector(
+        limit=API_POOL_SIZE,
+        limit_per_host=API_POOL_SIZE,
+        keepalive_timeout=API_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=API_DNS_CACHE_TTL,
+        ssl=ssl_util.get_default_context(),
+    )
+    return ClientSession(
+        connector=connector,
+        headers={"User-Agent": SERVER_SOFTWARE},
+        trace_configs=[stats.trace_config()],
+    )
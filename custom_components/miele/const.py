@@ -1,10 +1,58 @@
 """Constants for the Miele integration."""
 
+from datetime import timedelta
 from enum import IntEnum
 
 DOMAIN = "miele"
 VERSION = "2026.2.0"
 API_READ_TIMEOUT = 20
+# The client library limits its requests changing the appliance to 10 s
+# including all attempts, so writes are retried within that bound
+API_WRITE_TIMEOUT = 10
+API_RETRY_ATTEMPTS = 3
+API_RETRY_BUDGET = 45
+API_RETRY_BACKOFF_MIN = 2
+API_RETRY_BACKOFF_MAX = 20
+ACTIONS_FETCH_PARALLEL = 4
+
+# Connection pool of the API session, the event stream holds one connection
+API_POOL_SIZE = 8
+API_KEEPALIVE_TIMEOUT = 75
+API_DNS_CACHE_TTL = 300
+API_LATENCY_SAMPLES = 200
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 300
+
+# Update modes, polling is stretched while the event stream is healthy
+UPDATE_MODE_POLL = "poll"
+UPDATE_MODE_PUSH = "push"
+POLL_UPDATE_INTERVAL = timedelta(seconds=60)
+PUSH_UPDATE_INTERVAL = timedelta(minutes=15)
+# The stream counts as healthy while its last event is at most this old
+PUSH_EVENT_WINDOW = timedelta(minutes=5)
+
+# Refresh requests within this many seconds are combined into one fetch
+REFRESH_COALESCE_DELAY = 2
+REFRESH_LOG_SIZE = 50
+
+# Minimum number of seconds between actions sent for a config entry
+ACTION_MIN_INTERVAL = 0.5
+ACTION_LOG_SIZE = 50
+
+# Default number of appliances a service call acts on concurrently
+SERVICE_PARALLEL = 4
+SERVICE_PARALLEL_MAX = 16
+
+# Seconds an optimistic state is shown without confirmation from the API
+OPTIMISTIC_STATE_TTL = 30
+
+# Supervision of the event stream
+STREAM_RATE_WINDOW = timedelta(hours=1)
+STREAM_BACKOFF_MIN = 5
+STREAM_BACKOFF_MAX = 300
+# Interval of the check for a stream without events within PUSH_EVENT_WINDOW
+STREAM_SILENCE_CHECK = timedelta(minutes=1)
 MANUFACTURER = "Miele"
 
 # Conf keys
@@ -13,6 +61,10 @@ CONF_PROGRAM_IDS = "program_ids"
 CONF_ID = "id"
 CONF_VALUE_RAW = "value_raw"
 CONF_VALUE = "value"
+CONF_MAX_PARALLEL = "max_parallel"
+
+# Keys in hass.data[DOMAIN] shared by all config entries
+DEVICE_INDEX = "device_index"
 
 
 class MieleAppliance(IntEnum):
@@ -1130,3 +1182,5 @@ AMBIENT_COLORS = {
 
 ACTIONS = "actions"
 API = "api"
+
+SIGNAL_NEW_APPLIANCES = "miele_new_appliances_{}"
@@ -0,0 +1,340 @@
+"""Data update coordinator for the Miele integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import time
+from typing import Any
+
+from aiohttp import ClientError
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .appliance import MieleApplianceData
+from .const import (
+    POLL_UPDATE_INTERVAL,
+    PUSH_EVENT_WINDOW,
+    PUSH_UPDATE_INTERVAL,
+    REFRESH_COALESCE_DELAY,
+    REFRESH_LOG_SIZE,
+    UPDATE_MODE_POLL,
+    UPDATE_MODE_PUSH,
+)
+
+_KeyIndex = tuple[dict[str, dict[str, list[CALLBACK_TYPE]]], list[CALLBACK_TYPE]]
+
+
+class MieleDataUpdateCoordinator(DataUpdateCoordinator[dict[str, MieleApplianceData]]):
+    """Coordinator that only notifies entities affected by pushed changes.
+
+    Listeners may register with a context of (serial number, data keys).
+    When data is set together with a change set, only listeners whose
+    serial number and keys intersect the changes are called. Full updates,
+    like polls, errors and the first data after an error, still notify
+    every listener.
+
+    While the event stream is connected and has delivered an event within
+    PUSH_EVENT_WINDOW, polling is stretched to PUSH_UPDATE_INTERVAL as a
+    safety net. The client reconnects the stream by itself without
+    reporting it, so a stream without recent events is not trusted and
+    polling falls back to POLL_UPDATE_INTERVAL, at the latest with the next
+    poll. The stream supervisor reports when the stream is lost or silent,
+    and polling falls back at once.
+
+    Refreshes requested with async_schedule_refresh within
+    REFRESH_COALESCE_DELAY are combined. Requests for single appliances
+    only fetch their state, and are skipped when pushed data already shows
+    the expected values. Every refresh is recorded in refresh_log together
+    with what triggered it.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        device_update_method: Callable[[str], Awaitable[None]],
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(*args, **kwargs)
+        self.device_update_method = device_update_method
+        self.changes: dict[str, set[str]] | None = None
+        # True while the data comes from the stored snapshot
+        self.stale = False
+        self.update_mode = UPDATE_MODE_POLL
+        self.stream_connected = False
+        self.last_event: float | None = None
+        # Set when pushed data arrives, cancels retries of a running poll
+        self.push_received = asyncio.Event()
+        self.last_push = 0.0
+        self.refresh_log: deque[dict[str, Any]] = deque(maxlen=REFRESH_LOG_SIZE)
+        self._refresh_triggers: list[str] = []
+        self._pending_triggers: list[str] = []
+        self._pending_devices: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._pending_unconditional = False
+        self._unsub_coalesced_refresh: CALLBACK_TYPE | None = None
+        self._keyed_listeners: dict[
+            CALLBACK_TYPE, tuple[CALLBACK_TYPE, str, frozenset[str]]
+        ] = {}
+        self._key_index: _KeyIndex | None = None
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, indexed by serial number and keys if given."""
+        remove = super().async_add_listener(update_callback, context)
+        self._key_index = None
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            self._keyed_listeners.pop(remove_listener, None)
+            self._key_index = None
+
+        if isinstance(context, tuple) and len(context) == 2:
+            serial, keys = context
+            self._keyed_listeners[remove_listener] = (
+                update_callback,
+                serial,
+                frozenset(keys),
+            )
+        return remove_listener
+
+    def _build_key_index(self) -> _KeyIndex:
+        """Build the serial number -> data key -> listeners index."""
+        index: dict[str, dict[str, list[CALLBACK_TYPE]]] = {}
+        for update_callback, serial, keys in self._keyed_listeners.values():
+            by_key = index.setdefault(serial, {})
+            for key in keys:
+                by_key.setdefault(key, []).append(update_callback)
+        keyed = {
+            update_callback for update_callback, _, _ in self._keyed_listeners.values()
+        }
+        unkeyed = [
+            update_callback
+            for update_callback, _ in self._listeners.values()
+            if update_callback not in keyed
+        ]
+        return index, unkeyed
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, limited to the affected ones for pushed changes."""
+        if self.changes is None:
+            super().async_update_listeners()
+            return
+
+        if self._key_index is None:
+            self._key_index = self._build_key_index()
+        index, unkeyed = self._key_index
+
+        notify: dict[CALLBACK_TYPE, None] = dict.fromkeys(unkeyed)
+        for serial, changed in self.changes.items():
+            if not (by_key := index.get(serial)):
+                continue
+            if len(changed) > len(by_key):
+                keys = [key for key in by_key if key in changed]
+            else:
+                keys = [key for key in changed if key in by_key]
+            for key in keys:
+                notify.update(dict.fromkeys(by_key[key]))
+
+        for update_callback in notify:
+            update_callback()
+
+    @callback
+    def async_set_changed_data(
+        self, data: dict[str, MieleApplianceData], changes: dict[str, set[str]]
+    ) -> None:
+        """Set pushed data and notify only the listeners affected by changes.
+
+        Data set after a failed update notifies every listener, as all
+        entities have been unavailable, not only those of the changed keys.
+        """
+        if self.last_update_success:
+            self.changes = changes
+        try:
+            self.async_set_updated_data(data)
+        finally:
+            self.changes = None
+
+    @callback
+    def async_stream_connected(self) -> None:
+        """Register that the event stream has been (re)connected."""
+        self.stream_connected = True
+        self.last_event = None
+
+    @callback
+    def async_stream_disconnected(self) -> None:
+        """Fall back to polling when the event stream is lost."""
+        self.stream_connected = False
+        if self._async_update_mode():
+            self.async_schedule_refresh("stream lost")
+
+    @callback
+    def async_stream_silent(self) -> None:
+        """Fall back to polling when the event stream has no recent events."""
+        if self._async_update_mode():
+            self.async_schedule_refresh("stream silent")
+
+    @callback
+    def async_event_received(self) -> None:
+        """Register an event from the stream."""
+        self.last_event = time.monotonic()
+        if self.update_mode != UPDATE_MODE_PUSH:
+            self._async_update_mode()
+
+    @callback
+    def _async_update_mode(self) -> bool:
+        """Set the update interval from the stream state, return if changed."""
+        healthy = (
+            self.stream_connected
+            and self.last_event is not None
+            and time.monotonic() - self.last_event < PUSH_EVENT_WINDOW.total_seconds()
+        )
+        mode = UPDATE_MODE_PUSH if healthy else UPDATE_MODE_POLL
+        if mode == self.update_mode:
+            return False
+        self.logger.debug("Switching update mode to %s", mode)
+        self.update_mode = mode
+        self.update_interval = PUSH_UPDATE_INTERVAL if healthy else POLL_UPDATE_INTERVAL
+        return True
+
+    @callback
+    def async_push_received(self) -> None:
+        """Register that pushed data for all appliances has been set."""
+        self.last_push = time.monotonic()
+        self.push_received.set()
+
+    @callback
+    def async_schedule_refresh(
+        self,
+        trigger: str,
+        serial: str | None = None,
+        expected: dict[str, Any] | None = None,
+    ) -> None:
+        """Request a refresh, combined with other requests in a short window.
+
+        If a serial number is given, only the state of that appliance is
+        fetched. The fetch is skipped when data has been pushed after the
+        request and shows all the expected data values, if any.
+        """
+        self._pending_triggers.append(trigger)
+        if serial is None:
+            self._pending_unconditional = True
+        else:
+            requested, expectations = self._pending_devices.get(
+                serial, (time.monotonic(), {})
+            )
+            self._pending_devices[serial] = (
+                requested,
+                {**expectations, **(expected or {})},
+            )
+        if self._unsub_coalesced_refresh is None:
+            self._unsub_coalesced_refresh = async_call_later(
+                self.hass, REFRESH_COALESCE_DELAY, self._async_coalesced_refresh
+            )
+
+    def _confirmed_by_push(
+        self, serial: str, requested: float, expected: dict[str, Any]
+    ) -> bool:
+        """Return True if data pushed after a request shows the expected values."""
+        if self.last_push < requested:
+            return False
+        if (data := (self.data or {}).get(serial)) is None:
+            return False
+        return all(data.get(key) == value for key, value in expected.items())
+
+    async def _async_coalesced_refresh(self, _now: datetime) -> None:
+        """Run the refreshes requested within the coalescing window."""
+        self._unsub_coalesced_refresh = None
+        triggers = self._pending_triggers
+        devices = self._pending_devices
+        unconditional = self._pending_unconditional
+        self._pending_triggers = []
+        self._pending_devices = {}
+        self._pending_unconditional = False
+
+        if unconditional:
+            await self.async_refresh_with_triggers(*triggers)
+            return
+
+        refresh = []
+        for serial, (requested, expected) in devices.items():
+            if self._confirmed_by_push(serial, requested, expected):
+                self.logger.debug("Refresh of %s skipped, confirmed by push", serial)
+                self.refresh_log.append(
+                    {
+                        "time": dt_util.utcnow().isoformat(),
+                        "triggers": triggers,
+                        "serial": serial,
+                        "skipped": True,
+                    }
+                )
+            else:
+                refresh.append(serial)
+        await asyncio.gather(
+            *(self.async_refresh_device(serial, *triggers) for serial in refresh)
+        )
+
+    async def async_refresh_device(self, serial: str, *triggers: str) -> None:
+        """Fetch and merge the state of a single appliance.
+
+        Falls back to a refresh of all appliances if the state cannot be
+        fetched.
+        """
+        start = time.monotonic()
+        failed = False
+        try:
+            await self.device_update_method(serial)
+        except (TimeoutError, ClientError, UpdateFailed, KeyError) as err:
+            self.logger.debug("Error fetching state of %s: %s", serial, err)
+            failed = True
+            # Triggers are not redacted in diagnostics, the serial number is
+            # only recorded in the "serial" field of the entry below
+            await self.async_refresh_with_triggers(*triggers, "device refresh failed")
+        finally:
+            self.refresh_log.append(
+                {
+                    "time": dt_util.utcnow().isoformat(),
+                    "triggers": list(triggers),
+                    "serial": serial,
+                    "duration": round(time.monotonic() - start, 3),
+                    "failed": failed,
+                }
+            )
+
+    async def async_refresh_with_triggers(self, *triggers: str) -> None:
+        """Refresh data and record what triggered the refresh."""
+        self._refresh_triggers = list(triggers)
+        await self.async_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel a pending coalesced refresh."""
+        if self._unsub_coalesced_refresh is not None:
+            self._unsub_coalesced_refresh()
+            self._unsub_coalesced_refresh = None
+        await super().async_shutdown()
+
+    async def _async_update_data(self) -> dict[str, MieleApplianceData]:
+        """Check the stream health before every poll and record the refresh."""
+        triggers = self._refresh_triggers or ["interval"]
+        self._refresh_triggers = []
+        self._async_update_mode()
+        start = time.monotonic()
+        try:
+            return await super()._async_update_data()
+        finally:
+            self.refresh_log.append(
+                {
+                    "time": dt_util.utcnow().isoformat(),
+                    "triggers": triggers,
+                    "duration": round(time.monotonic() - start, 3),
+                }
+            )
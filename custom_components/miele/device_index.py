@@ -0,0 +1,91 @@
+"""Index of the Miele devices in the device registry."""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device registry changes that may affect the index
+_INDEXED_FIELDS = {"identifiers", "config_entries", "primary_config_entry"}
+
+
+class MieleDeviceIndex:
+    """Map device ids to serial numbers and the config entries owning them.
+
+    The index is built from the device registry once and kept up to date
+    from device registry events, so services resolve their targets without
+    walking device identifiers on every call.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self._hass = hass
+        self._devices: dict[str, tuple[str, str]] = {}
+        self._serials: dict[str, str] = {}
+
+    @callback
+    def async_setup(self) -> None:
+        """Build the index and follow the device registry."""
+        for device in dr.async_get(self._hass).devices.values():
+            self._add(device)
+        self._hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+        )
+        _LOGGER.debug("Indexed %s Miele devices", len(self._devices))
+
+    def resolve(self, device_id: str) -> tuple[str, str] | None:
+        """Return the serial number and config entry id of a device."""
+        return self._devices.get(device_id)
+
+    def entry_for_serial(self, serial: str) -> str | None:
+        """Return the id of the config entry owning an appliance."""
+        return self._serials.get(serial)
+
+    def _owner(self, device: dr.DeviceEntry) -> str | None:
+        """Return the Miele config entry of a device, preferring the primary."""
+        entries = [
+            entry_id
+            for entry_id in device.config_entries
+            if (entry := self._hass.config_entries.async_get_entry(entry_id))
+            and entry.domain == DOMAIN
+        ]
+        if device.primary_config_entry in entries:
+            return device.primary_config_entry
+        return entries[0] if entries else None
+
+    def _add(self, device: dr.DeviceEntry) -> None:
+        """Index a device if it is a Miele appliance."""
+        serial = next(
+            (ident for domain, ident in device.identifiers if domain == DOMAIN), None
+        )
+        if serial is None or (entry_id := self._owner(device)) is None:
+            return
+        self._devices[device.id] = (serial, entry_id)
+        self._serials[serial] = entry_id
+
+    def _remove(self, device_id: str) -> None:
+        """Drop a device from the index."""
+        if (indexed := self._devices.pop(device_id, None)) is not None:
+            self._serials.pop(indexed[0], None)
+
+    @callback
+    def _async_device_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Update the index for a changed device."""
+        device_id = event.data["device_id"]
+        if event.data["action"] == "update" and not (
+            _INDEXED_FIELDS & set(event.data["changes"])
+        ):
+            return
+        self._remove(device_id)
+        if event.data["action"] != "remove" and (
+            device := dr.async_get(self._hass).async_get(device_id)
+        ):
+            self._add(device)
@@ -11,9 +11,9 @@ from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntry
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import ACTIONS, API, API_READ_TIMEOUT, CONF_SENSORS, DOMAIN, VERSION
+from .coordinator import MieleDataUpdateCoordinator
 
 TO_REDACT = {
     CONF_PASSWORD,
@@ -21,6 +21,7 @@ TO_REDACT = {
     "access_token",
     "refresh_token",
     "ident|deviceIdentLabel|fabNumber",
+    "serial",
 }
 
 
@@ -28,23 +29,37 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, config_entry: ConfigEntry
 ) -> dict:
     """Return diagnostics for a config entry."""
-    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][
+    coordinator: MieleDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][
         "coordinator"
     ]
 
     device_data = {}
     action_data = {}
     for i, key in enumerate(coordinator.data):
-        device_data[f"Appliance_{i+1}"] = coordinator.data[key]
+        device_data[f"Appliance_{i+1}"] = coordinator.data[key].as_flat_dict()
         if ACTIONS in hass.data[DOMAIN][config_entry.entry_id]:
             action_data[f"Appliance_{i+1}"] = hass.data[DOMAIN][config_entry.entry_id][
                 ACTIONS
-            ][key]
+            ].get(key, {})
 
     diagnostics_data = {
         "info": async_redact_data(config_entry.data, TO_REDACT),
         "data": async_redact_data(device_data, TO_REDACT),
         "actions": async_redact_data(action_data, TO_REDACT),
+        "stale": coordinator.stale,
+        "update_mode": coordinator.update_mode,
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "event_stream": hass.data[DOMAIN][config_entry.entry_id]["listener"].as_dict(),
+        "api_calls": hass.data[DOMAIN][config_entry.entry_id][
+            API
+        ].retry.stats.as_dict(),
+        "connections": hass.data[DOMAIN][config_entry.entry_id][
+            API
+        ].connection_stats.as_dict(),
+        "refreshes": async_redact_data(list(coordinator.refresh_log), TO_REDACT),
+        "action_queue": async_redact_data(
+            hass.data[DOMAIN][config_entry.entry_id][API].actions.as_dict(), TO_REDACT
+        ),
         "id_log": hass.data[DOMAIN]["id_log"],
     }
 
@@ -59,7 +74,7 @@ async def async_get_device_diagnostics(
     info["manufacturer"] = device.manufacturer
     info["model"] = device.model
 
-    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][
+    coordinator: MieleDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][
         "coordinator"
     ]
 
@@ -67,9 +82,10 @@ async def async_get_device_diagnostics(
     action_data = {}
     program_data = {}
 
-    for key in coordinator.data:
+    for key in list(coordinator.data):
         if ("miele", key) in device.identifiers:
-            device_data = coordinator.data[key]
+            await coordinator.async_refresh_device(key, "diagnostics")
+            device_data = coordinator.data[key].as_flat_dict()
             if ACTIONS in hass.data[DOMAIN][config_entry.entry_id]:
                 action_data = hass.data[DOMAIN][config_entry.entry_id][ACTIONS].get(
                     key, {}
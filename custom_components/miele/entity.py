@@ -1,19 +1,121 @@
 """Entities for the Miele integration."""
 
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import asynccontextmanager
+from datetime import datetime
+import logging
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
 
-from .const import DOMAIN, MANUFACTURER
+from .appliance import TECH_TYPE_KEY, XKM_RELEASE_VERSION_KEY, XKM_TECH_TYPE_KEY
+from .const import DOMAIN, MANUFACTURER, OPTIMISTIC_STATE_TTL, SIGNAL_NEW_APPLIANCES
+from .keys import KEY_CATALOGUE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Entity description fields holding data keys read by entities. Values
+# cached per data version must only depend on these keys, see MieleEntity.
+DATA_KEY_FIELDS = (
+    "data_tag",
+    "data_tag1",
+    "data_tag2",
+    "data_tag3",
+    "data_tag_loc",
+    "type_key",
+    "type_key_raw",
+    "status_key_raw",
+    "ventilation_step_tag",
+    "light_tag",
+    "current_temperature_tag",
+    "target_temperature_tag",
+)
+
+
+def get_data_keys(description: EntityDescription, *extra_keys: str) -> frozenset[str]:
+    """Return the data keys read by an entity with this description."""
+    keys = {"state|status|value_raw", *extra_keys}
+    for field in DATA_KEY_FIELDS:
+        if isinstance(key := getattr(description, field, None), str):
+            keys.add(key)
+            if key.endswith("|value_raw"):
+                keys.add(key.replace("|value_raw", "|value_localized"))
+    return frozenset(keys)
+
+
+def descriptions_by_type(
+    definitions: Iterable[Any],
+) -> dict[int, tuple[EntityDescription, ...]]:
+    """Map each appliance type to the entity descriptions defined for it."""
+    index: dict[int, list[EntityDescription]] = {}
+    for definition in definitions:
+        data_keys = get_data_keys(definition.description)
+        for appliance_type in definition.types:
+            index.setdefault(appliance_type, []).append(definition.description)
+            KEY_CATALOGUE.register(appliance_type, data_keys)
+    return {
+        appliance_type: tuple(descriptions)
+        for appliance_type, descriptions in index.items()
+    }
+
+
+@callback
+def async_setup_appliance_entities(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    coordinator: DataUpdateCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    appliance_entities: Callable[[int, str], Iterable[Entity]],
+) -> None:
+    """Add entities for all appliances, also for appliances that appear later."""
+
+    @callback
+    def async_add_appliances(serials: Iterable[str]) -> None:
+        positions = {ent: idx for idx, ent in enumerate(coordinator.data)}
+        async_add_entities(
+            [
+                entity
+                for ent in serials
+                for entity in appliance_entities(positions[ent], ent)
+            ]
+        )
+
+    async_add_appliances(list(coordinator.data))
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_NEW_APPLIANCES.format(config_entry.entry_id),
+            async_add_appliances,
+        )
+    )
 
 
 class MieleEntity(CoordinatorEntity):
-    """Base class for Miele entities."""
+    """Base class for Miele entities.
+
+    Entities can show the expected result of a command at once with
+    async_set_optimistic, or around the command with async_optimistic,
+    which drops the values again if the command fails. Properties pass
+    their value from the appliance data through optimistic_value, which
+    returns the pending optimistic value instead. The optimistic value is
+    dropped when the data confirms it, when the data changes to another
+    value, or after OPTIMISTIC_STATE_TTL seconds, whichever comes first.
+    """
 
     _attr_has_entity_name = True
+    # Data keys read by the entity in addition to those in the description
+    _extra_data_keys: tuple[str, ...] = ()
 
     def __init__(
         self,
@@ -23,24 +125,150 @@ class MieleEntity(CoordinatorEntity):
         description: EntityDescription,
     ) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
+        data_keys = get_data_keys(description, *self._extra_data_keys)
+        appliance_type = coordinator.data[ent].record.type_raw
+        KEY_CATALOGUE.register(appliance_type, data_keys)
+        # Only pushed changes to these keys of this appliance update the entity
+        super().__init__(coordinator, context=(ent, data_keys))
         self._idx = idx
         self._ent = ent
+        self._key_layout = KEY_CATALOGUE.layout(appliance_type)
+        # Attribute -> (optimistic value, value from data when set, expiry)
+        self._optimistic: dict[str, tuple[Any, Any, float]] = {}
+        self._bypass_optimistic = False
+        self._unsub_optimistic_expiry: CALLBACK_TYPE | None = None
+        # Incremented whenever the coordinator reports changes to the data
+        # keys of the entity, values derived from them can be cached with it.
+        # Keys are only those named in DATA_KEY_FIELDS or _extra_data_keys,
+        # a cached value reading any other key would go stale.
+        self._data_version = 0
         self.entity_description = description
         appl_type = self.coordinator.data[self._ent][self.entity_description.type_key]
         if appl_type == "":
-            appl_type = self.coordinator.data[self._ent][
-                "ident|deviceIdentLabel|techType"
-            ]
+            appl_type = self.coordinator.data[self._ent].get(TECH_TYPE_KEY)
         self._attr_unique_id = f"{self._ent}-{self.entity_description.key}"
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self._ent)},
             serial_number=self._ent,
             name=appl_type,
             manufacturer=MANUFACTURER,
-            model=self.coordinator.data[self._ent]["ident|deviceIdentLabel|techType"],
-            hw_version=self.coordinator.data[self._ent]["ident|xkmIdentLabel|techType"],
-            sw_version=self.coordinator.data[self._ent][
-                "ident|xkmIdentLabel|releaseVersion"
-            ],
+            model=self.coordinator.data[self._ent].get(TECH_TYPE_KEY),
+            hw_version=self.coordinator.data[self._ent].get(XKM_TECH_TYPE_KEY),
+            sw_version=self.coordinator.data[self._ent].get(XKM_RELEASE_VERSION_KEY),
+        )
+
+    def _data_position(self, key: str | None) -> int | None:
+        """Return the position of a data key for MieleApplianceData.value_at."""
+        return None if key is None else self._key_layout.position(key)
+
+    @property
+    def available(self) -> bool:
+        """Return False until live data for the appliance has been received."""
+        return (
+            super().available
+            and not self.coordinator.stale
+            and self._ent in self.coordinator.data
         )
+
+    def optimistic_value(self, attribute: str, value: Any) -> Any:
+        """Return the optimistic value of an attribute if pending, else value."""
+        if self._bypass_optimistic or attribute not in self._optimistic:
+            return value
+        return self._optimistic[attribute][0]
+
+    def _data_value(self, attribute: str) -> Any:
+        """Return the value of an attribute according to the appliance data."""
+        self._bypass_optimistic = True
+        try:
+            return getattr(self, attribute)
+        finally:
+            self._bypass_optimistic = False
+
+    @callback
+    def async_set_optimistic(self, **values: Any) -> None:
+        """Show attribute values before the appliance data confirms them."""
+        expiry = time.monotonic() + OPTIMISTIC_STATE_TTL
+        for attribute, value in values.items():
+            self._optimistic[attribute] = (value, self._data_value(attribute), expiry)
+        self._async_schedule_optimistic_expiry()
+        self.async_write_ha_state()
+
+    @asynccontextmanager
+    async def async_optimistic(self, **values: Any) -> AsyncIterator[None]:
+        """Show attribute values while sending a command, drop them on errors."""
+        self.async_set_optimistic(**values)
+        try:
+            yield
+        except BaseException:
+            self.async_clear_optimistic()
+            raise
+
+    @callback
+    def async_clear_optimistic(self) -> None:
+        """Drop all optimistic values, e.g. when a command failed."""
+        self._optimistic.clear()
+        if self._unsub_optimistic_expiry is not None:
+            self._unsub_optimistic_expiry()
+            self._unsub_optimistic_expiry = None
+        self.async_write_ha_state()
+
+    @callback
+    def _async_schedule_optimistic_expiry(self) -> None:
+        """Schedule the check of the first optimistic value to expire."""
+        if self._unsub_optimistic_expiry is not None:
+            self._unsub_optimistic_expiry()
+            self._unsub_optimistic_expiry = None
+        if self._optimistic:
+            delay = min(expiry for _, _, expiry in self._optimistic.values())
+            self._unsub_optimistic_expiry = async_call_later(
+                self.hass,
+                max(delay - time.monotonic(), 0),
+                self._async_optimistic_expired,
+            )
+
+    @callback
+    def _async_optimistic_expired(self, _now: datetime) -> None:
+        """Drop optimistic values that have not been confirmed in time."""
+        self._unsub_optimistic_expiry = None
+        self._check_optimistic()
+        self._async_schedule_optimistic_expiry()
+        self.async_write_ha_state()
+
+    def _check_optimistic(self) -> None:
+        """Confirm or roll back optimistic values against the appliance data."""
+        now = time.monotonic()
+        for attribute, (value, initial, expiry) in list(self._optimistic.items()):
+            try:
+                actual = self._data_value(attribute)
+            except KeyError:
+                del self._optimistic[attribute]
+                continue
+            if actual == value:
+                _LOGGER.debug("%s: %s %s confirmed", self.entity_id, attribute, value)
+                del self._optimistic[attribute]
+            elif actual != initial or expiry <= now:
+                _LOGGER.warning(
+                    "%s: %s is %s instead of %s, rolling back",
+                    self.entity_id,
+                    attribute,
+                    actual,
+                    value,
+                )
+                del self._optimistic[attribute]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Check optimistic values against the updated data."""
+        self._data_version += 1
+        if self._optimistic:
+            self._check_optimistic()
+            if not self._optimistic:
+                self._async_schedule_optimistic_expiry()
+        super()._handle_coordinator_update()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the expiry of optimistic values."""
+        if self._unsub_optimistic_expiry is not None:
+            self._unsub_optimistic_expiry()
+            self._unsub_optimistic_expiry = None
+        await super().async_will_remove_from_hass()
@@ -34,7 +34,11 @@ from .const import (
     VENTILATION_STEP,
     MieleAppliance,
 )
-from .entity import MieleEntity
+from .entity import (
+    MieleEntity,
+    async_setup_appliance_entities,
+    descriptions_by_type,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -93,6 +97,8 @@ FAN_TYPES: Final[tuple[MieleFanDefinition, ...]] = (
     ),
 )
 
+FAN_DESCRIPTIONS = descriptions_by_type(FAN_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -102,14 +108,17 @@ async def async_setup_entry(
     """Set up the fan platform."""
     coordinator = await get_coordinator(hass, config_entry)
 
-    entities = [
-        MieleFan(coordinator, idx, ent, definition.description, hass, config_entry)
-        for idx, ent in enumerate(coordinator.data)
-        for definition in FAN_TYPES
-        if coordinator.data[ent]["ident|type|value_raw"] in definition.types
-    ]
+    def appliance_entities(idx: int, ent: str) -> list[MieleFan]:
+        return [
+            MieleFan(coordinator, idx, ent, description, hass, config_entry)
+            for description in FAN_DESCRIPTIONS.get(
+                coordinator.data[ent].record.type_raw, ()
+            )
+        ]
 
-    async_add_entities(entities)
+    async_setup_appliance_entities(
+        hass, config_entry, coordinator, async_add_entities, appliance_entities
+    )
 
 
 class MieleFan(MieleEntity, FanEntity):
@@ -132,24 +141,22 @@ class MieleFan(MieleEntity, FanEntity):
 
         _LOGGER.debug("Init fan %s", ent)
         self._attr_supported_features = self.entity_description.supported_features
+        self._step_pos = self._data_position(description.ventilation_step_tag)
 
     @property
     def is_on(self):
         """Return current on/off state."""
-        return (
-            self.coordinator.data[self._ent][
-                self.entity_description.ventilation_step_tag
-            ]
-            in self.entity_description.preset_modes
+        return self.optimistic_value(
+            "is_on",
+            self.coordinator.data[self._ent].value_at(self._step_pos)
+            in self.entity_description.preset_modes,
         )
 
     @property
     def preset_mode(self) -> str | None:
         """Return the current preset_mode of the fan."""
-        pmode = self.coordinator.data[self._ent][
-            self.entity_description.ventilation_step_tag
-        ]
-        return None if pmode == 0 else pmode
+        pmode = self.coordinator.data[self._ent].value_at(self._step_pos)
+        return self.optimistic_value("preset_mode", None if pmode == 0 else pmode)
 
     @property
     def speed_count(self) -> int:
@@ -159,13 +166,11 @@ class MieleFan(MieleEntity, FanEntity):
     @property
     def percentage(self) -> int | None:
         """Return the current speed percentage."""
-        return ranged_value_to_percentage(
-            SPEED_RANGE,
-            (
-                self.coordinator.data[self._ent][
-                    self.entity_description.ventilation_step_tag
-                ]
-                or 0
+        return self.optimistic_value(
+            "percentage",
+            ranged_value_to_percentage(
+                SPEED_RANGE,
+                self.coordinator.data[self._ent].value_at(self._step_pos) or 0,
             ),
         )
 
@@ -173,14 +178,14 @@ class MieleFan(MieleEntity, FanEntity):
     def available(self):
         """Return the availability of the entity."""
 
-        if not self.coordinator.last_update_success:
+        if not super().available:
             return False
 
-        return self.coordinator.data[self._ent]["state|status|value_raw"] != 255
+        return self.coordinator.data[self._ent].record.status != 255
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
-        if self.coordinator.data[self._ent]["ident|type|value_raw"] in FAN_READ_ONLY:
+        if self.coordinator.data[self._ent].record.type_raw in FAN_READ_ONLY:
             return
         if preset_mode is None or preset_mode == 0:
             return
@@ -192,13 +197,18 @@ class MieleFan(MieleEntity, FanEntity):
                 f"{preset_mode} is not a valid preset_mode: {self.entity_description.preset_modes}"
             )
         try:
-            await self._api.send_action(self._ent, {VENTILATION_STEP: preset_mode})
+            async with self.async_optimistic(
+                is_on=True,
+                preset_mode=preset_mode,
+                percentage=ranged_value_to_percentage(SPEED_RANGE, preset_mode),
+            ):
+                await self._api.send_action(self._ent, {VENTILATION_STEP: preset_mode})
         except aiohttp.ClientResponseError as ex:
             _LOGGER.error("Set_preset_mode: %s - %s", ex.status, ex.message)
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage of the fan."""
-        if self.coordinator.data[self._ent]["ident|type|value_raw"] in FAN_READ_ONLY:
+        if self.coordinator.data[self._ent].record.type_raw in FAN_READ_ONLY:
             return
         _LOGGER.debug("Set_percentage: %s", percentage)
         preset_mode = math.ceil(percentage_to_ranged_value(SPEED_RANGE, percentage))
@@ -206,11 +216,7 @@ class MieleFan(MieleEntity, FanEntity):
         if preset_mode == 0:
             await self.async_turn_off()
         else:
-            self.coordinator.data[self._ent][
-                self.entity_description.ventilation_step_tag
-            ] = preset_mode
             await self.async_set_preset_mode(preset_mode)
-            self.async_write_ha_state()
 
     async def async_turn_on(
         self,
@@ -219,13 +225,14 @@ class MieleFan(MieleEntity, FanEntity):
         **kwargs: Any,
     ) -> None:
         """Turn on the fan."""
-        if self.coordinator.data[self._ent]["ident|type|value_raw"] in FAN_READ_ONLY:
+        if self.coordinator.data[self._ent].record.type_raw in FAN_READ_ONLY:
             return
         _LOGGER.debug(
             "Turn_on -> percentage: %s, preset_mode: %s", percentage, preset_mode
         )
         try:
-            await self._api.send_action(self._ent, {POWER_ON: True})
+            async with self.async_optimistic(is_on=True):
+                await self._api.send_action(self._ent, {POWER_ON: True})
         except aiohttp.ClientResponseError as ex:
             _LOGGER.error("Turn_on: %s - %s", ex.status, ex.message)
         if percentage is not None:
@@ -236,14 +243,13 @@ class MieleFan(MieleEntity, FanEntity):
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the fan off."""
-        if self.coordinator.data[self._ent]["ident|type|value_raw"] in FAN_READ_ONLY:
+        if self.coordinator.data[self._ent].record.type_raw in FAN_READ_ONLY:
             return
         _LOGGER.debug("Turn_off:")
         try:
-            await self._api.send_action(self._ent, {POWER_OFF: True})
+            async with self.async_optimistic(
+                is_on=False, preset_mode=None, percentage=0
+            ):
+                await self._api.send_action(self._ent, {POWER_OFF: True})
         except aiohttp.ClientResponseError as ex:
             _LOGGER.error("Turn_off: %s - %s", ex.status, ex.message)
-        self.coordinator.data[self._ent][
-            self.entity_description.ventilation_step_tag
-        ] = None
-        self.async_write_ha_state()
@@ -0,0 +1,39 @@
+"""Flattening of Miele API payloads."""
+
+from __future__ import annotations
+
+from typing import Any
+
+DELIMITER = "|"
+
+
+def _flatten_into(flat: dict[str, Any], prefix: str, value: dict | list) -> None:
+    """Add the leaves of a container to flat, with keys starting with prefix."""
+    items = value.items() if isinstance(value, dict) else enumerate(value)
+    for key, val in items:
+        if isinstance(val, (dict, list)) and val:
+            _flatten_into(flat, f"{prefix}{key}{DELIMITER}", val)
+        else:
+            flat[f"{prefix}{key}"] = val
+
+
+def flatten(value: dict[str, Any]) -> dict[str, Any]:
+    """Flatten an appliance payload.
+
+    Nested dicts and lists are walked once and every leaf is stored under its
+    "|" separated path, e.g. "state|temperature|0|value_raw". Empty dicts and
+    lists are kept as leaves. The key layout is the same as produced by
+    flatdict.FlatterDict with "|" as delimiter.
+    """
+    flat: dict[str, Any] = {}
+    _flatten_into(flat, "", value)
+    return flat
+
+
+def flatten_path(path: str, value: Any) -> dict[str, Any]:
+    """Flatten the subtree found at path of an appliance payload."""
+    if isinstance(value, (dict, list)) and value:
+        flat: dict[str, Any] = {}
+        _flatten_into(flat, f"{path}{DELIMITER}", value)
+        return flat
+    return {path: value}
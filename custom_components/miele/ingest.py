@@ -0,0 +1,105 @@
+"""Incremental ingestion of appliance data for the Miele integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .appliance import MieleApplianceData
+from .flatten import DELIMITER, flatten_path
+
+_MISSING = object()
+
+
+def _is_branch(value: Any) -> bool:
+    """Return True if value is a non-empty container that is flattened further."""
+    return isinstance(value, (dict, list)) and len(value) > 0
+
+
+class MieleIngest:
+    """Keep appliance data in sync with API payloads.
+
+    Every appliance is stored untouched in a MieleApplianceData view, which
+    provides the flat "|" separated keys, e.g. "state|temperature|0|value_raw".
+    Incoming payloads are compared with the previously ingested payload and
+    only the subtrees that differ are walked to find the changed keys.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the ingestion engine."""
+        self.data: dict[str, MieleApplianceData] = {}
+
+    def rebuild(
+        self, payload: dict[str, dict[str, Any]]
+    ) -> dict[str, MieleApplianceData]:
+        """Replace all appliance data with a complete payload."""
+        self.data = {
+            serial: MieleApplianceData(appliance)
+            for serial, appliance in payload.items()
+        }
+        return self.data
+
+    def ingest(self, payload: dict[str, dict[str, Any]]) -> dict[str, set[str]]:
+        """Merge a payload into the data, return changed keys per appliance."""
+        changes: dict[str, set[str]] = {}
+
+        for serial in [serial for serial in self.data if serial not in payload]:
+            changes[serial] = set(self.data.pop(serial))
+
+        for serial, appliance in payload.items():
+            if (current := self.data.get(serial)) is None:
+                self.data[serial] = MieleApplianceData(appliance)
+                changes[serial] = set(self.data[serial])
+            elif current.raw != appliance:
+                changed: set[str] = set()
+                self._diff_branch(changed, "", current.raw, appliance)
+                current.set_raw(appliance)
+                if changed:
+                    changes[serial] = changed
+
+        return changes
+
+    def ingest_state(self, serial: str, state: dict[str, Any]) -> set[str]:
+        """Merge the state of one appliance, return the changed keys."""
+        current = self.data[serial]
+        old_state = current.raw.get("state", _MISSING)
+        if old_state == state:
+            return set()
+        changed: set[str] = set()
+        self._diff(changed, "state", old_state, state)
+        current.set_raw({**current.raw, "state": state})
+        return changed
+
+    def _diff_branch(
+        self,
+        changed: set[str],
+        prefix: str,
+        old: dict | list,
+        new: dict | list,
+    ) -> None:
+        """Collect the changed keys between two containers."""
+        if isinstance(new, dict):
+            for key, value in new.items():
+                old_value = old.get(key, _MISSING)
+                if old_value is _MISSING or old_value != value:
+                    self._diff(changed, f"{prefix}{key}", old_value, value)
+            for key in old.keys() - new.keys():
+                self._diff(changed, f"{prefix}{key}", old[key], _MISSING)
+            return
+
+        for idx, value in enumerate(new):
+            old_value = old[idx] if idx < len(old) else _MISSING
+            if old_value is _MISSING or old_value != value:
+                self._diff(changed, f"{prefix}{idx}", old_value, value)
+        for idx in range(len(new), len(old)):
+            self._diff(changed, f"{prefix}{idx}", old[idx], _MISSING)
+
+    def _diff(self, changed: set[str], path: str, old: Any, new: Any) -> None:
+        """Collect the changed keys of a single changed subtree."""
+        if _is_branch(old) and _is_branch(new) and type(old) is type(new):
+            self._diff_branch(changed, f"{path}{DELIMITER}", old, new)
+            return
+
+        if old is not _MISSING:
+            changed.update(flatten_path(path, old))
+        if new is not _MISSING:
+            changed.update(flatten_path(path, new))
@@ -0,0 +1,128 @@
+"""Catalogue of the data keys read by the Miele entities."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import sys
+from typing import Any
+
+from .flatten import DELIMITER
+
+Accessor = Callable[[dict[str, Any]], Any]
+
+_ACCESSORS: dict[str, Accessor] = {}
+
+
+def compile_key(key: str) -> Accessor:
+    """Return a function reading a flat data key directly from a payload.
+
+    The key "state|temperature|0|value_raw" is compiled into an accessor
+    equivalent to payload["state"]["temperature"][0]["value_raw"]. Paths
+    ending in a non-empty dict or list are not keys of the flattened data
+    and raise KeyError, like missing paths do.
+    """
+    if (accessor := _ACCESSORS.get(key)) is not None:
+        return accessor
+
+    segments = tuple(
+        (segment, int(segment) if segment.isdigit() else None)
+        for segment in key.split(DELIMITER)
+    )
+
+    def accessor(payload: dict[str, Any]) -> Any:
+        node: Any = payload
+        try:
+            for name, index in segments:
+                if isinstance(node, dict):
+                    node = node[name]
+                elif isinstance(node, list) and index is not None:
+                    node = node[index]
+                else:
+                    raise KeyError(key)
+        except (KeyError, IndexError):
+            raise KeyError(key) from None
+        if isinstance(node, (dict, list)) and node:
+            raise KeyError(key)
+        return node
+
+    _ACCESSORS[key] = accessor
+    return accessor
+
+
+# Placeholder for keys missing from a payload
+MISSING: Any = object()
+
+# Keys of the cooking zones of hobs
+PLATE_STEP_KEYS = tuple(
+    sys.intern(f"state|plateStep|{plate}|value_raw") for plate in range(8)
+)
+
+
+def _read(accessor: Accessor, payload: dict[str, Any]) -> Any:
+    """Return a value read by an accessor, MISSING if it is not there."""
+    try:
+        return accessor(payload)
+    except KeyError:
+        return MISSING
+
+
+class KeyLayout:
+    """Fixed order of the data keys read for an appliance type.
+
+    Keys are only ever appended, so the position of a key stays valid when
+    more entities register keys later on.
+    """
+
+    __slots__ = ("accessors", "index", "keys")
+
+    def __init__(self) -> None:
+        """Initialize an empty layout."""
+        self.keys: list[str] = []
+        self.index: dict[str, int] = {}
+        self.accessors: list[Accessor] = []
+
+    def position(self, key: str) -> int:
+        """Return the position of a key, append it if it is new."""
+        if (position := self.index.get(key)) is None:
+            key = sys.intern(key)
+            position = self.index[key] = len(self.keys)
+            self.keys.append(key)
+            self.accessors.append(compile_key(key))
+        return position
+
+    def extract(self, payload: dict[str, Any]) -> tuple[Any, ...]:
+        """Return the values of all keys of the layout in order."""
+        return tuple(_read(accessor, payload) for accessor in self.accessors)
+
+
+class MieleKeyCatalogue:
+    """Interned data keys and their layout per appliance type.
+
+    The platforms register the data keys of their entity descriptions per
+    appliance type when they are loaded, entities add keys of descriptions
+    built at runtime. Appliance data extracts the values of the keys of its
+    type into a tuple once per payload, which entities index by position.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the catalogue."""
+        self._layouts: dict[int | None, KeyLayout] = {}
+
+    def layout(self, appliance_type: int | None) -> KeyLayout:
+        """Return the layout of an appliance type."""
+        if (layout := self._layouts.get(appliance_type)) is None:
+            layout = self._layouts[appliance_type] = KeyLayout()
+        return layout
+
+    def register(self, appliance_type: int | None, keys: Iterable[str]) -> None:
+        """Add keys read by the entities of an appliance type."""
+        layout = self.layout(appliance_type)
+        for key in sorted(keys):
+            layout.position(key)
+
+    def position(self, appliance_type: int | None, key: str) -> int:
+        """Return the position of a key for an appliance type."""
+        return self.layout(appliance_type).position(key)
+
+
+KEY_CATALOGUE = MieleKeyCatalogue()
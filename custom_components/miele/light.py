@@ -30,7 +30,11 @@ from .const import (
     LIGHT_ON,
     MieleAppliance,
 )
-from .entity import MieleEntity
+from .entity import (
+    MieleEntity,
+    async_setup_appliance_entities,
+    descriptions_by_type,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -89,6 +93,8 @@ LIGHT_TYPES: Final[tuple[MieleLightDefinition, ...]] = (
     ),
 )
 
+LIGHT_DESCRIPTIONS = descriptions_by_type(LIGHT_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -98,14 +104,17 @@ async def async_setup_entry(
     """Set up the light platform."""
     coordinator = await get_coordinator(hass, config_entry)
 
-    entities = [
-        MieleLight(coordinator, idx, ent, definition.description, hass, config_entry)
-        for idx, ent in enumerate(coordinator.data)
-        for definition in LIGHT_TYPES
-        if coordinator.data[ent]["ident|type|value_raw"] in definition.types
-    ]
+    def appliance_entities(idx: int, ent: str) -> list[MieleLight]:
+        return [
+            MieleLight(coordinator, idx, ent, description, hass, config_entry)
+            for description in LIGHT_DESCRIPTIONS.get(
+                coordinator.data[ent].record.type_raw, ()
+            )
+        ]
 
-    async_add_entities(entities)
+    async_setup_appliance_entities(
+        hass, config_entry, coordinator, async_add_entities, appliance_entities
+    )
 
 
 class MieleLight(MieleEntity, LightEntity):
@@ -130,23 +139,24 @@ class MieleLight(MieleEntity, LightEntity):
 
         _LOGGER.debug("Init light %s", ent)
         self._attr_supported_features = self.entity_description.supported_features
+        self._light_pos = self._data_position(description.light_tag)
 
     @property
     def is_on(self):
         """Return current on/off state."""
-        return (
-            self.coordinator.data[self._ent][self.entity_description.light_tag]
-            == LIGHT_ON
+        return self.optimistic_value(
+            "is_on",
+            self.coordinator.data[self._ent].value_at(self._light_pos) == LIGHT_ON,
         )
 
     @property
     def available(self):
         """Return the availability of the entity."""
 
-        if not self.coordinator.last_update_success:
+        if not super().available:
             return False
 
-        return self.coordinator.data[self._ent]["state|status|value_raw"] != 255
+        return self.coordinator.data[self._ent].record.status != 255
 
     async def async_turn_on(
         self,
@@ -157,9 +167,11 @@ class MieleLight(MieleEntity, LightEntity):
             AMBIENT_LIGHT if self.entity_description.key == "ambientlight" else LIGHT
         )
         try:
-            await self._api.send_action(self._ent, {light_type: LIGHT_ON})
+            async with self.async_optimistic(is_on=True):
+                await self._api.send_action(self._ent, {light_type: LIGHT_ON})
         except aiohttp.ClientResponseError as ex:
             _LOGGER.error("Turn_on: %s - %s", ex.status, ex.message)
+        self.coordinator.async_schedule_refresh("turn_on", self._ent)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
@@ -167,6 +179,8 @@ class MieleLight(MieleEntity, LightEntity):
             AMBIENT_LIGHT if self.entity_description.key == "ambientlight" else LIGHT
         )
         try:
-            await self._api.send_action(self._ent, {light_type: LIGHT_OFF})
+            async with self.async_optimistic(is_on=False):
+                await self._api.send_action(self._ent, {light_type: LIGHT_OFF})
         except aiohttp.ClientResponseError as ex:
             _LOGGER.error("Turn_off: %s - %s", ex.status, ex.message)
+        self.coordinator.async_schedule_refresh("turn_off", self._ent)
@@ -20,12 +20,14 @@ from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from . import get_coordinator
+from .appliance import TECH_TYPE_KEY
 from .const import (
     API,
     DOMAIN,
     MieleAppliance,
 )
-from .entity import MieleEntity
+from .entity import MieleEntity, async_setup_appliance_entities
+from .keys import PLATE_STEP_KEYS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -117,13 +119,13 @@ async def async_setup_entry(
     """Set up the number platform."""
     coordinator = await get_coordinator(hass, config_entry)
 
-    entities = []
-    for idx, ent in enumerate(coordinator.data):
-        if coordinator.data[ent]["ident|type|value_raw"] in HOB_TYPES:
-            tech_type = coordinator.data[ent]["ident|deviceIdentLabel|techType"]
+    def appliance_entities(idx: int, ent: str) -> list[MieleNumber]:
+        entities: list[MieleNumber] = []
+        if coordinator.data[ent].record.type_raw in HOB_TYPES:
+            tech_type = coordinator.data[ent].get(TECH_TYPE_KEY)
             api_plates = 0
             for i in range(8):
-                if f"state|plateStep|{i}|value_raw" in coordinator.data[ent]:
+                if PLATE_STEP_KEYS[i] in coordinator.data[ent]:
                     api_plates = i
             if api_plates == 0:
                 plates = get_plate_count(tech_type)
@@ -139,7 +141,7 @@ async def async_setup_entry(
             for plate_no in range(plates):
                 description = MieleNumberDescription(
                     key="plate",
-                    data_tag=f"state|plateStep|{plate_no}|value_raw",
+                    data_tag=PLATE_STEP_KEYS[plate_no],
                     icon="mdi:stove",
                     translation_key="plate",
                     translation_placeholders={"plate_no": f"{plate_no + 1}"},
@@ -151,8 +153,11 @@ async def async_setup_entry(
                 entities.append(
                     MieleNumber(coordinator, idx, ent, description, hass, config_entry)
                 )
+        return entities
 
-    async_add_entities(entities)
+    async_setup_appliance_entities(
+        hass, config_entry, coordinator, async_add_entities, appliance_entities
+    )
 
 
 class MieleNumber(MieleEntity, NumberEntity):
@@ -177,20 +182,18 @@ class MieleNumber(MieleEntity, NumberEntity):
         # deviates from MieleEntity
         self._attr_unique_id = f"{self._ed.key}-{self._ed.zone}{self._ent}"
         self._attr_mode = NumberMode.SLIDER
+        self._plate_step_pos = self._data_position(self._ed.data_tag)
 
     @property
     def native_value(self):
         """Return native value."""
-        if self.coordinator.data[self._ent].get(self._ed.data_tag) is None:
+        step = self.coordinator.data[self._ent].value_at(self._plate_step_pos)
+        if step is None:
             return 0
         try:
-            retval = PLATE_MAP[self.coordinator.data[self._ent][self._ed.data_tag]]
+            retval = PLATE_MAP[step]
         except KeyError:
-            _LOGGER.debug(
-                "Unknown state for %s => %s",
-                self._ent,
-                self.coordinator.data[self._ent][self._ed.data_tag],
-            )
+            _LOGGER.debug("Unknown state for %s => %s", self._ent, step)
             return None
         return retval
 
@@ -198,13 +201,13 @@ class MieleNumber(MieleEntity, NumberEntity):
     def available(self):
         """Return the availability of the entity."""
 
-        if not self.coordinator.last_update_success:
+        if not super().available:
             return False
 
-        if self.coordinator.data[self._ent].get(self._ed.data_tag) is None:
+        if self.coordinator.data[self._ent].value_at(self._plate_step_pos) is None:
             return False
 
-        return self.coordinator.data[self._ent]["state|status|value_raw"] != 255
+        return self.coordinator.data[self._ent].record.status != 255
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
@@ -0,0 +1,166 @@
+"""Retry policy for Miele API calls."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import random
+import time
+from typing import Any, TypeVar
+
+from aiohttp import ClientConnectionError, ClientConnectorError
+
+from .const import (
+    API_READ_TIMEOUT,
+    API_RETRY_ATTEMPTS,
+    API_RETRY_BACKOFF_MAX,
+    API_RETRY_BACKOFF_MIN,
+    API_RETRY_BUDGET,
+    API_WRITE_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Responses worth another attempt. Requests that change the appliance state
+# are only repeated when the API has certainly not acted on them.
+RETRY_STATUSES = {429, 502, 503, 504}
+RETRY_STATUSES_UNSAFE = {429, 503}
+
+
+class RetryCancelled(Exception):
+    """Raised when a retried call is no longer needed."""
+
+
+class RetryStats:
+    """Statistics of the API calls of a config entry."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.calls = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.retried_statuses: dict[int, int] = {}
+        self.budget_exhausted = 0
+        self.cancelled = 0
+        self.auth_failures = 0
+        self.consecutive_auth_failures = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics."""
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "retried_statuses": dict(self.retried_statuses),
+            "budget_exhausted": self.budget_exhausted,
+            "cancelled": self.cancelled,
+            "auth_failures": self.auth_failures,
+        }
+
+
+class MieleRetryPolicy:
+    """Retry API calls with exponential backoff and jitter.
+
+    Every attempt is limited to API_READ_TIMEOUT and all attempts of a call
+    together to API_RETRY_BUDGET seconds. Calls that are not idempotent come
+    from the write helpers of the client library, which give up after
+    API_WRITE_TIMEOUT, so their attempts are limited to that time instead.
+    Timeouts, connection errors and overload responses are retried. When the
+    optional cancel event is set while waiting for the next attempt, the
+    call is given up with RetryCancelled.
+    """
+
+    def __init__(
+        self,
+        attempts: int = API_RETRY_ATTEMPTS,
+        budget: float = API_RETRY_BUDGET,
+        backoff_min: float = API_RETRY_BACKOFF_MIN,
+        backoff_max: float = API_RETRY_BACKOFF_MAX,
+    ) -> None:
+        """Initialize the policy."""
+        self.attempts = attempts
+        self.budget = budget
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.stats = RetryStats()
+
+    def _should_retry(self, error: BaseException, idempotent: bool) -> bool:
+        """Return True if a failed attempt may be repeated."""
+        if isinstance(error, TimeoutError):
+            return idempotent
+        if isinstance(error, ClientConnectorError):
+            # The request never reached the API
+            return True
+        return idempotent and isinstance(error, ClientConnectionError)
+
+    async def async_call(
+        self,
+        func: Callable[[], Awaitable[_T]],
+        *,
+        idempotent: bool = True,
+        cancel_event: asyncio.Event | None = None,
+    ) -> _T:
+        """Call func until it succeeds, the attempts or the budget run out."""
+        self.stats.calls += 1
+        timeout = API_READ_TIMEOUT if idempotent else API_WRITE_TIMEOUT
+        deadline = time.monotonic() + min(self.budget, timeout)
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = deadline - time.monotonic()
+            try:
+                async with asyncio.timeout(min(timeout, remaining)):
+                    result = await func()
+            except (TimeoutError, ClientConnectionError) as error:
+                if isinstance(error, TimeoutError):
+                    self.stats.timeouts += 1
+                if not self._should_retry(error, idempotent):
+                    raise
+                failure: BaseException | None = error
+            else:
+                status = getattr(result, "status", None)
+                if status == 401:
+                    self.stats.auth_failures += 1
+                    self.stats.consecutive_auth_failures += 1
+                elif status is not None:
+                    self.stats.consecutive_auth_failures = 0
+                if status not in (
+                    RETRY_STATUSES if idempotent else RETRY_STATUSES_UNSAFE
+                ):
+                    return result
+                failure = None
+
+            delay = min(self.backoff_max, self.backoff_min * 2 ** (attempt - 1))
+            delay *= random.uniform(0.5, 1.0)
+            if attempt >= self.attempts or time.monotonic() + delay >= deadline:
+                if attempt < self.attempts:
+                    self.stats.budget_exhausted += 1
+                if failure is not None:
+                    raise failure
+                return result
+
+            self.stats.retries += 1
+            if failure is None:
+                self.stats.retried_statuses[status] = (
+                    self.stats.retried_statuses.get(status, 0) + 1
+                )
+                result.release()
+            _LOGGER.debug(
+                "API call attempt %s failed (%s), retrying in %.1f s",
+                attempt,
+                failure or f"HTTP status {status}",
+                delay,
+            )
+            if cancel_event is None:
+                await asyncio.sleep(delay)
+                continue
+            try:
+                async with asyncio.timeout(delay):
+                    await cancel_event.wait()
+            except TimeoutError:
+                continue
+            self.stats.cancelled += 1
+            raise RetryCancelled
@@ -6,6 +6,7 @@ from __future__ import annotations
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import timedelta
+from enum import StrEnum
 import logging
 from typing import Any, Final
 
@@ -30,6 +31,12 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
 from . import get_coordinator
+from .appliance import (
+    TECH_TYPE_KEY,
+    XKM_RELEASE_VERSION_KEY,
+    XKM_TECH_TYPE_KEY,
+    temperature_channel,
+)
 from .const import (
     APPLIANCE_ICONS,
     CONF_PROGRAM_IDS,
@@ -41,23 +48,46 @@ from .const import (
     STATE_PROGRAM_PHASE,
     STATE_PROGRAM_TYPE,
     STATE_STATUS,
-    STATE_STATUS_IDLE,
     STATE_STATUS_NOT_CONNECTED,
     STATE_STATUS_OFF,
-    STATE_STATUS_ON,
-    STATE_STATUS_PAUSE,
     STATE_STATUS_PROGRAM_ENDED,
-    STATE_STATUS_PROGRAMMED,
-    STATE_STATUS_RUNNING,
-    STATE_STATUS_SERVICE,
-    STATE_STATUS_WAITING_TO_START,
     MieleAppliance,
 )
-from .entity import MieleEntity
+from .entity import (
+    MieleEntity,
+    async_setup_appliance_entities,
+    descriptions_by_type,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class SensorValueStrategy(StrEnum):
+    """How a sensor computes its value from the appliance data."""
+
+    # Converted data value, or the value mapped in configuration.yaml
+    CONVERTED = "converted"
+    # Program ids and names, logged for the id log of the diagnostics
+    PROGRAM = "program"
+    # Hours and minutes in minutes
+    DURATION = "duration"
+    # Like DURATION, kept when the program ends and 0 when switched off
+    ELAPSED_DURATION = "elapsed_duration"
+    # Clock time reached after the duration
+    CLOCK = "clock"
+    # Clock time the duration started
+    STARTED_CLOCK = "started_clock"
+    # Decoded temperature in degrees, passed through convert if given
+    TEMPERATURE = "temperature"
+
+
+# Strategies depending on the current time, not only on the data
+TIME_DEPENDENT_STRATEGIES = {
+    SensorValueStrategy.CLOCK,
+    SensorValueStrategy.STARTED_CLOCK,
+}
+
+
 @dataclass
 class MieleSensorDescription(SensorEntityDescription):
     """Class describing Miele sensor entities."""
@@ -74,6 +104,7 @@ class MieleSensorDescription(SensorEntityDescription):
     convert_icon: Callable[[Any], Any] | None = None
     available_states: Callable[[Any], Any] | None = None
     extra_attributes: dict[str, Any] | None = None
+    value_strategy: SensorValueStrategy = SensorValueStrategy.CONVERTED
 
 
 @dataclass
@@ -112,7 +143,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
             translation_key="temperature",
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
             state_class=SensorStateClass.MEASUREMENT,
-            convert=lambda x, t: x / 100.0,
+            value_strategy=SensorValueStrategy.TEMPERATURE,
         ),
     ),
     MieleSensorDefinition(
@@ -141,7 +172,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
             translation_key="temperature_zone_2",
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
             state_class=SensorStateClass.MEASUREMENT,
-            convert=lambda x, t: x / 100.0,
+            value_strategy=SensorValueStrategy.TEMPERATURE,
             entity_registry_enabled_default=False,
         ),
     ),
@@ -170,7 +201,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
             translation_key="temperature_zone_3",
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
             state_class=SensorStateClass.MEASUREMENT,
-            convert=lambda x, t: x / 100.0,
+            value_strategy=SensorValueStrategy.TEMPERATURE,
             entity_registry_enabled_default=False,
         ),
     ),
@@ -202,7 +233,8 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
             translation_key="target_temperature",
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
             entity_category=EntityCategory.DIAGNOSTIC,
-            convert=lambda x, t: int(x / 100.0),
+            value_strategy=SensorValueStrategy.TEMPERATURE,
+            convert=lambda x, t: int(x),
         ),
     ),
     MieleSensorDefinition(
@@ -232,7 +264,8 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
             translation_key="target_temperature_zone_2",
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
             entity_category=EntityCategory.DIAGNOSTIC,
-            convert=lambda x, t: int(x / 100.0),
+            value_strategy=SensorValueStrategy.TEMPERATURE,
+            convert=lambda x, t: int(x),
             entity_registry_enabled_default=False,
         ),
     ),
@@ -263,7 +296,8 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
             translation_key="target_temperature_zone_3",
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
             entity_category=EntityCategory.DIAGNOSTIC,
-            convert=lambda x, t: int(x / 100.0),
+            value_strategy=SensorValueStrategy.TEMPERATURE,
+            convert=lambda x, t: int(x),
             entity_registry_enabled_default=False,
         ),
     ),
@@ -337,6 +371,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
         ],
         description=MieleSensorDescription(
             key="state_program_id",
+            value_strategy=SensorValueStrategy.PROGRAM,
             data_tag="state|ProgramID|value_raw",
             data_tag_loc="state|ProgramID|value_localized",
             translation_key="program_id",
@@ -368,6 +403,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
         ],
         description=MieleSensorDescription(
             key="state_program_type",
+            value_strategy=SensorValueStrategy.PROGRAM,
             data_tag="state|programType|value_raw",
             data_tag_loc="state|programType|value_localized",
             translation_key="program_type",
@@ -399,6 +435,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
         ],
         description=MieleSensorDescription(
             key="state_program_phase",
+            value_strategy=SensorValueStrategy.PROGRAM,
             data_tag="state|programPhase|value_raw",
             data_tag_loc="state|programPhase|value_localized",
             translation_key="program_phase",
@@ -459,6 +496,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
         ],
         description=MieleSensorDescription(
             key="stateRemainingTime",
+            value_strategy=SensorValueStrategy.DURATION,
             data_tag="state|remainingTime|0",
             data_tag1="state|remainingTime|1",
             translation_key="remaining_time",
@@ -488,6 +526,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
         ],
         description=MieleSensorDescription(
             key="stateRemainingTimeAbs",
+            value_strategy=SensorValueStrategy.CLOCK,
             data_tag="state|remainingTime|0",
             data_tag1="state|remainingTime|1",
             # also account for time until start in finish time (delayed start)
@@ -518,6 +557,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
         ],
         description=MieleSensorDescription(
             key="stateStartTime",
+            value_strategy=SensorValueStrategy.DURATION,
             data_tag="state|startTime|0",
             data_tag1="state|startTime|1",
             translation_key="start_time",
@@ -546,6 +586,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
         ],
         description=MieleSensorDescription(
             key="stateStartTimeAbs",
+            value_strategy=SensorValueStrategy.CLOCK,
             data_tag="state|startTime|0",
             data_tag1="state|startTime|1",
             translation_key="start_at",
@@ -571,6 +612,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
         ],
         description=MieleSensorDescription(
             key="stateElapsedTime",
+            value_strategy=SensorValueStrategy.ELAPSED_DURATION,
             data_tag="state|elapsedTime|0",
             data_tag1="state|elapsedTime|1",
             translation_key="elapsed_time",
@@ -597,6 +639,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
         ],
         description=MieleSensorDescription(
             key="stateElapsedTimeAbs",
+            value_strategy=SensorValueStrategy.STARTED_CLOCK,
             data_tag="state|elapsedTime|0",
             data_tag1="state|elapsedTime|1",
             translation_key="started_at",
@@ -705,7 +748,7 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
             device_class=SensorDeviceClass.TEMPERATURE,
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
             state_class=SensorStateClass.MEASUREMENT,
-            convert=lambda x, t: x / 100.0,
+            value_strategy=SensorValueStrategy.TEMPERATURE,
         ),
     ),
     MieleSensorDefinition(
@@ -722,12 +765,14 @@ SENSOR_TYPES: Final[tuple[MieleSensorDefinition, ...]] = (
             icon="mdi:thermometer-check",
             device_class=SensorDeviceClass.TEMPERATURE,
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-            convert=lambda x, t: x / 100.0,
+            value_strategy=SensorValueStrategy.TEMPERATURE,
             entity_category=EntityCategory.DIAGNOSTIC,
         ),
     ),
 )
 
+SENSOR_DESCRIPTIONS = descriptions_by_type(SENSOR_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -737,14 +782,17 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     coordinator = await get_coordinator(hass, config_entry)
 
-    entities = [
-        MieleSensor(coordinator, idx, ent, definition.description)
-        for idx, ent in enumerate(coordinator.data)
-        for definition in SENSOR_TYPES
-        if coordinator.data[ent]["ident|type|value_raw"] in definition.types
-    ]
+    def appliance_entities(idx: int, ent: str) -> list[MieleSensor]:
+        return [
+            MieleSensor(coordinator, idx, ent, description)
+            for description in SENSOR_DESCRIPTIONS.get(
+                coordinator.data[ent].record.type_raw, ()
+            )
+        ]
 
-    async_add_entities(entities)
+    async_setup_appliance_entities(
+        hass, config_entry, coordinator, async_add_entities, appliance_entities
+    )
 
 
 class MieleSensor(MieleEntity, SensorEntity):
@@ -764,170 +812,72 @@ class MieleSensor(MieleEntity, SensorEntity):
         _LOGGER.debug("init sensor %s", ent)
         if self.entity_description.convert_icon is not None:
             self._attr_icon = self.entity_description.convert_icon(
-                self.coordinator.data[self._ent][self.entity_description.type_key_raw],
+                self.coordinator.data[self._ent].record.type_raw,
             )
         self._available_states = []
         if self.entity_description.available_states is not None:
             self._available_states = self.entity_description.available_states(
-                self.coordinator.data[self._ent][self.entity_description.type_key_raw],
+                self.coordinator.data[self._ent].record.type_raw,
             )
         self._last_elapsed_time_reported = None
         self._last_started_time_reported = None
         self._last_abs_time = {}
-        self._last_consumption_valid = True
+        self._native_value: Any = None
+        self._native_value_version: int | None = None
+        strategy = self.entity_description.value_strategy
+        self._compute_native_value: Callable[[], Any] = getattr(
+            self, f"_{strategy}_value"
+        )
+        self._memoize_native_value = strategy not in TIME_DEPENDENT_STRATEGIES
+        self._temperature_channel = temperature_channel(
+            self.entity_description.data_tag or ""
+        )
+        self._data_tag_pos = self._data_position(self.entity_description.data_tag)
+        # Hours and minutes of a duration, and of a second one added to it
+        self._hours_pos = self._data_tag_pos
+        self._minutes_pos = self._data_position(self.entity_description.data_tag1)
+        self._hours2_pos = self._data_position(self.entity_description.data_tag2)
+        self._minutes2_pos = self._data_position(self.entity_description.data_tag3)
 
     @property
     def native_value(self):
-        """Return the state of the sensor."""
-        if self.entity_description.key in [
-            "stateRemainingTime",
-            "stateStartTime",
-        ]:
-            return self._get_minutes()
-
-        if self.entity_description.key in [
-            "stateElapsedTime",
-        ]:
-            mins = self._get_minutes()
-            # Keep value when program ends
-            if (
-                self.coordinator.data[self._ent][self.entity_description.status_key_raw]
-                == STATE_STATUS_PROGRAM_ENDED
-            ):
-                return self._last_elapsed_time_reported
-            # Force 0 when appliance is off
-            if (
-                self.coordinator.data[self._ent][self.entity_description.status_key_raw]
-                == STATE_STATUS_OFF
-            ):
-                return 0
-            self._last_elapsed_time_reported = mins
-            return mins
+        """Return the state of the sensor, computed once per data version.
 
-        if self.entity_description.key in [
-            "stateRemainingTimeAbs",
-            "stateStartTimeAbs",
-        ]:
-            return self._get_absolute_time()
-
-        if self.entity_description.key in [
-            "stateElapsedTimeAbs",
-        ]:
-            started_time = self._get_absolute_time(sub=True)
-            # Don't update sensor if state == program_ended
-            if (
-                self.coordinator.data[self._ent][self.entity_description.status_key_raw]
-                == STATE_STATUS_PROGRAM_ENDED
-            ):
-                return self._last_started_time_reported
-            # Force no state when appliance is off
-            if (
-                self.coordinator.data[self._ent][self.entity_description.status_key_raw]
-                == STATE_STATUS_OFF
-            ):
-                return None
-            self._last_started_time_reported = started_time
-            return started_time
-
-        # Log raw and localized values for programID etc
-        # Active if logger.level is DEBUG or INFO
-        if _LOGGER.getEffectiveLevel() <= logging.INFO:
-            if self.entity_description.key in {
-                "stateProgramPhase",
-                "stateProgramId",
-                "stateProgramType",
-            }:
-                while len(self.hass.data[DOMAIN]["id_log"]) >= 500:
-                    self.hass.data[DOMAIN]["id_log"].pop()
-
-                self.hass.data[DOMAIN]["id_log"].append(
-                    {
-                        "appliance": self.coordinator.data[self._ent][
-                            self.entity_description.type_key
-                        ],
-                        "key": self.entity_description.key,
-                        "raw": self.coordinator.data[self._ent][
-                            self.entity_description.data_tag
-                        ],
-                        "localized": self.coordinator.data[self._ent][
-                            self.entity_description.data_tag_loc
-                        ],
-                    }
-                )
-
-        state = self.coordinator.data[self._ent][self.entity_description.status_key_raw]
-        if self.entity_description.key in [
-            "stateCurrentEnergyConsumption",
-            "stateCurrentWaterConsumption",
-        ]:
-            current_consumption = self.coordinator.data[self._ent].get(
-                self.entity_description.data_tag
-            )
-            # Show 0 consumption when the appliance is not running,
-            # to correctly reset utility meter cycle. Ignore this when
-            # appliance is not connected (it may disconnect while a program
-            # is running causing problems in energy stats).
-            if state in [
-                STATE_STATUS_ON,
-                STATE_STATUS_OFF,
-                STATE_STATUS_PROGRAMMED,
-                STATE_STATUS_WAITING_TO_START,
-                STATE_STATUS_IDLE,
-                STATE_STATUS_SERVICE,
-            ]:
-                self._last_consumption_valid = False
-                return 0
-            # If running or paused, instead, mark valid the consumption and
-            # report it only if it starts from 0, otherwise it results as a
-            # spike due to a glitch in API that is reporting the consumption
-            # of last cycle for a couple of seconds immediately after starting
-            # the program
-            elif (
-                state
-                in [
-                    STATE_STATUS_RUNNING,
-                    STATE_STATUS_PAUSE,
-                ]
-                and current_consumption == 0
-            ):
-                self._last_consumption_valid = True
-            elif (
-                state
-                in [
-                    STATE_STATUS_RUNNING,
-                    STATE_STATUS_PAUSE,
-                ]
-                and current_consumption is not None
-                and current_consumption > 0
-                and not self._last_consumption_valid
-            ):
-                return 0
+        All keys read by memoized strategies and their converters, like
+        type_key_raw, must be data keys of the description, otherwise pushed
+        changes to them do not invalidate the value.
+        """
+        if not self._memoize_native_value:
+            return self._compute_native_value()
+        if self._native_value_version != self._data_version:
+            self._native_value = self._compute_native_value()
+            self._native_value_version = self._data_version
+        return self._native_value
 
+    def _temperature_value(self):
+        """Return the decoded temperature."""
+        data = self.coordinator.data[self._ent]
         if (
-            self.coordinator.data[self._ent].get(self.entity_description.data_tag)
-            is None
-        ):
-            return None
-        if self.coordinator.data[self._ent].get(
-            self.entity_description.data_tag, -32768
-        ) in (
-            -32766,
-            -32768,
+            self._temperature_channel is None
+            or (value := data.temperature(*self._temperature_channel)) is None
         ):
             return None
-        if (
-            self.entity_description.key in ["stateProgramId", "stateProgramPhase"]
-            and self.coordinator.data[self._ent][self.entity_description.data_tag] <= 0
-        ):
+        if self.entity_description.convert is None:
+            return value
+        return self.entity_description.convert(value, data.record.type_raw)
+
+    def _converted_value(self):
+        """Return the converted data value."""
+        data = self.coordinator.data[self._ent]
+        value = data.value_at(self._data_tag_pos)
+        if value is None or value in (-32766, -32768):
             return None
 
         if self.entity_description.convert is None:
-            return self.coordinator.data[self._ent][self.entity_description.data_tag]
+            return value
 
         # If configuration.yaml contains an overridden mapping, use that value if available
-        custom_mapped_value = self._get_custom_mapped_value(
-            self.coordinator.data[self._ent][self.entity_description.data_tag]
-        )
+        custom_mapped_value = self._get_custom_mapped_value(value)
         if (
             custom_mapped_value is not None
             and custom_mapped_value in self._available_states
@@ -935,30 +885,86 @@ class MieleSensor(MieleEntity, SensorEntity):
             return custom_mapped_value
 
         # Otherwise use converter specified in entity description
-        return self.entity_description.convert(
-            self.coordinator.data[self._ent][self.entity_description.data_tag],
-            self.coordinator.data[self._ent][self.entity_description.type_key_raw],
+        return self.entity_description.convert(value, data.record.type_raw)
+
+    def _log_program_value(self) -> None:
+        """Log raw and localized values for program ids etc."""
+        # Active if logger.level is DEBUG or INFO
+        if _LOGGER.getEffectiveLevel() > logging.INFO:
+            return
+        data = self.coordinator.data[self._ent]
+        while len(self.hass.data[DOMAIN]["id_log"]) >= 500:
+            self.hass.data[DOMAIN]["id_log"].pop()
+
+        description = self.entity_description
+        self.hass.data[DOMAIN]["id_log"].append(
+            {
+                "appliance": data.get(description.type_key),
+                "key": description.key,
+                "raw": data.get(description.data_tag),
+                "localized": data.get(description.data_tag_loc),
+            }
         )
 
+    def _program_value(self):
+        """Return a program value."""
+        self._log_program_value()
+        return self._converted_value()
+
+    def _duration_value(self):
+        """Return a duration in minutes."""
+        return self._get_minutes()
+
+    def _elapsed_duration_value(self):
+        """Return the elapsed time of the program in minutes."""
+        mins = self._get_minutes()
+        status = self.coordinator.data[self._ent].record.status
+        # Keep value when program ends
+        if status == STATE_STATUS_PROGRAM_ENDED:
+            return self._last_elapsed_time_reported
+        # Force 0 when appliance is off
+        if status == STATE_STATUS_OFF:
+            return 0
+        self._last_elapsed_time_reported = mins
+        return mins
+
+    def _clock_value(self):
+        """Return the clock time reached after the duration."""
+        return self._get_absolute_time()
+
+    def _started_clock_value(self):
+        """Return the clock time the program started."""
+        started_time = self._get_absolute_time(sub=True)
+        status = self.coordinator.data[self._ent].record.status
+        # Don't update sensor if state == program_ended
+        if status == STATE_STATUS_PROGRAM_ENDED:
+            return self._last_started_time_reported
+        # Force no state when appliance is off
+        if status == STATE_STATUS_OFF:
+            return None
+        self._last_started_time_reported = started_time
+        return started_time
+
     def _get_minutes(self):
-        mins = (
-            self.coordinator.data[self._ent][self.entity_description.data_tag] * 60
-            + self.coordinator.data[self._ent][self.entity_description.data_tag1]
-        )
-        if (
-            self.entity_description.data_tag2 is not None
-            and self.entity_description.data_tag2 is not None
-        ):
-            mins = mins + (
-                self.coordinator.data[self._ent][self.entity_description.data_tag2] * 60
-                + self.coordinator.data[self._ent][self.entity_description.data_tag3]
-            )
+        """Return the minutes of the hour and minute tags, None if missing."""
+        data = self.coordinator.data[self._ent]
+        hours = data.value_at(self._hours_pos)
+        minutes = data.value_at(self._minutes_pos)
+        if hours is None or minutes is None:
+            return None
+        mins = hours * 60 + minutes
+        if self._hours2_pos is not None:
+            hours = data.value_at(self._hours2_pos)
+            minutes = data.value_at(self._minutes2_pos)
+            if hours is None or minutes is None:
+                return None
+            mins += hours * 60 + minutes
         return mins
 
     def _get_absolute_time(self, sub=False):
         now = dt_util.now().replace(second=0, microsecond=0)
         mins = self._get_minutes()
-        if mins == 0:
+        if not mins:
             return None
         if sub:
             val = now - timedelta(minutes=mins)
@@ -987,15 +993,14 @@ class MieleSensor(MieleEntity, SensorEntity):
     def available(self):
         """Return the availability of the entity."""
 
-        if self.entity_description.key == "stateStatus":
-            return True
+        if self.entity_description.key == "state_status":
+            return self._ent in self.coordinator.data and not self.coordinator.stale
 
-        if not self.coordinator.last_update_success:
+        if not super().available:
             return False
 
         return (
-            self.coordinator.data[self._ent][self.entity_description.status_key_raw]
-            != STATE_STATUS_NOT_CONNECTED
+            self.coordinator.data[self._ent].record.status != STATE_STATUS_NOT_CONNECTED
         )
 
     @property
@@ -1005,9 +1010,9 @@ class MieleSensor(MieleEntity, SensorEntity):
             return None
         attr = self.entity_description.extra_attributes
         if "Raw value" in self.entity_description.extra_attributes:
-            attr["Raw value"] = self.coordinator.data[self._ent][
-                self.entity_description.data_tag
-            ]
+            attr["Raw value"] = self.coordinator.data[self._ent].value_at(
+                self._data_tag_pos
+            )
             attr["Localized"] = self.coordinator.data[self._ent][
                 self.entity_description.data_tag.replace("_raw", "_localized")
             ]
@@ -1022,20 +1027,15 @@ class MieleSensor(MieleEntity, SensorEntity):
         if "manufacturer" in self.entity_description.extra_attributes:
             attr["manufacturer"] = MANUFACTURER
 
+        data = self.coordinator.data[self._ent]
         if "model" in self.entity_description.extra_attributes:
-            attr["model"] = self.coordinator.data[self._ent][
-                "ident|deviceIdentLabel|techType"
-            ]
+            attr["model"] = data.get(TECH_TYPE_KEY)
 
         if "HW version" in self.entity_description.extra_attributes:
-            attr["HW version"] = self.coordinator.data[self._ent][
-                "ident|xkmIdentLabel|techType"
-            ]
+            attr["HW version"] = data.get(XKM_TECH_TYPE_KEY)
 
         if "SW version" in self.entity_description.extra_attributes:
-            attr["SW version"] = self.coordinator.data[self._ent][
-                "ident|xkmIdentLabel|releaseVersion"
-            ]
+            attr["SW version"] = data.get(XKM_RELEASE_VERSION_KEY)
 
         return attr
 
@@ -1,20 +1,30 @@
 """Services for Miele integration."""
 
+import asyncio
+from collections.abc import Awaitable, Callable
 import logging
+import time
+from typing import Any
 
 import aiohttp
 import voluptuous as vol
 
 from homeassistant.const import CONF_DEVICE_ID, CONF_ENTITY_ID
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import config_validation as cv, device_registry as dr
-from homeassistant.helpers.service import async_extract_config_entry_ids
+from homeassistant.helpers import config_validation as cv
 
 from .const import (
     AMBIENT_COLORS,
     API,
     COLORS,
+    CONF_MAX_PARALLEL,
+    DEVICE_INDEX,
     DEVICE_NAME,
     DOMAIN,
     LIGHT,
@@ -24,14 +34,24 @@ from .const import (
     PROCESS_ACTION,
     PROCESS_ACTIONS,
     PROGRAM_ID,
+    SERVICE_PARALLEL,
+    SERVICE_PARALLEL_MAX,
     START_TIME,
     TARGET_TEMPERATURE,
     VENTILATION_STEP,
 )
+from .device_index import MieleDeviceIndex
+
+MAX_PARALLEL_FIELD = {
+    vol.Optional(CONF_MAX_PARALLEL, default=SERVICE_PARALLEL): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=SERVICE_PARALLEL_MAX)
+    ),
+}
 
 SERVICE_PROCESS_ACTION = cv.make_entity_service_schema(
     {
         vol.Required("action"): vol.In(PROCESS_ACTIONS),
+        **MAX_PARALLEL_FIELD,
     },
 )
 
@@ -58,6 +78,7 @@ SERVICE_GENERIC_ACTION = vol.All(
             vol.Exclusive(POWER_OFF, GROUP_SGA, msg=MSG1): cv.boolean,
             vol.Exclusive(COLORS, GROUP_SGA, msg=MSG1): vol.In(AMBIENT_COLORS),
             vol.Exclusive(MODES, GROUP_SGA, msg=MSG1): cv.positive_int,
+            **MAX_PARALLEL_FIELD,
         },
     ),
     cv.has_at_least_one_key(
@@ -85,6 +106,7 @@ SERVICE_RAW = vol.Schema(
 SERVICE_PROGRAM = cv.make_entity_service_schema(
     {
         vol.Required(PROGRAM_ID): cv.positive_int,
+        **MAX_PARALLEL_FIELD,
     },
     extra=vol.ALLOW_EXTRA,
 )
@@ -92,122 +114,176 @@ SERVICE_PROGRAM = cv.make_entity_service_schema(
 _LOGGER = logging.getLogger(__name__)
 
 
-async def async_setup_services(hass: HomeAssistant) -> None:  # noqa: C901
-    """Set up services."""
+def _action_data(call: ServiceCall) -> dict[str, Any]:
+    """Return the service data to pass on to the API."""
+    data = call.data.copy()
+    for key in (CONF_ENTITY_ID, CONF_DEVICE_ID, CONF_MAX_PARALLEL):
+        data.pop(key, None)
+    return data
 
-    async def extract_our_config_entry_ids(service_call: ServiceCall):
-        return [
-            entry_id
-            for entry_id in await async_extract_config_entry_ids(hass, service_call)
-            if (entry := hass.config_entries.async_get_entry(entry_id))
-            and entry.domain == DOMAIN
-        ]
 
-    async def send_process_action(call: ServiceCall):
-        serno = ""
-        _LOGGER.debug("Call: %s", call)
-        if not (our_entry_ids := await extract_our_config_entry_ids(call)):
-            raise HomeAssistantError(
-                "Failed to call service 'process_action'. Config entry for target not found"
-            )
-        _LOGGER.debug("Entries: %s", our_entry_ids)
-        device_reg = dr.async_get(hass)
-        for ent in call.data[CONF_DEVICE_ID]:
-            device_entry = device_reg.async_get(ent)
-            for ident in device_entry.identifiers:
-                for val in ident:
-                    if val != DOMAIN:
-                        serno = val
-
-            _api = hass.data[DOMAIN][our_entry_ids[0]][API]
-            act = PROCESS_ACTIONS[call.data["action"]]
+def _api_for_entry(hass: HomeAssistant, entry_id: str | None) -> Any:
+    """Return the API of a loaded config entry."""
+    if entry_id is None or not isinstance(
+        entry_data := hass.data[DOMAIN].get(entry_id), dict
+    ):
+        return None
+    return entry_data.get(API)
+
+
+async def _async_fan_out(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    send: Callable[[Any, str], Awaitable[Any]],
+) -> ServiceResponse:
+    """Send a service call to all target devices concurrently.
+
+    Every device is sent through the config entry owning it, looked up in
+    the device index. The devices of each account form a batch, and the
+    batches run in parallel. At most max_parallel devices of an account are
+    addressed at a time, and the action queue of the account spaces its
+    requests. A failing device does not stop the others; the result and
+    duration for every device and account are returned as service response.
+    If the caller does not ask for the response, failures are raised once
+    all devices have been addressed.
+    """
+    index: MieleDeviceIndex = hass.data[DOMAIN][DEVICE_INDEX]
+    targets = {
+        device_id: index.resolve(device_id)
+        for device_id in call.data.get(CONF_DEVICE_ID, [])
+    }
+    if not any(
+        _api_for_entry(hass, target[1]) for target in targets.values() if target
+    ):
+        raise HomeAssistantError(
+            f"Failed to call service '{call.service}'. "
+            "Config entry for target not found."
+        )
+    semaphores: dict[str, asyncio.Semaphore] = {}
+    accounts: dict[str, dict[str, Any]] = {}
+    start = time.monotonic()
+
+    async def send_one(device_id: str) -> dict[str, Any]:
+        if (target := targets[device_id]) is None:
+            return {"success": False, "error": "Not a Miele device", "elapsed": 0.0}
+        serial, entry_id = target
+        if (api := _api_for_entry(hass, entry_id)) is None:
+            return {"success": False, "error": "Not loaded", "elapsed": 0.0}
+        semaphore = semaphores.setdefault(
+            entry_id, asyncio.Semaphore(call.data[CONF_MAX_PARALLEL])
+        )
+        account = accounts.setdefault(entry_id, {"devices": 0, "elapsed": 0.0})
+        account["devices"] += 1
+        async with semaphore:
+            sent = time.monotonic()
             try:
-                await _api.send_action(serno, {PROCESS_ACTION: act})
+                await send(api, serial)
             except aiohttp.ClientResponseError as ex:
-                raise HomeAssistantError(
-                    f"Service process_action: {ex.status} {ex.message}"
-                ) from ex
+                error: str | None = f"{ex.status} {ex.message}"
+            except (TimeoutError, aiohttp.ClientError) as ex:
+                error = repr(ex)
+            else:
+                error = None
+            done = time.monotonic()
+        account["elapsed"] = max(account["elapsed"], round(done - start, 3))
+        if error is not None:
+            _LOGGER.warning("Service %s failed for %s: %s", call.service, serial, error)
+        return {
+            "success": error is None,
+            "error": error,
+            "elapsed": round(done - sent, 3),
+            "entry_id": entry_id,
+        }
+
+    device_ids = list(targets)
+    results = await asyncio.gather(*(send_one(device) for device in device_ids))
+    devices = dict(zip(device_ids, results, strict=True))
+    response = {
+        "elapsed": round(time.monotonic() - start, 3),
+        "accounts": accounts,
+        "devices": devices,
+    }
+    _LOGGER.debug("Service %s: %s", call.service, response)
+
+    if call.return_response:
+        return response
+    if failed := [
+        device for device, result in devices.items() if not result["success"]
+    ]:
+        errors = ", ".join(f"{device}: {devices[device]['error']}" for device in failed)
+        raise HomeAssistantError(
+            f"Service {call.service} failed for {len(failed)} of {len(devices)} "
+            f"devices: {errors}"
+        )
+    return None
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up services."""
 
-    async def send_generic_action(call: ServiceCall):
-        serno = ""
+    async def send_process_action(call: ServiceCall) -> ServiceResponse:
+        _LOGGER.debug("Call: %s", call)
+        act = PROCESS_ACTIONS[call.data["action"]]
+        return await _async_fan_out(
+            hass,
+            call,
+            lambda api, serial: api.send_action(serial, {PROCESS_ACTION: act}),
+        )
+
+    async def send_generic_action(call: ServiceCall) -> ServiceResponse:
         _LOGGER.debug("Call: %s", call)
-        if not (our_entry_ids := await extract_our_config_entry_ids(call)):
-            raise HomeAssistantError(
-                "Failed to call service 'generic_action'. Config entry for target not found."
-            )
         if CONF_DEVICE_ID not in call.data:
             raise HomeAssistantError(
                 "Cannot call generic_action on entity. Only on device."
             )
-        _LOGGER.debug("Entries: %s", our_entry_ids)
-        device_reg = dr.async_get(hass)
-        for ent in call.data[CONF_DEVICE_ID]:
-            device_entry = device_reg.async_get(ent)
-            for ident in device_entry.identifiers:
-                for val in ident:
-                    if val != DOMAIN:
-                        serno = val
-
-            _api = hass.data[DOMAIN][our_entry_ids[0]][API]
-            data = call.data.copy()
-            if CONF_ENTITY_ID in data:
-                data.pop(CONF_ENTITY_ID)
-            if CONF_DEVICE_ID in data:
-                data.pop(CONF_DEVICE_ID)
-            try:
-                await _api.send_action(serno, data)
-            except aiohttp.ClientResponseError as ex:
-                raise HomeAssistantError(
-                    f"Service generic_action: {ex.status} {ex.message}"
-                ) from ex
+        data = _action_data(call)
+        return await _async_fan_out(
+            hass, call, lambda api, serial: api.send_action(serial, data)
+        )
 
     async def send_raw(call: ServiceCall):
         _LOGGER.debug("Call: %s", call)
-        account = list(hass.data[DOMAIN].keys())[0]
-        _api = hass.data[DOMAIN][account][API]
+        index: MieleDeviceIndex = hass.data[DOMAIN][DEVICE_INDEX]
+        serial = call.data["serialno"]
+        if (_api := _api_for_entry(hass, index.entry_for_serial(serial))) is None:
+            raise HomeAssistantError(
+                f"Service raw: no loaded config entry for appliance {serial}"
+            )
         try:
-            await _api.send_action(call.data["serialno"], call.data["extra"])
+            await _api.send_action(serial, call.data["extra"])
         except aiohttp.ClientResponseError as ex:
             raise HomeAssistantError(f"Service raw: {ex.status} {ex.message}") from ex
 
-    async def set_program(call: ServiceCall):
-        serno = ""
+    async def set_program(call: ServiceCall) -> ServiceResponse:
         _LOGGER.debug("Call: %s", call)
-        if not (our_entry_ids := await extract_our_config_entry_ids(call)):
-            raise HomeAssistantError(
-                "Failed to call service 'set_program'. Config entry for target not found."
-            )
         if CONF_DEVICE_ID not in call.data:
             raise HomeAssistantError(
                 "Cannot call set_program on entity. Only on device."
             )
-        _LOGGER.debug("Entries: %s", our_entry_ids)
-        device_reg = dr.async_get(hass)
-        for ent in call.data[CONF_DEVICE_ID]:
-            device_entry = device_reg.async_get(ent)
-            for ident in device_entry.identifiers:
-                for val in ident:
-                    if val != DOMAIN:
-                        serno = val
-
-            _api = hass.data[DOMAIN][our_entry_ids[0]][API]
-            data = call.data.copy()
-            if CONF_ENTITY_ID in data:
-                data.pop(CONF_ENTITY_ID)
-            if CONF_DEVICE_ID in data:
-                data.pop(CONF_DEVICE_ID)
-            try:
-                await _api.set_program(serno, data)
-            except aiohttp.ClientResponseError as ex:
-                raise HomeAssistantError(
-                    f"Service set_program: {ex.status} {ex.message}"
-                ) from ex
+        data = _action_data(call)
+        return await _async_fan_out(
+            hass, call, lambda api, serial: api.set_program(serial, data)
+        )
 
     hass.services.async_register(
-        DOMAIN, "process_action", send_process_action, SERVICE_PROCESS_ACTION
+        DOMAIN,
+        "process_action",
+        send_process_action,
+        SERVICE_PROCESS_ACTION,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
-        DOMAIN, "generic_action", send_generic_action, SERVICE_GENERIC_ACTION
+        DOMAIN,
+        "generic_action",
+        send_generic_action,
+        SERVICE_GENERIC_ACTION,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(DOMAIN, "raw", send_raw, SERVICE_RAW)
-    hass.services.async_register(DOMAIN, "set_program", set_program, SERVICE_PROGRAM)
+    hass.services.async_register(
+        DOMAIN,
+        "set_program",
+        set_program,
+        SERVICE_PROGRAM,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
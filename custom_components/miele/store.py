@@ -0,0 +1,64 @@
+"""Persistent snapshot of appliance data for the Miele integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import ACTIONS, DOMAIN, SNAPSHOT_SAVE_DELAY, STORAGE_VERSION
+
+DEVICES = "devices"
+
+
+class MieleSnapshotStore(Store[dict[str, Any]]):
+    """Store the last known devices payload and actions of a config entry.
+
+    The snapshot lets the entities be created at startup before the Miele
+    cloud has answered. Snapshots written with another schema version are
+    discarded instead of migrated, the next live fetch replaces them anyway.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the store."""
+        super().__init__(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+        self._save_pending = False
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: Any
+    ) -> dict[str, Any]:
+        """Discard a snapshot with an unknown schema."""
+        return {}
+
+    async def async_load_snapshot(
+        self,
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, Any]] | None:
+        """Return the stored devices payload and actions, if any."""
+        data = await self.async_load()
+        if not data or not data.get(DEVICES):
+            return None
+        return data[DEVICES], data.get(ACTIONS, {})
+
+    def async_schedule_save(
+        self,
+        snapshot_func: Callable[[], tuple[dict[str, dict[str, Any]], dict[str, Any]]],
+    ) -> None:
+        """Save the snapshot after a delay, at most once per delay.
+
+        A delayed save is rescheduled by every call, so it is only scheduled
+        when none is pending. Otherwise frequent pushes would postpone it
+        until shutdown.
+        """
+        if self._save_pending:
+            return
+
+        def data_to_save() -> dict[str, Any]:
+            self._save_pending = False
+            devices, actions = snapshot_func()
+            return {DEVICES: devices, ACTIONS: actions}
+
+        self._save_pending = True
+        self.async_delay_save(data_to_save, SNAPSHOT_SAVE_DELAY)
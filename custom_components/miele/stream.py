@@ -0,0 +1,232 @@
+"""Supervision of the event stream for the Miele integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from http import HTTPStatus
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .api import AsyncConfigEntryAuth
+from .const import (
+    PUSH_EVENT_WINDOW,
+    STREAM_BACKOFF_MAX,
+    STREAM_BACKOFF_MIN,
+    STREAM_RATE_WINDOW,
+    STREAM_SILENCE_CHECK,
+)
+from .coordinator import MieleDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+EventCallback = Callable[[Any], Awaitable[None]]
+
+
+class MieleEventStream:
+    """Keep the event stream from the API running.
+
+    The client opens the stream again by itself after errors and missed
+    pings, without reporting it. Its requests are followed through the
+    tracing of the API session instead: the stream counts as connected once
+    the API has answered, and every further connection is a reconnect,
+    after which the coordinator is refreshed to catch up on changes missed
+    while the stream was down. Should the listener end anyway, it is
+    restarted with jittered exponential backoff.
+
+    A connected stream without events for PUSH_EVENT_WINDOW is reported as
+    silent, and the coordinator falls back to polling and is refreshed. The
+    stream is not forced to reconnect, accounts with idle appliances may
+    send no events for hours and the client reconnects when the pings stop.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: AsyncConfigEntryAuth,
+        coordinator: MieleDataUpdateCoordinator,
+        data_callback: EventCallback,
+        actions_callback: EventCallback,
+    ) -> None:
+        """Initialize the supervisor."""
+        self._hass = hass
+        self._entry = entry
+        self._api = api
+        self._coordinator = coordinator
+        self._data_callback = data_callback
+        self._actions_callback = actions_callback
+        self._task: asyncio.Task | None = None
+        self._unsub_silence_check: CALLBACK_TYPE | None = None
+        self._event_times: deque[float] = deque()
+        self._connections = 0
+        self._last_activity = 0.0
+        self.connected = False
+        self.silent = False
+        self.events = 0
+        self.reconnects = 0
+        self.silences = 0
+        self.last_event: datetime | None = None
+        self.last_error: str | None = None
+        if api.connection_stats is not None:
+            api.connection_stats.stream = self
+
+    @property
+    def event_rate(self) -> float:
+        """Return the number of events per hour within the rate window."""
+        self._prune_event_times(time.monotonic())
+        return len(self._event_times) * 3600 / STREAM_RATE_WINDOW.total_seconds()
+
+    def start(self) -> None:
+        """Start the supervised stream."""
+        self._task = self._entry.async_create_background_task(
+            self._hass, self._async_run(), "miele_event_stream"
+        )
+        self._unsub_silence_check = async_track_time_interval(
+            self._hass,
+            self._async_check_silence,
+            STREAM_SILENCE_CHECK,
+            cancel_on_shutdown=True,
+        )
+
+    def cancel(self) -> None:
+        """Stop the supervised stream."""
+        if self._task is not None:
+            self._task.cancel()
+        if self._unsub_silence_check is not None:
+            self._unsub_silence_check()
+            self._unsub_silence_check = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stream metrics."""
+        return {
+            "connected": self.connected,
+            "silent": self.silent,
+            "last_event": self.last_event.isoformat() if self.last_event else None,
+            "events": self.events,
+            "event_rate": round(self.event_rate, 1),
+            "reconnects": self.reconnects,
+            "silences": self.silences,
+            "last_error": self.last_error,
+        }
+
+    @callback
+    def async_connecting(self) -> None:
+        """Register that the client opens the stream."""
+        if self.connected:
+            # The client only opens the stream again once it has lost it
+            self._async_disconnected()
+
+    @callback
+    def async_connected(self, status: int) -> None:
+        """Register the response of the API to opening the stream."""
+        if status != HTTPStatus.OK:
+            self.last_error = f"HTTP status {status}"
+            return
+        self._connections += 1
+        self.connected = True
+        self.silent = False
+        self._last_activity = time.monotonic()
+        self._coordinator.async_stream_connected()
+        if self._connections > 1:
+            self.reconnects += 1
+            # Catch up on changes missed while the stream was down
+            self._coordinator.async_schedule_refresh("stream reconnect")
+
+    @callback
+    def async_connect_failed(self, error: BaseException) -> None:
+        """Register that the client could not open the stream."""
+        self.last_error = repr(error)
+        self._async_disconnected()
+
+    @callback
+    def _async_disconnected(self) -> None:
+        """Register that the stream has been lost."""
+        self.connected = False
+        self._coordinator.async_stream_disconnected()
+
+    @callback
+    def _async_check_silence(self, _now: datetime) -> None:
+        """Report a connected stream without events for PUSH_EVENT_WINDOW."""
+        if (
+            self.connected
+            and not self.silent
+            and time.monotonic() - self._last_activity
+            >= PUSH_EVENT_WINDOW.total_seconds()
+        ):
+            _LOGGER.debug("No events from API within %s, polling", PUSH_EVENT_WINDOW)
+            self.silent = True
+            self.silences += 1
+            self._coordinator.async_stream_silent()
+
+    def _prune_event_times(self, now: float) -> None:
+        """Drop event times that are outside the rate window."""
+        window = STREAM_RATE_WINDOW.total_seconds()
+        while self._event_times and now - self._event_times[0] > window:
+            self._event_times.popleft()
+
+    def _event_received(self) -> None:
+        """Update the metrics for a received event."""
+        now = time.monotonic()
+        self._event_times.append(now)
+        self._prune_event_times(now)
+        self._last_activity = now
+        self.silent = False
+        self.events += 1
+        self.last_event = dt_util.utcnow()
+        self._coordinator.async_event_received()
+
+    async def _async_on_data(self, data: Any) -> None:
+        """Handle a devices event."""
+        self._event_received()
+        await self._data_callback(data)
+
+    async def _async_on_actions(self, data: Any) -> None:
+        """Handle an actions event."""
+        self._event_received()
+        await self._actions_callback(data)
+
+    async def _async_run(self) -> None:
+        """Run the stream, restart it when it ends or fails."""
+        failures = 0
+        while True:
+            got_events = await self._async_listen()
+            self._async_disconnected()
+
+            failures = 0 if got_events else failures + 1
+            delay = min(STREAM_BACKOFF_MAX, STREAM_BACKOFF_MIN * 2**failures)
+            delay *= random.uniform(0.5, 1.0)
+            _LOGGER.debug("Restarting event stream in %.0f s", delay)
+            await asyncio.sleep(delay)
+
+    async def _async_listen(self) -> bool:
+        """Listen to the stream until it ends, return if it delivered."""
+        events = self.events
+        listener = asyncio.create_task(
+            self._api.listen_events(
+                data_callback=self._async_on_data,
+                actions_callback=self._async_on_actions,
+            )
+        )
+        try:
+            await asyncio.wait({listener})
+        except asyncio.CancelledError:
+            listener.cancel()
+            raise
+
+        if (error := listener.exception()) is not None:
+            _LOGGER.warning("Event stream from API failed: %s", error)
+            self.last_error = repr(error)
+        else:
+            _LOGGER.warning("Event stream from API ended")
+            self.last_error = "ended"
+        return self.events > events
@@ -28,7 +28,11 @@ from .const import (
     PROCESS_ACTION,
     MieleAppliance,
 )
-from .entity import MieleEntity
+from .entity import (
+    MieleEntity,
+    async_setup_appliance_entities,
+    descriptions_by_type,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -114,6 +118,8 @@ SWITCH_TYPES: Final[tuple[MieleSwitchDefinition, ...]] = (
     ),
 )
 
+SWITCH_DESCRIPTIONS = descriptions_by_type(SWITCH_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -123,14 +129,17 @@ async def async_setup_entry(
     """Set up the switch platform."""
     coordinator = await get_coordinator(hass, config_entry)
 
-    entities = [
-        MieleSwitch(coordinator, idx, ent, definition.description, hass, config_entry)
-        for idx, ent in enumerate(coordinator.data)
-        for definition in SWITCH_TYPES
-        if coordinator.data[ent]["ident|type|value_raw"] in definition.types
-    ]
+    def appliance_entities(idx: int, ent: str) -> list[MieleSwitch]:
+        return [
+            MieleSwitch(coordinator, idx, ent, description, hass, config_entry)
+            for description in SWITCH_DESCRIPTIONS.get(
+                coordinator.data[ent].record.type_raw, ()
+            )
+        ]
 
-    async_add_entities(entities)
+    async_setup_appliance_entities(
+        hass, config_entry, coordinator, async_add_entities, appliance_entities
+    )
 
 
 class MieleSwitch(MieleEntity, SwitchEntity):
@@ -157,16 +166,17 @@ class MieleSwitch(MieleEntity, SwitchEntity):
     def is_on(self):
         """Return the state of the switch."""
         if self.entity_description.key in {"supercooling", "superfreezing"}:
-            return (
-                self.coordinator.data[self._ent][self.entity_description.data_tag]
-                == self.entity_description.on_value
+            return self.optimistic_value(
+                "is_on",
+                self.coordinator.data[self._ent].record.status
+                == self.entity_description.on_value,
             )
 
         elif self.entity_description.key in {"poweronoff"}:
             power_data = (
                 self._api_data.get(ACTIONS, {}).get(self._ent, {}).get(POWER_OFF, True)
             )
-            return power_data
+            return self.optimistic_value("is_on", power_data)
 
         return False
 
@@ -174,7 +184,7 @@ class MieleSwitch(MieleEntity, SwitchEntity):
     def available(self):
         """Return the availability of the entity."""
 
-        if not self.coordinator.last_update_success:
+        if not super().available:
             return False
 
         if self.entity_description.key in {"poweronoff"}:
@@ -185,24 +195,26 @@ class MieleSwitch(MieleEntity, SwitchEntity):
             )
             return power_data
 
-        return self.coordinator.data[self._ent]["state|status|value_raw"] != 255
+        return self.coordinator.data[self._ent].record.status != 255
 
     async def async_turn_on(self, **kwargs):
         """Turn on the device."""
         _LOGGER.debug("turn_on -> kwargs: %s", kwargs)
         try:
-            await self._api.send_action(self._ent, self.entity_description.on_data)
+            async with self.async_optimistic(is_on=True):
+                await self._api.send_action(self._ent, self.entity_description.on_data)
         except aiohttp.ClientResponseError as ex:
             _LOGGER.error("Turn_on: %s - %s", ex.status, ex.message)
 
-        # await self.coordinator.async_request_refresh()
+        self.coordinator.async_schedule_refresh("turn_on", self._ent)
 
     async def async_turn_off(self, **kwargs):
         """Turn off the device."""
         _LOGGER.debug("turn_off -> kwargs: %s", kwargs)
         try:
-            await self._api.send_action(self._ent, self.entity_description.off_data)
+            async with self.async_optimistic(is_on=False):
+                await self._api.send_action(self._ent, self.entity_description.off_data)
         except aiohttp.ClientResponseError as ex:
             _LOGGER.error("Turn_off: %s - %s", ex.status, ex.message)
 
-        # await self.coordinator.async_request_refresh()
+        self.coordinator.async_schedule_refresh("turn_off", self._ent)
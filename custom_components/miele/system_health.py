@@ -4,7 +4,7 @@ from pymiele import MIELE_API
 from homeassistant.components import system_health
 from homeassistant.core import HomeAssistant, callback
 
-from .const import VERSION
+from .const import DOMAIN, VERSION
 
 
 @callback
@@ -18,7 +18,25 @@ def async_register(
 async def system_health_info(hass):
     """Get info for the info page."""
 
-    return {
+    info = {
         "component_version": VERSION,
         "reach_miele_cloud": system_health.async_check_can_reach_url(hass, MIELE_API),
     }
+
+    streams = [
+        entry_data["listener"]
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+        if isinstance(entry_data, dict) and entry_data.get("listener") is not None
+    ]
+    if streams:
+        info["stream_connected"] = all(stream.connected for stream in streams)
+        last_events = [stream.last_event for stream in streams if stream.last_event]
+        info["stream_last_event"] = (
+            max(last_events).isoformat() if last_events else "-"
+        )
+        info["stream_event_rate"] = round(
+            sum(stream.event_rate for stream in streams), 1
+        )
+        info["stream_reconnects"] = sum(stream.reconnects for stream in streams)
+
+    return info
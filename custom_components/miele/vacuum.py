@@ -21,6 +21,7 @@ from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from . import get_coordinator
+from .appliance import BATTERY_LEVEL_KEY, RECORD_KEYS
 from .const import (
     ACT_PAUSE,
     ACT_START,
@@ -34,7 +35,11 @@ from .const import (
     PROGRAM_ID,
     MieleAppliance,
 )
-from .entity import MieleEntity
+from .entity import (
+    MieleEntity,
+    async_setup_appliance_entities,
+    descriptions_by_type,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -90,6 +95,8 @@ VACUUM_TYPES: Final[tuple[MieleVacuumDefinition, ...]] = (
     ),
 )
 
+VACUUM_DESCRIPTIONS = descriptions_by_type(VACUUM_TYPES)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -99,20 +106,28 @@ async def async_setup_entry(
     """Set up the vacuum platform."""
     coordinator = await get_coordinator(hass, config_entry)
 
-    entities = [
-        MieleVacuum(coordinator, idx, ent, definition.description, hass, config_entry)
-        for idx, ent in enumerate(coordinator.data)
-        for definition in VACUUM_TYPES
-        if coordinator.data[ent]["ident|type|value_raw"] in definition.types
-    ]
+    def appliance_entities(idx: int, ent: str) -> list[MieleVacuum]:
+        return [
+            MieleVacuum(coordinator, idx, ent, description, hass, config_entry)
+            for description in VACUUM_DESCRIPTIONS.get(
+                coordinator.data[ent].record.type_raw, ()
+            )
+        ]
 
-    async_add_entities(entities)
+    async_setup_appliance_entities(
+        hass, config_entry, coordinator, async_add_entities, appliance_entities
+    )
 
 
 class MieleVacuum(MieleEntity, StateVacuumEntity):
     """Representation of a Vacuum."""
 
     entity_description: MieleVacuumDescription
+    _extra_data_keys = (
+        RECORD_KEYS["program_phase"],
+        BATTERY_LEVEL_KEY,
+        RECORD_KEYS["program_id"],
+    )
 
     def __init__(
         self,
@@ -136,10 +151,10 @@ class MieleVacuum(MieleEntity, StateVacuumEntity):
     @property
     def activity(self) -> VacuumActivity | None:
         """Map state."""
-        if self.coordinator.data[self._ent]["state|status|value_raw"] == 6:
+        if self.coordinator.data[self._ent].record.status == 6:
             return VacuumActivity.PAUSED
 
-        self._phase = self.coordinator.data[self._ent]["state|programPhase|value_raw"]
+        self._phase = self.coordinator.data[self._ent].record.program_phase
         if self._phase in (5903, 5904):
             return VacuumActivity.DOCKED
         if self._phase in (5889, 5892):
@@ -191,20 +206,19 @@ class MieleVacuum(MieleEntity, StateVacuumEntity):
     @property
     def battery_level(self):
         """Return the battery level."""
-        return self.coordinator.data[self._ent]["state|batteryLevel"]
+        return self.coordinator.data[self._ent].get(BATTERY_LEVEL_KEY)
 
     @property
     def fan_speed(self) -> str:
         """Return the fan speed."""
         if (
-            self.coordinator.data[self._ent]["state|ProgramID|value_raw"] == PROG_AUTO
-            or self.coordinator.data[self._ent]["state|ProgramID|value_raw"]
-            == PROG_SPOT
+            self.coordinator.data[self._ent].record.program_id == PROG_AUTO
+            or self.coordinator.data[self._ent].record.program_id == PROG_SPOT
         ):
             return "normal"
-        if self.coordinator.data[self._ent]["state|ProgramID|value_raw"] == PROG_TURBO:
+        if self.coordinator.data[self._ent].record.program_id == PROG_TURBO:
             return "turbo"
-        if self.coordinator.data[self._ent]["state|ProgramID|value_raw"] == PROG_SILENT:
+        if self.coordinator.data[self._ent].record.program_id == PROG_SILENT:
             return "silent"
         return None
 
@@ -212,7 +226,7 @@ class MieleVacuum(MieleEntity, StateVacuumEntity):
     def available(self):
         """Return the availability of the entity."""
 
-        if not self.coordinator.last_update_success:
+        if not super().available:
             return False
 
         if self.entity_description.key in {"poweronoff"}:
@@ -223,7 +237,7 @@ class MieleVacuum(MieleEntity, StateVacuumEntity):
             )
             return power_data
 
-        return self.coordinator.data[self._ent]["state|status|value_raw"] != 255
+        return self.coordinator.data[self._ent].record.status != 255
 
     async def async_turn_on(self, **kwargs):
         """Turn on the device."""
@@ -233,7 +247,7 @@ class MieleVacuum(MieleEntity, StateVacuumEntity):
         except aiohttp.ClientResponseError as ex:
             _LOGGER.error("Turn_on: %s - %s", ex.status, ex.message)
 
-        # await self.coordinator.async_request_refresh()
+        self.coordinator.async_schedule_refresh("turn_on", self._ent)
 
     async def async_turn_off(self, **kwargs):
         """Turn off the device."""
@@ -243,7 +257,7 @@ class MieleVacuum(MieleEntity, StateVacuumEntity):
         except aiohttp.ClientResponseError as ex:
             _LOGGER.error("Turn_off: %s - %s", ex.status, ex.message)
 
-        # await self.coordinator.async_request_refresh()
+        self.coordinator.async_schedule_refresh("turn_off", self._ent)
 
     async def async_return_to_base(self, **kwargs):
         """Return to base."""
@@ -0,0 +1 @@
+"""Tests for the Miele integration."""
@@ -0,0 +1,47 @@
+"""Helpers for the Miele integration tests."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.miele.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+ACTIONS = {"processAction": [1], "light": []}
+SERIAL = "000123456789"
+
+
+def api_response(status: int = 200, body: Any = ACTIONS) -> SimpleNamespace:
+    """Return an API response, with a body that raises if it is an exception."""
+    if isinstance(body, Exception):
+        json = AsyncMock(side_effect=body)
+    else:
+        json = AsyncMock(return_value=body)
+    return SimpleNamespace(status=status, json=json, raise_for_status=Mock())
+
+
+async def async_setup_live(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    devices: asyncio.Future[dict[str, Any]],
+    payload: dict[str, Any],
+) -> None:
+    """Set up the config entry with the payload of one appliance."""
+    devices.set_result({SERIAL: payload})
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+def entity_id(hass: HomeAssistant, domain: str, key: str) -> str:
+    """Return the entity id of an entity of the appliance."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        domain, DOMAIN, f"{SERIAL}-{key}"
+    )
+    assert entity_id is not None
+    return entity_id
@@ -0,0 +1,91 @@
+"""Common fixtures for the Miele integration tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+import copy
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.miele import devcap
+from custom_components.miele.const import DOMAIN
+from homeassistant.core import HomeAssistant
+
+from .common import api_response
+
+FIXTURES: dict[str, dict[str, Any]] = {
+    name: getattr(devcap, name)
+    for name in dir(devcap)
+    if name.startswith("TEST_DATA_") and name != "TEST_DATA_TEMPLATE"
+}
+
+
+@pytest.fixture(params=sorted(FIXTURES))
+def appliance_payload(request: pytest.FixtureRequest) -> dict[str, Any]:
+    """Return a copy of each appliance payload in devcap.py."""
+    return copy.deepcopy(FIXTURES[request.param])
+
+
+@pytest.fixture
+def entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return a config entry of the integration."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={"auth_implementation": DOMAIN, "token": {"access_token": "token"}},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def devices() -> asyncio.Future[dict[str, Any]]:
+    """Return the future answer of the API to fetching the appliances."""
+    return asyncio.get_running_loop().create_future()
+
+
+@pytest.fixture
+async def api(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    devices: asyncio.Future[dict[str, Any]],
+) -> AsyncGenerator[AsyncMock]:
+    """Patch the authentication and requests of the API."""
+
+    async def request(
+        auth: Any, method: str, path: str, **kwargs: Any
+    ) -> SimpleNamespace:
+        if path.startswith("/devices?"):
+            return api_response(body=await asyncio.shield(devices))
+        return api_response()
+
+    async def listen_events(**kwargs: Any) -> None:
+        await asyncio.Event().wait()
+
+    # The OAuth2 implementation is patched, its components are not needed
+    hass.config.components.update({"application_credentials", "http"})
+    with (
+        patch(
+            "custom_components.miele.async_get_config_entry_implementation",
+            AsyncMock(),
+        ),
+        patch(
+            "custom_components.miele.OAuth2Session",
+            return_value=Mock(async_ensure_token_valid=AsyncMock()),
+        ),
+        patch(
+            "custom_components.miele.api.AsyncConfigEntryAuth.request",
+            side_effect=request,
+            autospec=True,
+        ) as mock_request,
+        patch(
+            "custom_components.miele.api.AsyncConfigEntryAuth.listen_events",
+            side_effect=listen_events,
+        ),
+    ):
+        yield mock_request
@@ -0,0 +1,160 @@
+"""Tests for the action queue."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.miele.actions import (
+    MieleActionQueue,
+    _PendingAction,
+    _supersedes,
+)
+from custom_components.miele.api import AsyncConfigEntryAuth
+
+SERIAL = "000123456789"
+
+
+async def _send(serial: str, payload: dict[str, Any]) -> Any:
+    """Send an action."""
+
+
+async def _send_program(serial: str, payload: dict[str, Any]) -> Any:
+    """Send a program."""
+
+
+def _pending(payload: dict[str, Any], send: Any = _send) -> _PendingAction:
+    """Return a pending action without a running loop."""
+    return _PendingAction(send, payload, None)
+
+
+@pytest.mark.parametrize(
+    ("payload", "previous", "expected"),
+    [
+        ({"light": 1}, {"light": 2}, True),
+        ({"ventilationStep": 3}, {"ventilationStep": 1}, True),
+        ({"light": 1}, {"ventilationStep": 1}, False),
+        ({"light": 1, "colors": "red"}, {"light": 1}, False),
+        ({"processAction": 1}, {"processAction": 2}, False),
+        ({"processAction": 1}, {"processAction": 1}, False),
+        ({"powerOn": True}, {"powerOn": True}, False),
+        ({"powerOff": True}, {"powerOff": True}, False),
+        ({"programId": 1}, {"programId": 2}, False),
+        (
+            {"targetTemperature": [{"zone": 1, "value": 4}]},
+            {"targetTemperature": [{"zone": 2, "value": 8}]},
+            False,
+        ),
+        ({"deviceName": {"name": "a"}}, {"deviceName": {"name": "b"}}, False),
+    ],
+)
+def test_supersedes(
+    payload: dict[str, Any], previous: dict[str, Any], expected: bool
+) -> None:
+    """Test which payloads replace the pending payload."""
+    assert _supersedes(_send, payload, _pending(previous)) is expected
+
+
+def test_supersedes_other_send() -> None:
+    """Test that payloads for other endpoints are never merged."""
+    assert not _supersedes(_send, {"light": 1}, _pending({"light": 2}, _send_program))
+
+
+class _Recorder:
+    """Record sent actions, the first one waits until released."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        """Initialize the recorder."""
+        self.sent: list[dict[str, Any]] = []
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.error = error
+
+    async def send(self, serial: str, payload: dict[str, Any]) -> Any:
+        """Record an action."""
+        if not self.started.is_set():
+            self.started.set()
+            await self.release.wait()
+        self.sent.append(payload)
+        if self.error:
+            raise self.error
+        return payload
+
+
+async def _queue_burst(
+    recorder: _Recorder, payloads: list[dict[str, Any]]
+) -> tuple[MieleActionQueue, list[Any]]:
+    """Queue payloads while the first one is in flight."""
+    queue = MieleActionQueue(recorder.send, min_interval=0)
+    tasks = [asyncio.create_task(queue.async_send(SERIAL, payloads[0]))]
+    await recorder.started.wait()
+    tasks.extend(
+        asyncio.create_task(queue.async_send(SERIAL, payload))
+        for payload in payloads[1:]
+    )
+    await asyncio.sleep(0)
+    recorder.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    return queue, results
+
+
+async def test_queue_merges_values() -> None:
+    """Test that a burst of values only sends the first and the last."""
+    recorder = _Recorder()
+    payloads = [{"light": 1}, {"light": 2}, {"light": 1}, {"light": 2}]
+    queue, results = await _queue_burst(recorder, payloads)
+    assert recorder.sent == [{"light": 1}, {"light": 2}]
+    assert results == [{"light": 1}, {"light": 2}, {"light": 2}, {"light": 2}]
+    assert queue.merged == 2
+    assert queue.as_dict()["pending"] == 0
+    assert [entry["callers"] for entry in queue.log] == [1, 3]
+
+
+async def test_queue_keeps_commands() -> None:
+    """Test that commands are all sent in order."""
+    recorder = _Recorder()
+    payloads = [{"processAction": 1}, {"processAction": 2}, {"processAction": 1}]
+    queue, _ = await _queue_burst(recorder, payloads)
+    assert recorder.sent == payloads
+    assert queue.merged == 0
+
+
+async def test_queue_errors_reach_all_callers() -> None:
+    """Test that a failed request fails every merged caller."""
+    error = RuntimeError("failed")
+    recorder = _Recorder(error)
+    payloads = [{"light": 1}, {"light": 2}, {"light": 1}]
+    queue, results = await _queue_burst(recorder, payloads)
+    assert results == [error, error, error]
+    assert [entry["status"] for entry in queue.log] == ["RuntimeError"] * 2
+
+
+async def test_queue_cancelled() -> None:
+    """Test that cancelling the queue fails the actions still pending."""
+    recorder = _Recorder()
+    queue = MieleActionQueue(recorder.send, min_interval=0)
+    tasks = [asyncio.create_task(queue.async_send(SERIAL, {"light": 1}))]
+    await recorder.started.wait()
+    tasks.append(asyncio.create_task(queue.async_send(SERIAL, {"powerOn": True})))
+    await asyncio.sleep(0)
+
+    queue.cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert recorder.sent == []
+    assert queue.as_dict()["pending"] == 0
+
+
+async def test_target_temperature_queued() -> None:
+    """Test that target temperatures are sent through the action queue."""
+    auth = AsyncConfigEntryAuth(Mock(), Mock())
+    with patch(
+        "pymiele.AbstractAuth.set_target_temperature", AsyncMock(return_value="ok")
+    ) as set_target_temperature:
+        assert await auth.set_target_temperature(SERIAL, 21.6, 2) == "ok"
+
+    set_target_temperature.assert_awaited_once_with(SERIAL, 22, 2)
+    assert auth.actions.log[0]["action"] == ["targetTemperature"]
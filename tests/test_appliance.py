@@ -0,0 +1,195 @@
+"""Tests for the appliance data."""
+
+from typing import Any
+
+import pytest
+
+from custom_components.miele.appliance import (
+    RECORD_KEYS,
+    TECH_TYPE_KEY,
+    XKM_RELEASE_VERSION_KEY,
+    XKM_TECH_TYPE_KEY,
+    MieleApplianceData,
+    MieleApplianceRecord,
+    decode_temperatures,
+    temperature_channel,
+)
+from custom_components.miele.flatten import flatten
+from custom_components.miele.keys import KEY_CATALOGUE, KeyLayout
+
+PAYLOAD = {
+    "ident": {
+        "type": {"value_raw": 1, "value_localized": "Washing machine"},
+        "deviceIdentLabel": {"techType": "WCI870"},
+        "xkmIdentLabel": {"techType": "EK057", "releaseVersion": "08.32"},
+    },
+    "state": {
+        "status": {"value_raw": 5},
+        "ProgramID": {"value_raw": 3},
+        "programPhase": {"value_raw": 260},
+        "remainingTime": [1, 30],
+        "temperature": [
+            {"value_raw": 4000},
+            {"value_raw": -32768},
+            {"value_raw": -32766},
+        ],
+        "targetTemperature": [{"value_raw": 6000}],
+        "plateStep": [],
+    },
+}
+
+
+def test_mapping_access() -> None:
+    """Test reading flat keys from the payload."""
+    data = MieleApplianceData(PAYLOAD)
+    assert data["ident|type|value_raw"] == 1
+    assert data["state|remainingTime|1"] == 30
+    assert data["state|temperature|0|value_raw"] == 4000
+    assert data["state|plateStep"] == []
+    assert data.get("state|light") is None
+    assert dict(data) == flatten(PAYLOAD)
+    assert len(data) == len(flatten(PAYLOAD))
+    assert data.as_flat_dict() == flatten(PAYLOAD)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "state",
+        "state|remainingTime",
+        "state|temperature|0",
+        "state|temperature|3|value_raw",
+        "state|missing",
+    ],
+)
+def test_missing_keys(key: str) -> None:
+    """Test that branches and missing paths are not keys."""
+    data = MieleApplianceData(PAYLOAD)
+    with pytest.raises(KeyError):
+        data[key]
+    assert key not in data
+
+
+def test_record() -> None:
+    """Test the values read on every update."""
+    data = MieleApplianceData(PAYLOAD)
+    assert data.record == MieleApplianceRecord(
+        type_raw=1, status=5, program_id=3, program_phase=260
+    )
+    assert data.get(TECH_TYPE_KEY) == "WCI870"
+    assert data.get(XKM_TECH_TYPE_KEY) == "EK057"
+    assert data.get(XKM_RELEASE_VERSION_KEY) == "08.32"
+
+
+def test_record_missing_values() -> None:
+    """Test that values missing from the payload are None in the record."""
+    assert MieleApplianceData({"ident": {}}).record == MieleApplianceRecord(
+        type_raw=None, status=None, program_id=None, program_phase=None
+    )
+
+
+def test_temperatures() -> None:
+    """Test that temperatures are in degrees with sentinels masked."""
+    data = MieleApplianceData(PAYLOAD)
+    assert data.temperature("temperature", 0) == 40.0
+    assert data.temperature("temperature", 1) is None
+    assert data.temperature("temperature", 2) is None
+    assert data.temperature("temperature", 3) is None
+    assert data.temperature("targetTemperature", 0) == 60.0
+    assert data.temperature("coreTemperature", 0) is None
+
+
+def test_decode_temperatures_malformed() -> None:
+    """Test that malformed temperature zones decode to None."""
+    assert decode_temperatures({}) == {}
+    assert decode_temperatures({"state": None}) == {}
+    assert decode_temperatures(
+        {
+            "state": {
+                "temperature": [None, {"value_raw": None}, {}, {"value_raw": 150}],
+                "targetTemperature": None,
+            }
+        }
+    ) == {"temperature": (None, None, None, 1.5)}
+
+
+@pytest.mark.parametrize(
+    ("key", "expected"),
+    [
+        ("state|targetTemperature|1|value_raw", ("targetTemperature", 1)),
+        ("state|coreTemperature|0|value_raw", ("coreTemperature", 0)),
+        ("state|temperature|0|unit", None),
+        ("state|plateStep|0|value_raw", None),
+        ("state|temperature|x|value_raw", None),
+    ],
+)
+def test_temperature_channel(key: str, expected: tuple[str, int] | None) -> None:
+    """Test finding the temperature channel of a key."""
+    assert temperature_channel(key) == expected
+
+
+def test_set_raw() -> None:
+    """Test that a new payload replaces the values read before."""
+    data = MieleApplianceData(PAYLOAD)
+    assert len(data) == len(flatten(PAYLOAD))
+    assert data.temperature("temperature", 0) == 40.0
+
+    assert data.record.status == 5
+
+    data.set_raw({"state": {"status": {"value_raw": 1}}})
+    assert data["state|status|value_raw"] == 1
+    assert data.record.status == 1
+    assert data.temperature("temperature", 0) is None
+    assert dict(data) == {"state|status|value_raw": 1}
+
+
+def test_flat_keys(appliance_payload: dict[str, Any]) -> None:
+    """Test that every flat key reads the value of the flattened payload."""
+    data = MieleApplianceData(appliance_payload)
+    for key, value in flatten(appliance_payload).items():
+        assert data[key] == value
+
+
+def test_temperature_keys(appliance_payload: dict[str, Any]) -> None:
+    """Test that decoded temperatures match the raw temperature keys."""
+    data = MieleApplianceData(appliance_payload)
+    for key, value in flatten(appliance_payload).items():
+        if (channel := temperature_channel(key)) is None:
+            continue
+        expected = None if value in (-32768, -32766, None) else value / 100
+        assert data.temperature(*channel) == expected
+
+
+def test_record_fields(appliance_payload: dict[str, Any]) -> None:
+    """Test that the record holds the values of its flat keys."""
+    data = MieleApplianceData(appliance_payload)
+    for name, key in RECORD_KEYS.items():
+        assert getattr(data.record, name) == data.get(key)
+
+
+def test_layout_positions() -> None:
+    """Test that positions stay valid when keys are added."""
+    layout = KeyLayout()
+    first = layout.position("state|light")
+    assert layout.position("state|status|value_raw") == first + 1
+    assert layout.position("state|light") == first
+    assert layout.extract({"state": {"light": 1, "status": {"value_raw": 2}}}) == (
+        1,
+        2,
+    )
+
+
+def test_layout_growth() -> None:
+    """Test that values are extracted again when the layout has grown."""
+    data = MieleApplianceData(PAYLOAD)
+    data.value_at(KEY_CATALOGUE.position(1, "state|remainingTime|0"))
+    position = KEY_CATALOGUE.position(1, "state|remainingTime|1")
+    assert data.value_at(position) == 30
+
+
+def test_positional_reads(appliance_payload: dict[str, Any]) -> None:
+    """Test that every flat key reads the same value by position."""
+    data = MieleApplianceData(appliance_payload)
+    layout = KEY_CATALOGUE.layout(data.record.type_raw)
+    for key, value in flatten(appliance_payload).items():
+        assert data.value_at(layout.position(key)) == value
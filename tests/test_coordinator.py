@@ -0,0 +1,170 @@
+"""Tests for the Miele data update coordinator."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+import logging
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.miele.appliance import MieleApplianceData
+from custom_components.miele.const import (
+    DOMAIN,
+    POLL_UPDATE_INTERVAL,
+    PUSH_EVENT_WINDOW,
+    PUSH_UPDATE_INTERVAL,
+    REFRESH_COALESCE_DELAY,
+    UPDATE_MODE_POLL,
+    UPDATE_MODE_PUSH,
+)
+from custom_components.miele.coordinator import MieleDataUpdateCoordinator
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+DATA = {
+    "washer": MieleApplianceData({"state": {"door": 1, "temp": 20}}),
+    "oven": MieleApplianceData({"state": {"door": 1, "temp": 180}}),
+}
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant,
+) -> AsyncGenerator[MieleDataUpdateCoordinator]:
+    """Return a coordinator holding DATA."""
+    coordinator = MieleDataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        name=DOMAIN,
+        update_method=AsyncMock(return_value=DATA),
+        device_update_method=AsyncMock(),
+        update_interval=POLL_UPDATE_INTERVAL,
+    )
+    coordinator.async_set_updated_data(DATA)
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+async def test_keyed_listeners(coordinator: MieleDataUpdateCoordinator) -> None:
+    """Test that pushed changes only notify the affected listeners."""
+    washer_door = Mock()
+    washer_temp = Mock()
+    oven_door = Mock()
+    unkeyed = Mock()
+    coordinator.async_add_listener(washer_door, ("washer", ["state|door"]))
+    coordinator.async_add_listener(washer_temp, ("washer", ["state|temp"]))
+    coordinator.async_add_listener(oven_door, ("oven", ["state|door"]))
+    coordinator.async_add_listener(unkeyed)
+
+    coordinator.async_set_changed_data(DATA, {"washer": {"state|temp"}})
+    assert washer_door.call_count == 0
+    assert washer_temp.call_count == 1
+    assert oven_door.call_count == 0
+    assert unkeyed.call_count == 1
+
+    coordinator.async_set_changed_data(
+        DATA, {"oven": {"state|door", "state|light"}, "dryer": {"state|door"}}
+    )
+    assert washer_door.call_count == 0
+    assert washer_temp.call_count == 1
+    assert oven_door.call_count == 1
+    assert unkeyed.call_count == 2
+
+    coordinator.async_set_updated_data(DATA)
+    assert washer_door.call_count == 1
+    assert washer_temp.call_count == 2
+    assert oven_door.call_count == 2
+    assert unkeyed.call_count == 3
+
+
+async def test_keyed_listener_removed(
+    coordinator: MieleDataUpdateCoordinator,
+) -> None:
+    """Test that removed listeners are no longer notified of changes."""
+    first = Mock()
+    second = Mock()
+    remove_first = coordinator.async_add_listener(first, ("washer", ["state|door"]))
+    coordinator.async_add_listener(second, ("washer", ["state|door"]))
+
+    coordinator.async_set_changed_data(DATA, {"washer": {"state|door"}})
+    remove_first()
+    coordinator.async_set_changed_data(DATA, {"washer": {"state|door"}})
+    assert first.call_count == 1
+    assert second.call_count == 2
+
+
+async def test_push_after_failed_update(
+    coordinator: MieleDataUpdateCoordinator,
+) -> None:
+    """Test that the first push after a failed update notifies all listeners."""
+    door = Mock()
+    temp = Mock()
+    coordinator.async_add_listener(door, ("washer", ["state|door"]))
+    coordinator.async_add_listener(temp, ("washer", ["state|temp"]))
+
+    coordinator.update_method.side_effect = UpdateFailed("offline")
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert door.call_count == 1
+
+    coordinator.async_set_changed_data(DATA, {"washer": {"state|temp"}})
+    assert coordinator.last_update_success
+    assert door.call_count == 2
+    assert temp.call_count == 2
+
+    coordinator.async_set_changed_data(DATA, {"washer": {"state|temp"}})
+    assert door.call_count == 2
+    assert temp.call_count == 3
+
+
+async def test_push_mode(coordinator: MieleDataUpdateCoordinator) -> None:
+    """Test that polling is stretched while the stream delivers events."""
+    coordinator.async_stream_connected()
+    await coordinator.async_refresh()
+    assert coordinator.update_mode == UPDATE_MODE_POLL
+
+    coordinator.async_event_received()
+    assert coordinator.update_mode == UPDATE_MODE_PUSH
+    assert coordinator.update_interval == PUSH_UPDATE_INTERVAL
+
+    await coordinator.async_refresh()
+    assert coordinator.update_mode == UPDATE_MODE_PUSH
+
+
+async def test_push_mode_ends_without_events(
+    coordinator: MieleDataUpdateCoordinator,
+) -> None:
+    """Test that a stream without recent events falls back to polling."""
+    coordinator.async_stream_connected()
+    coordinator.async_event_received()
+    assert coordinator.update_mode == UPDATE_MODE_PUSH
+
+    coordinator.last_event = time.monotonic() - PUSH_EVENT_WINDOW.total_seconds() - 1
+    await coordinator.async_refresh()
+    assert coordinator.update_mode == UPDATE_MODE_POLL
+    assert coordinator.update_interval == POLL_UPDATE_INTERVAL
+
+    coordinator.async_event_received()
+    assert coordinator.update_mode == UPDATE_MODE_PUSH
+
+
+async def test_push_mode_ends_when_stream_lost(
+    hass: HomeAssistant, coordinator: MieleDataUpdateCoordinator
+) -> None:
+    """Test that a lost stream falls back to polling and refreshes at once."""
+    coordinator.async_stream_connected()
+    coordinator.async_event_received()
+    coordinator.async_stream_disconnected()
+    assert coordinator.update_mode == UPDATE_MODE_POLL
+    assert coordinator.update_interval == POLL_UPDATE_INTERVAL
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=REFRESH_COALESCE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+    assert coordinator.refresh_log[-1]["triggers"] == ["stream lost"]
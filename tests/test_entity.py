@@ -0,0 +1,124 @@
+"""Tests for the optimistic state of Miele entities."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+import copy
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.miele.const import (
+    ACT_START_SUPERCOOL,
+    OPTIMISTIC_STATE_TTL,
+    PROCESS_ACTION,
+    REFRESH_COALESCE_DELAY,
+)
+from custom_components.miele.devcap import TEST_DATA_19
+from homeassistant.const import ATTR_ENTITY_ID, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from .common import SERIAL, api_response, async_setup_live, entity_id
+
+SUPERCOOLING = 14
+
+
+@pytest.fixture
+async def fridge(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    api: AsyncMock,
+    devices: asyncio.Future[dict[str, Any]],
+) -> AsyncGenerator[dict[str, Any]]:
+    """Set up a fridge and answer its commands and state requests."""
+    fridge: dict[str, Any] = {
+        "state": copy.deepcopy(TEST_DATA_19["state"]),
+        "put": api_response(),
+        "sent": [],
+    }
+    default = api.side_effect
+
+    async def request(
+        auth: Any, method: str, path: str, **kwargs: Any
+    ) -> SimpleNamespace:
+        if method == "PUT":
+            fridge["sent"].append(json.loads(kwargs["data"]))
+            if isinstance(fridge["put"], Exception):
+                raise fridge["put"]
+            return fridge["put"]
+        if path.startswith(f"/devices/{SERIAL}/state"):
+            return api_response(body=fridge["state"])
+        return await default(auth, method, path, **kwargs)
+
+    api.side_effect = request
+    await async_setup_live(hass, entry, devices, copy.deepcopy(TEST_DATA_19))
+    yield fridge
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def _turn_on(hass: HomeAssistant) -> str:
+    """Turn on supercooling, return the entity id of the switch."""
+    switch = entity_id(hass, "switch", "supercooling")
+    assert hass.states.get(switch).state == STATE_OFF
+    await hass.services.async_call(
+        "switch", "turn_on", {ATTR_ENTITY_ID: switch}, blocking=True
+    )
+    return switch
+
+
+async def _fire(hass: HomeAssistant) -> None:
+    """Run what is due at the frozen time."""
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_optimistic_confirmed(
+    hass: HomeAssistant, fridge: dict[str, Any], freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that the optimistic state is shown until the data confirms it."""
+    switch = await _turn_on(hass)
+    assert fridge["sent"] == [{PROCESS_ACTION: ACT_START_SUPERCOOL}]
+    assert hass.states.get(switch).state == STATE_ON
+
+    # The refresh after the command shows supercooling
+    fridge["state"]["status"]["value_raw"] = SUPERCOOLING
+    freezer.tick(REFRESH_COALESCE_DELAY + 1)
+    await _fire(hass)
+    assert hass.states.get(switch).state == STATE_ON
+
+    freezer.tick(OPTIMISTIC_STATE_TTL)
+    await _fire(hass)
+    assert hass.states.get(switch).state == STATE_ON
+
+
+async def test_optimistic_expired(
+    hass: HomeAssistant, fridge: dict[str, Any], freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that an unconfirmed optimistic state is rolled back in time."""
+    switch = await _turn_on(hass)
+    freezer.tick(REFRESH_COALESCE_DELAY + 1)
+    await _fire(hass)
+    assert hass.states.get(switch).state == STATE_ON
+
+    freezer.tick(OPTIMISTIC_STATE_TTL)
+    await _fire(hass)
+    assert hass.states.get(switch).state == STATE_OFF
+
+
+async def test_optimistic_failed(hass: HomeAssistant, fridge: dict[str, Any]) -> None:
+    """Test that the optimistic state is dropped when the command fails."""
+    fridge["put"] = TimeoutError()
+    with pytest.raises(TimeoutError):
+        await _turn_on(hass)
+    assert hass.states.get(entity_id(hass, "switch", "supercooling")).state == (
+        STATE_OFF
+    )
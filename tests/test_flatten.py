@@ -0,0 +1,65 @@
+"""Tests for the flattening of API payloads."""
+
+from typing import Any
+
+import flatdict
+import pytest
+
+from custom_components.miele.flatten import flatten, flatten_path
+
+
+def test_flatten_nested() -> None:
+    """Test that leaves are stored under their separated path."""
+    payload = {
+        "ident": {"type": {"value_raw": 1, "value_localized": "Washing machine"}},
+        "state": {
+            "remainingTime": [1, 30],
+            "temperature": [{"value_raw": 4000}, {"value_raw": -32768}],
+        },
+    }
+    assert flatten(payload) == {
+        "ident|type|value_raw": 1,
+        "ident|type|value_localized": "Washing machine",
+        "state|remainingTime|0": 1,
+        "state|remainingTime|1": 30,
+        "state|temperature|0|value_raw": 4000,
+        "state|temperature|1|value_raw": -32768,
+    }
+
+
+def test_flatten_keeps_empty_containers() -> None:
+    """Test that empty dicts and lists are kept as leaves."""
+    assert flatten({"state": {"plateStep": [], "ecoFeedback": {}, "light": None}}) == {
+        "state|plateStep": [],
+        "state|ecoFeedback": {},
+        "state|light": None,
+    }
+
+
+@pytest.mark.parametrize(
+    ("path", "value", "expected"),
+    [
+        ("state|light", 1, {"state|light": 1}),
+        ("state|plateStep", [], {"state|plateStep": []}),
+        (
+            "state|startTime",
+            [0, 45],
+            {"state|startTime|0": 0, "state|startTime|1": 45},
+        ),
+    ],
+)
+def test_flatten_path(path: str, value: Any, expected: dict[str, Any]) -> None:
+    """Test flattening the subtree at a path."""
+    assert flatten_path(path, value) == expected
+
+
+def test_flatten_matches_flatdict(appliance_payload: dict[str, Any]) -> None:
+    """Test that the key layout is the one of flatdict.FlatterDict."""
+    expected = dict(flatdict.FlatterDict(appliance_payload, delimiter="|"))
+    flat = flatten(appliance_payload)
+    assert list(flat) == list(expected)
+    assert all(
+        flat[key] == value
+        for key, value in expected.items()
+        if not hasattr(value, "as_dict")
+    )
@@ -0,0 +1,155 @@
+"""Tests for the incremental ingestion of appliance data."""
+
+import copy
+from typing import Any
+
+from custom_components.miele.flatten import flatten
+from custom_components.miele.ingest import MieleIngest
+
+SERIAL = "000123456789"
+
+
+def _flat_changes(old: dict[str, Any], new: dict[str, Any]) -> set[str]:
+    """Return the changed keys by comparing the flattened payloads."""
+    old_flat = flatten(old)
+    new_flat = flatten(new)
+    return {
+        key
+        for key in old_flat.keys() | new_flat.keys()
+        if key not in old_flat or key not in new_flat or old_flat[key] != new_flat[key]
+    }
+
+
+def _mutations(payload: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return changed copies of a payload."""
+    mutations = []
+
+    changed = copy.deepcopy(payload)
+    changed["state"]["status"]["value_raw"] = 1234
+    mutations.append(changed)
+
+    changed = copy.deepcopy(payload)
+    changed["state"]["remainingTime"] = [9, 59]
+    mutations.append(changed)
+
+    changed = copy.deepcopy(payload)
+    changed["state"]["temperature"] = changed["state"]["temperature"][:1]
+    mutations.append(changed)
+
+    changed = copy.deepcopy(payload)
+    changed["state"]["temperature"].append({"value_raw": 2100, "unit": "Celsius"})
+    mutations.append(changed)
+
+    changed = copy.deepcopy(payload)
+    changed["state"]["ecoFeedback"] = {"energyConsumption": {"value": 0.5}}
+    mutations.append(changed)
+
+    changed = copy.deepcopy(payload)
+    changed["state"]["plateStep"] = []
+    mutations.append(changed)
+
+    changed = copy.deepcopy(payload)
+    del changed["state"]["light"]
+    mutations.append(changed)
+
+    changed = copy.deepcopy(payload)
+    changed["ident"]["type"] = None
+    mutations.append(changed)
+
+    return mutations
+
+
+def test_rebuild() -> None:
+    """Test that rebuild replaces all appliance data."""
+    ingest = MieleIngest()
+    ingest.rebuild({"a": {"state": {"light": 1}}, "b": {"state": {"light": 2}}})
+    data = ingest.rebuild({"b": {"state": {"light": 1}}})
+    assert list(data) == ["b"]
+    assert data["b"]["state|light"] == 1
+
+
+def test_ingest_equal_payload() -> None:
+    """Test that an equal payload has no changes and keeps the data."""
+    ingest = MieleIngest()
+    ingest.rebuild({SERIAL: {"state": {"light": 1, "remainingTime": [0, 5]}}})
+    data = ingest.data[SERIAL]
+    assert (
+        ingest.ingest({SERIAL: {"state": {"light": 1, "remainingTime": [0, 5]}}}) == {}
+    )
+    assert ingest.data[SERIAL] is data
+
+
+def test_ingest_changed_leaf() -> None:
+    """Test that a changed value only reports its key."""
+    ingest = MieleIngest()
+    ingest.rebuild({SERIAL: {"state": {"light": 1, "remainingTime": [0, 5]}}})
+    data = ingest.data[SERIAL]
+    changes = ingest.ingest({SERIAL: {"state": {"light": 1, "remainingTime": [0, 4]}}})
+    assert changes == {SERIAL: {"state|remainingTime|1"}}
+    assert ingest.data[SERIAL] is data
+    assert data["state|remainingTime|1"] == 4
+
+
+def test_ingest_added_and_removed_appliances() -> None:
+    """Test that added and removed appliances report all their keys."""
+    ingest = MieleIngest()
+    ingest.rebuild({"a": {"state": {"light": 1, "plateStep": []}}})
+    changes = ingest.ingest({"b": {"state": {"light": 2}}})
+    assert changes == {
+        "a": {"state|light", "state|plateStep"},
+        "b": {"state|light"},
+    }
+    assert list(ingest.data) == ["b"]
+
+
+def test_ingest_list_shrink_and_grow() -> None:
+    """Test that list items coming and going report their keys."""
+    ingest = MieleIngest()
+    ingest.rebuild({SERIAL: {"state": {"plateStep": [{"value_raw": 1}]}}})
+    assert ingest.ingest({SERIAL: {"state": {"plateStep": []}}}) == {
+        SERIAL: {"state|plateStep", "state|plateStep|0|value_raw"}
+    }
+    assert ingest.ingest(
+        {SERIAL: {"state": {"plateStep": [{"value_raw": 2}, {"value_raw": 3}]}}}
+    ) == {
+        SERIAL: {
+            "state|plateStep",
+            "state|plateStep|0|value_raw",
+            "state|plateStep|1|value_raw",
+        }
+    }
+
+
+def test_ingest_state() -> None:
+    """Test merging the state of a single appliance."""
+    ingest = MieleIngest()
+    ingest.rebuild({SERIAL: {"ident": {"type": 1}, "state": {"light": 1}}})
+    assert ingest.ingest_state(SERIAL, {"light": 1}) == set()
+    assert ingest.ingest_state(SERIAL, {"light": 2, "plateStep": []}) == {
+        "state|light",
+        "state|plateStep",
+    }
+    data = ingest.data[SERIAL]
+    assert data["ident|type"] == 1
+    assert data["state|light"] == 2
+
+
+def test_ingest_matches_flat_diff(appliance_payload: dict[str, Any]) -> None:
+    """Test that the changes are the keys differing between flat payloads."""
+    for mutation in _mutations(appliance_payload):
+        ingest = MieleIngest()
+        ingest.rebuild({SERIAL: copy.deepcopy(appliance_payload)})
+        changes = ingest.ingest({SERIAL: mutation})
+        assert changes.get(SERIAL, set()) == _flat_changes(appliance_payload, mutation)
+        assert dict(ingest.data[SERIAL]) == flatten(mutation)
+
+
+def test_ingest_state_matches_flat_diff(appliance_payload: dict[str, Any]) -> None:
+    """Test that the state changes are the keys differing between payloads."""
+    for mutation in _mutations(appliance_payload):
+        ingest = MieleIngest()
+        ingest.rebuild({SERIAL: copy.deepcopy(appliance_payload)})
+        changes = ingest.ingest_state(SERIAL, mutation["state"])
+        expected = {**appliance_payload, "state": mutation["state"]}
+        assert changes == _flat_changes(appliance_payload, expected)
+        assert dict(ingest.data[SERIAL]) == flatten(expected)
@@ -0,0 +1,141 @@
+"""Tests for the setup of the Miele integration."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from json.decoder import JSONDecodeError
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+from aiohttp import ClientConnectionError, ContentTypeError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.miele import _async_fetch_all_actions
+from custom_components.miele.const import API, DOMAIN, STORAGE_VERSION
+from custom_components.miele.devcap import TEST_DATA_1
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
+
+from .common import ACTIONS, SERIAL, api_response, async_setup_live, entity_id
+
+
+def _api(responses: dict[str, Any]) -> Mock:
+    """Return an API answering action requests per serial number."""
+
+    async def request(method: str, path: str, **kwargs: Any) -> SimpleNamespace:
+        result = responses[path.split("/")[2]]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return Mock(request=AsyncMock(side_effect=request))
+
+
+async def test_fetch_all_actions() -> None:
+    """Test that failures only affect the appliance concerned."""
+    api = _api(
+        {
+            "ok": api_response(),
+            "timeout": TimeoutError(),
+            "offline": ClientConnectionError(),
+            "html": api_response(body=ContentTypeError(Mock(), ())),
+            "garbled": api_response(body=JSONDecodeError("", "", 0)),
+            "error": api_response(503),
+        }
+    )
+    serials = ["ok", "timeout", "offline", "html", "garbled", "error"]
+
+    actions, failed = await _async_fetch_all_actions(api, serials)
+    assert actions == {"ok": ACTIONS}
+    assert failed == serials[1:]
+
+
+async def test_fetch_all_actions_auth_failed() -> None:
+    """Test that authentication failures are raised."""
+    api = _api({"ok": api_response(), "denied": api_response(401)})
+
+    with pytest.raises(ConfigEntryAuthFailed):
+        await _async_fetch_all_actions(api, ["ok", "denied"])
+
+
+async def test_setup_from_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    entry: MockConfigEntry,
+    api: AsyncMock,
+    devices: asyncio.Future[dict[str, Any]],
+) -> None:
+    """Test that entities are created from the snapshot and stale until live."""
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}",
+        "data": {
+            "devices": {SERIAL: copy.deepcopy(TEST_DATA_1)},
+            "actions": {SERIAL: ACTIONS},
+        },
+    }
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert coordinator.stale
+    assert (
+        hass.states.get(entity_id(hass, "sensor", "state_status")).state
+        == STATE_UNAVAILABLE
+    )
+
+    # The reconcile runs as a background task, which is not waited for
+    devices.set_result({SERIAL: copy.deepcopy(TEST_DATA_1)})
+    async with asyncio.timeout(1):
+        while coordinator.stale:
+            await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    assert (
+        hass.states.get(entity_id(hass, "sensor", "state_status")).state
+        != STATE_UNAVAILABLE
+    )
+    assert coordinator.refresh_log[-1]["triggers"] == ["snapshot reconcile"]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_setup_without_snapshot(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    api: AsyncMock,
+    devices: asyncio.Future[dict[str, Any]],
+) -> None:
+    """Test that the setup fetches live data without a snapshot."""
+    await async_setup_live(hass, entry, devices, copy.deepcopy(TEST_DATA_1))
+    assert not hass.data[DOMAIN][entry.entry_id]["coordinator"].stale
+    assert (
+        hass.states.get(entity_id(hass, "sensor", "state_status")).state
+        != STATE_UNAVAILABLE
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_session_closed_on_stop(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    api: AsyncMock,
+    devices: asyncio.Future[dict[str, Any]],
+) -> None:
+    """Test that the session is closed when Home Assistant stops."""
+    await async_setup_live(hass, entry, devices, copy.deepcopy(TEST_DATA_1))
+    websession = hass.data[DOMAIN][entry.entry_id][API].websession
+    assert not websession.closed
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert websession.closed
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
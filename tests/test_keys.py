@@ -0,0 +1,65 @@
+"""Tests for the compiled data key accessors."""
+
+from typing import Any
+
+import pytest
+
+from custom_components.miele.flatten import flatten
+from custom_components.miele.keys import compile_key
+
+PAYLOAD = {
+    "state": {
+        "status": {"value_raw": 5},
+        "remainingTime": [1, 30],
+        "temperature": [{"value_raw": 4000}],
+        "plateStep": [],
+        "ecoFeedback": None,
+    },
+}
+
+
+@pytest.mark.parametrize(
+    ("key", "expected"),
+    [
+        ("state|status|value_raw", 5),
+        ("state|remainingTime|1", 30),
+        ("state|temperature|0|value_raw", 4000),
+        ("state|plateStep", []),
+        ("state|ecoFeedback", None),
+    ],
+)
+def test_compile_key(key: str, expected: Any) -> None:
+    """Test reading leaves of the payload."""
+    assert compile_key(key)(PAYLOAD) == expected
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        "state",
+        "state|remainingTime",
+        "state|temperature|0",
+        "state|temperature|1|value_raw",
+        "state|status|value_raw|0",
+        "state|remainingTime|x",
+        "state|ecoFeedback|energyConsumption",
+        "state|missing",
+    ],
+)
+def test_compile_key_missing(key: str) -> None:
+    """Test that branches and missing paths raise KeyError."""
+    with pytest.raises(KeyError):
+        compile_key(key)(PAYLOAD)
+
+
+def test_compile_key_cached() -> None:
+    """Test that keys are compiled once."""
+    assert compile_key("state|status|value_raw") is compile_key(
+        "state|status|value_raw"
+    )
+
+
+def test_compile_key_reads_flat_keys(appliance_payload: dict[str, Any]) -> None:
+    """Test that every flat key reads its value from the payload."""
+    for key, value in flatten(appliance_payload).items():
+        assert compile_key(key)(appliance_payload) == value
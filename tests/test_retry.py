@@ -0,0 +1,143 @@
+"""Tests for the retry policy of API calls."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.miele.retry import MieleRetryPolicy, RetryCancelled
+
+
+def _policy(attempts: int = 3) -> MieleRetryPolicy:
+    """Return a policy without noticeable backoff."""
+    return MieleRetryPolicy(attempts=attempts, backoff_min=0.001, backoff_max=0.001)
+
+
+def _response(status: int) -> SimpleNamespace:
+    """Return a response with a status."""
+    return SimpleNamespace(status=status, release=lambda: None)
+
+
+class _Calls:
+    """Return the given results in order, raise them if they are errors."""
+
+    def __init__(self, *results: Any) -> None:
+        """Initialize the calls."""
+        self.results = list(results)
+        self.count = 0
+
+    async def __call__(self) -> Any:
+        """Return the next result."""
+        result = self.results[min(self.count, len(self.results) - 1)]
+        self.count += 1
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+async def test_success() -> None:
+    """Test that a successful call is not repeated."""
+    policy = _policy()
+    calls = _Calls(_response(200))
+    assert (await policy.async_call(calls)).status == 200
+    assert calls.count == 1
+    assert policy.stats.as_dict()["retries"] == 0
+
+
+async def test_timeout_retried_when_idempotent() -> None:
+    """Test that timeouts of idempotent calls are retried."""
+    policy = _policy()
+    calls = _Calls(TimeoutError(), _response(200))
+    assert (await policy.async_call(calls)).status == 200
+    assert calls.count == 2
+    assert policy.stats.timeouts == 1
+    assert policy.stats.retries == 1
+
+
+async def test_timeout_raised_when_not_idempotent() -> None:
+    """Test that timeouts of other calls are raised at once."""
+    policy = _policy()
+    calls = _Calls(TimeoutError(), _response(200))
+    with pytest.raises(TimeoutError):
+        await policy.async_call(calls, idempotent=False)
+    assert calls.count == 1
+
+
+async def test_write_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that calls changing state are limited to the write timeout."""
+    monkeypatch.setattr("custom_components.miele.retry.API_WRITE_TIMEOUT", 0.1)
+    policy = MieleRetryPolicy(backoff_min=1, backoff_max=1)
+
+    async def slow() -> None:
+        await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError):
+        await policy.async_call(slow, idempotent=False)
+
+    # Overload responses are not retried past the write timeout either
+    calls = _Calls(_response(503))
+    assert (await policy.async_call(calls, idempotent=False)).status == 503
+    assert calls.count == 1
+    assert policy.stats.budget_exhausted == 1
+
+
+@pytest.mark.parametrize(("status", "idempotent"), [(503, True), (503, False)])
+async def test_status_retried_then_returned(status: int, idempotent: bool) -> None:
+    """Test that overload responses are retried and the last one returned."""
+    policy = _policy()
+    calls = _Calls(_response(status))
+    result = await policy.async_call(calls, idempotent=idempotent)
+    assert result.status == status
+    assert calls.count == 3
+    assert policy.stats.retried_statuses == {status: 2}
+
+
+async def test_unsafe_status_not_retried() -> None:
+    """Test that a bad gateway is not repeated for calls changing state."""
+    policy = _policy()
+    calls = _Calls(_response(502))
+    assert (await policy.async_call(calls, idempotent=False)).status == 502
+    assert calls.count == 1
+
+
+async def test_attempts_limit() -> None:
+    """Test that the last error is raised when the attempts run out."""
+    policy = _policy(attempts=2)
+    calls = _Calls(TimeoutError())
+    with pytest.raises(TimeoutError):
+        await policy.async_call(calls)
+    assert calls.count == 2
+
+
+async def test_budget_exhausted() -> None:
+    """Test that no attempt is made past the budget."""
+    policy = MieleRetryPolicy(budget=0.5, backoff_min=10, backoff_max=10)
+    calls = _Calls(_response(503))
+    assert (await policy.async_call(calls)).status == 503
+    assert calls.count == 1
+    assert policy.stats.budget_exhausted == 1
+
+
+async def test_cancelled() -> None:
+    """Test that a set cancel event gives up the call."""
+    policy = _policy()
+    calls = _Calls(TimeoutError(), _response(200))
+    event = asyncio.Event()
+    event.set()
+
+    with pytest.raises(RetryCancelled):
+        await policy.async_call(calls, cancel_event=event)
+    assert calls.count == 1
+    assert policy.stats.cancelled == 1
+
+
+async def test_auth_failures() -> None:
+    """Test counting consecutive authentication failures."""
+    policy = _policy()
+    await policy.async_call(_Calls(_response(401)))
+    await policy.async_call(_Calls(_response(401)))
+    assert policy.stats.consecutive_auth_failures == 2
+    await policy.async_call(_Calls(_response(200)))
+    assert policy.stats.consecutive_auth_failures == 0
+    assert policy.stats.auth_failures == 2
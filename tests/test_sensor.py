@@ -0,0 +1,41 @@
+"""Tests for the Miele sensors."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.miele.const import DOMAIN
+from custom_components.miele.devcap import TEST_DATA_7
+from homeassistant.core import HomeAssistant
+
+from .common import async_setup_live, entity_id
+
+
+async def test_program_id_log(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    api: Any,
+    devices: asyncio.Future[dict[str, Any]],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that program values are logged even if keys are missing."""
+    caplog.set_level(logging.INFO, "custom_components.miele.sensor")
+    payload = copy.deepcopy(TEST_DATA_7)
+    del payload["state"]["programPhase"]["value_raw"]
+
+    await async_setup_live(hass, entry, devices, payload)
+    assert hass.states.get(entity_id(hass, "sensor", "state_program_phase"))
+    assert {
+        "appliance": "Dishwasher",
+        "key": "state_program_phase",
+        "raw": None,
+        "localized": "Drying",
+    } in hass.data[DOMAIN]["id_log"]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,130 @@
+"""Tests for the services of the Miele integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+import copy
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+from aiohttp import ClientResponseError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.miele.const import (
+    ACT_START,
+    CONF_MAX_PARALLEL,
+    DOMAIN,
+    PROCESS_ACTION,
+)
+from custom_components.miele.devcap import TEST_DATA_1
+from homeassistant.const import CONF_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+
+from .common import SERIAL, api_response
+
+FAILING_SERIAL = "000987654321"
+
+
+@pytest.fixture
+async def device_ids(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    api: AsyncMock,
+    devices: asyncio.Future[dict[str, Any]],
+) -> AsyncGenerator[list[str]]:
+    """Set up two washing machines, actions for the second one fail."""
+    default = api.side_effect
+
+    async def request(
+        auth: Any, method: str, path: str, **kwargs: Any
+    ) -> SimpleNamespace:
+        if method != "PUT":
+            return await default(auth, method, path, **kwargs)
+        api.sent.append((path.split("/")[2], json.loads(kwargs["data"])))
+        response = api_response()
+        if path.startswith(f"/devices/{FAILING_SERIAL}/"):
+            response.raise_for_status.side_effect = ClientResponseError(
+                Mock(), (), status=400, message="Bad Request"
+            )
+        return response
+
+    api.side_effect = request
+    api.sent = []
+    devices.set_result(
+        {SERIAL: copy.deepcopy(TEST_DATA_1), FAILING_SERIAL: copy.deepcopy(TEST_DATA_1)}
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    registry = dr.async_get(hass)
+    yield [
+        registry.async_get_device(identifiers={(DOMAIN, serial)}).id
+        for serial in (SERIAL, FAILING_SERIAL)
+    ]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_fan_out_response(
+    hass: HomeAssistant, api: AsyncMock, device_ids: list[str]
+) -> None:
+    """Test that every device is addressed and reported on its own."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        "process_action",
+        {
+            CONF_DEVICE_ID: [*device_ids, "unknown"],
+            "action": "start",
+            CONF_MAX_PARALLEL: 1,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert api.sent == [
+        (SERIAL, {PROCESS_ACTION: ACT_START}),
+        (FAILING_SERIAL, {PROCESS_ACTION: ACT_START}),
+    ]
+    ok, failed = device_ids
+    devices = response["devices"]
+    assert devices[ok]["success"]
+    assert devices[ok]["error"] is None
+    assert not devices[failed]["success"]
+    assert devices[failed]["error"] == "400 Bad Request"
+    assert devices["unknown"] == {
+        "success": False,
+        "error": "Not a Miele device",
+        "elapsed": 0.0,
+    }
+    entry_id = devices[ok]["entry_id"]
+    assert response["accounts"][entry_id]["devices"] == 2
+
+
+async def test_fan_out_raises(
+    hass: HomeAssistant, api: AsyncMock, device_ids: list[str]
+) -> None:
+    """Test that failures are raised once all devices have been addressed."""
+    with pytest.raises(HomeAssistantError, match="failed for 1 of 2 devices"):
+        await hass.services.async_call(
+            DOMAIN,
+            "generic_action",
+            {CONF_DEVICE_ID: device_ids, PROCESS_ACTION: ACT_START},
+            blocking=True,
+        )
+    assert len(api.sent) == 2
+
+
+async def test_fan_out_no_entry(hass: HomeAssistant, device_ids: list[str]) -> None:
+    """Test that a call without any loaded target is rejected."""
+    with pytest.raises(HomeAssistantError, match="Config entry for target not found"):
+        await hass.services.async_call(
+            DOMAIN,
+            "process_action",
+            {CONF_DEVICE_ID: ["unknown"], "action": "start"},
+            blocking=True,
+        )
@@ -0,0 +1,216 @@
+"""Tests for the supervision of the event stream."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+import logging
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from pymiele import MIELE_API
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from yarl import URL
+
+from custom_components.miele.connection import MieleConnectionStats
+from custom_components.miele.const import (
+    DOMAIN,
+    POLL_UPDATE_INTERVAL,
+    PUSH_EVENT_WINDOW,
+    REFRESH_COALESCE_DELAY,
+    STREAM_SILENCE_CHECK,
+    UPDATE_MODE_POLL,
+    UPDATE_MODE_PUSH,
+)
+from custom_components.miele.coordinator import MieleDataUpdateCoordinator
+from custom_components.miele.stream import MieleEventStream
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+STREAM_URL = URL(f"{MIELE_API}/devices/all/events")
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant,
+) -> AsyncGenerator[MieleDataUpdateCoordinator]:
+    """Return a coordinator without appliances."""
+    coordinator = MieleDataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        name=DOMAIN,
+        update_method=AsyncMock(return_value={}),
+        device_update_method=AsyncMock(),
+        update_interval=POLL_UPDATE_INTERVAL,
+    )
+    coordinator.async_set_updated_data({})
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+@pytest.fixture
+def listen_events() -> AsyncMock:
+    """Return a listener that runs until it is cancelled."""
+
+    async def listen(**kwargs: object) -> None:
+        await asyncio.Event().wait()
+
+    return AsyncMock(side_effect=listen)
+
+
+@pytest.fixture
+async def stream(
+    hass: HomeAssistant,
+    coordinator: MieleDataUpdateCoordinator,
+    listen_events: AsyncMock,
+) -> AsyncGenerator[MieleEventStream]:
+    """Return a started stream supervisor."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    api = Mock(connection_stats=MieleConnectionStats(), listen_events=listen_events)
+    stream = MieleEventStream(hass, entry, api, coordinator, AsyncMock(), AsyncMock())
+    stream.start()
+    await hass.async_block_till_done()
+    yield stream
+    stream.cancel()
+    await hass.async_block_till_done()
+
+
+async def _request(stats: MieleConnectionStats, url: URL, status: int = 200) -> None:
+    """Trace a request of the API session."""
+    ctx = SimpleNamespace()
+    await stats._on_request_start(None, ctx, SimpleNamespace(url=url))
+    await stats._on_request_end(
+        None, ctx, SimpleNamespace(url=url, response=SimpleNamespace(status=status))
+    )
+
+
+async def _run_refreshes(hass: HomeAssistant) -> None:
+    """Run the refreshes waiting for the coalescing window."""
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=REFRESH_COALESCE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+
+
+async def test_connections(
+    hass: HomeAssistant,
+    coordinator: MieleDataUpdateCoordinator,
+    stream: MieleEventStream,
+) -> None:
+    """Test that the connections of the client are followed."""
+    stats = stream._api.connection_stats
+    assert not stream.connected
+
+    await _request(stats, URL(f"{MIELE_API}/devices"))
+    assert not stream.connected
+
+    await _request(stats, STREAM_URL)
+    assert stream.connected
+    assert coordinator.stream_connected
+    assert stream.reconnects == 0
+
+    await stream._async_on_data({})
+    assert coordinator.update_mode == UPDATE_MODE_PUSH
+
+    # The client reconnects by itself
+    await _request(stats, STREAM_URL)
+    assert stream.connected
+    assert stream.reconnects == 1
+    assert coordinator.update_mode == UPDATE_MODE_POLL
+    await _run_refreshes(hass)
+    assert coordinator.refresh_log[-1]["triggers"] == [
+        "stream lost",
+        "stream reconnect",
+    ]
+    assert stream.as_dict()["reconnects"] == 1
+
+
+async def test_connection_failures(
+    coordinator: MieleDataUpdateCoordinator, stream: MieleEventStream
+) -> None:
+    """Test that failed connections are reported."""
+    stats = stream._api.connection_stats
+    await _request(stats, STREAM_URL)
+
+    await stats._on_request_start(
+        None, SimpleNamespace(), SimpleNamespace(url=STREAM_URL)
+    )
+    await stats._on_request_exception(
+        None, SimpleNamespace(), SimpleNamespace(url=STREAM_URL, exception=OSError())
+    )
+    assert not stream.connected
+    assert not coordinator.stream_connected
+    assert stream.last_error == "OSError()"
+
+    await _request(stats, STREAM_URL, 503)
+    assert not stream.connected
+    assert stream.last_error == "HTTP status 503"
+
+
+async def test_silence(
+    hass: HomeAssistant,
+    coordinator: MieleDataUpdateCoordinator,
+    stream: MieleEventStream,
+    listen_events: AsyncMock,
+) -> None:
+    """Test that a silent stream falls back to polling without reconnecting."""
+    await _request(stream._api.connection_stats, STREAM_URL)
+    await stream._async_on_data({})
+    assert coordinator.update_mode == UPDATE_MODE_PUSH
+
+    async_fire_time_changed(hass, dt_util.utcnow() + STREAM_SILENCE_CHECK)
+    await hass.async_block_till_done()
+    assert not stream.silent
+
+    silence = PUSH_EVENT_WINDOW.total_seconds() + 1
+    stream._last_activity = time.monotonic() - silence
+    coordinator.last_event = time.monotonic() - silence
+    async_fire_time_changed(hass, dt_util.utcnow() + 2 * STREAM_SILENCE_CHECK)
+    await hass.async_block_till_done()
+    assert stream.silent
+    assert stream.silences == 1
+    assert coordinator.update_mode == UPDATE_MODE_POLL
+    await _run_refreshes(hass)
+    assert coordinator.refresh_log[-1]["triggers"] == ["stream silent"]
+
+    await stream._async_on_data({})
+    assert not stream.silent
+    assert coordinator.update_mode == UPDATE_MODE_PUSH
+    assert stream.connected
+    assert listen_events.call_count == 1
+
+
+async def test_restart(
+    hass: HomeAssistant,
+    coordinator: MieleDataUpdateCoordinator,
+    stream: MieleEventStream,
+    listen_events: AsyncMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the listener is restarted when it ends."""
+    monkeypatch.setattr("custom_components.miele.stream.STREAM_BACKOFF_MIN", 0)
+    await _request(stream._api.connection_stats, STREAM_URL)
+    restarted = asyncio.Event()
+
+    async def listen(**kwargs: object) -> None:
+        if listen_events.call_count > 2:
+            restarted.set()
+            await asyncio.Event().wait()
+
+    listen_events.side_effect = listen
+    stream.cancel()
+    stream.start()
+    async with asyncio.timeout(1):
+        await restarted.wait()
+
+    assert listen_events.call_count == 3
+    assert stream.last_error == "ended"
+    assert not stream.connected
+    assert not coordinator.stream_connected